@@ -0,0 +1,90 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.cache import bump_version, get_version
+
+VERSION_KEY = "account:principals"
+
+_lock = threading.Lock()
+_principals = {}
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user together with its role and state,
+    and keeps the result per process for `AUTH_PRINCIPAL_CACHE_TTL` seconds,
+    keyed by user id and the token's `iat`.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_principal(
+            (str(user_id), validated_token.get("iat")), lambda: self.load_user(user_id))
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def load_user(self, user_id):
+        try:
+            return self.user_model.objects.select_related("role", "state").get(
+                **{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+
+def get_principal(key, load):
+    """
+    Returns a copy of the cached user for `key`, calling `load` when there
+    is no live entry. Each request gets its own copy, so changes a view makes
+    to `request.user` do not leak into other requests.
+    """
+    ttl = settings.AUTH_PRINCIPAL_CACHE_TTL
+    if not ttl:
+        return load()
+
+    version = get_version(VERSION_KEY)
+    with _lock:
+        cached = _principals.get(key)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            return copy.copy(cached[2])
+
+    user = load()
+    with _lock:
+        if len(_principals) >= settings.AUTH_PRINCIPAL_CACHE_SIZE:
+            _principals.clear()
+        _principals[key] = (version, time.monotonic() + ttl, user)
+    return copy.copy(user)
+
+
+def invalidate_principals():
+    """
+    Drops cached users in every worker, again once the surrounding
+    transaction commits.
+    """
+    bump_version(VERSION_KEY)
+    with _lock:
+        _principals.clear()
+    transaction.on_commit(lambda: bump_version(VERSION_KEY))
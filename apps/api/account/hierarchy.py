@@ -0,0 +1,82 @@
+import threading
+from collections import defaultdict, deque
+
+from django.db import transaction
+
+from account.models import Role, RoleClosure
+from core.cache import bump_version, get_version
+
+VERSION_KEY = "account:role-hierarchy"
+
+_lock = threading.Lock()
+_descendants = None
+
+
+def rebuild_closure():
+    """
+    Recomputes the role closure table from `Role.parents`. Role trees are
+    small, so the whole table is rebuilt from one read of the edges.
+    """
+    children = defaultdict(set)
+    for parent_id, child_id in Role.parents.through.objects.values_list(
+            "to_role_id", "from_role_id"):
+        children[parent_id].add(child_id)
+
+    rows = []
+    for ancestor_id in Role.objects.values_list("id", flat=True):
+        depths = {}
+        queue = deque((child_id, 1) for child_id in children[ancestor_id])
+        while queue:
+            role_id, depth = queue.popleft()
+            if role_id in depths or role_id == ancestor_id:
+                continue
+            depths[role_id] = depth
+            queue.extend((child_id, depth + 1) for child_id in children[role_id])
+        rows.extend(
+            RoleClosure(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth)
+            for role_id, depth in depths.items()
+        )
+
+    with transaction.atomic():
+        RoleClosure.objects.all().delete()
+        RoleClosure.objects.bulk_create(rows)
+    invalidate()
+
+
+def get_descendant_ids(role_id):
+    """
+    Ids of every direct and indirect descendant of a role, served from a
+    per-process copy of the closure table until the hierarchy changes.
+    """
+    global _descendants
+
+    version = get_version(VERSION_KEY)
+    with _lock:
+        if _descendants and _descendants[0] == version:
+            return _descendants[1].get(role_id, frozenset())
+
+    descendants = defaultdict(set)
+    for ancestor_id, descendant_id in RoleClosure.objects.values_list(
+            "ancestor_id", "descendant_id"):
+        descendants[ancestor_id].add(descendant_id)
+    descendants = {
+        ancestor_id: frozenset(descendant_ids)
+        for ancestor_id, descendant_ids in descendants.items()
+    }
+
+    with _lock:
+        _descendants = (version, descendants)
+    return descendants.get(role_id, frozenset())
+
+
+def invalidate():
+    """
+    Drops the cached hierarchy in every worker, again once the surrounding
+    transaction commits.
+    """
+    global _descendants
+
+    bump_version(VERSION_KEY)
+    with _lock:
+        _descendants = None
+    transaction.on_commit(lambda: bump_version(VERSION_KEY))
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.3 on 2026-10-17 21:40
+
+import django.db.models.deletion
+import uuid
+from collections import defaultdict, deque
+from django.db import migrations, models
+
+
+def backfill_role_closure(apps, schema_editor):
+    Role = apps.get_model('account', 'Role')
+    RoleClosure = apps.get_model('account', 'RoleClosure')
+
+    children = defaultdict(set)
+    for parent_id, child_id in Role.parents.through.objects.values_list('to_role_id', 'from_role_id'):
+        children[parent_id].add(child_id)
+
+    rows = []
+    for ancestor_id in Role.objects.values_list('id', flat=True):
+        depths = {}
+        queue = deque((child_id, 1) for child_id in children[ancestor_id])
+        while queue:
+            role_id, depth = queue.popleft()
+            if role_id in depths or role_id == ancestor_id:
+                continue
+            depths[role_id] = depth
+            queue.extend((child_id, depth + 1) for child_id in children[role_id])
+        rows.extend(
+            RoleClosure(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth)
+            for role_id, depth in depths.items()
+        )
+    RoleClosure.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoleClosure',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='deleted at')),
+                ('depth', models.PositiveIntegerField(verbose_name='Length of the shortest path from the ancestor')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='account.role')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='account.role')),
+            ],
+            options={
+                'verbose_name': 'role closure',
+                'verbose_name_plural': 'role closures',
+                'db_table': 'role_closure',
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='role_closure_ancestor_descendant_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_role_closure, migrations.RunPython.noop),
+    ]
@@ -66,12 +66,47 @@ class Role(AbstractBaseModel):
         return self.children.all()
 
     def get_descendants(self):
-        """Recursively fetch all descendants."""
-        descendants = set()
-        children = self.get_child_roles()
-        for child in children:
-            descendants.add(child)
-        return descendants
+        """
+        Fetch every direct and indirect descendant in one query, through
+        the role closure table.
+        """
+        return Role.objects.filter(ancestor_links__ancestor=self)
+
+
+class RoleClosure(AbstractBaseModel):
+    """
+    One (ancestor, descendant) pair of the role hierarchy, for every path
+    through `Role.parents`. Rebuilt whenever the hierarchy changes.
+    """
+    ancestor = models.ForeignKey(
+        Role,
+        on_delete=models.CASCADE,
+        related_name="descendant_links"
+    )
+
+    descendant = models.ForeignKey(
+        Role,
+        on_delete=models.CASCADE,
+        related_name="ancestor_links"
+    )
+
+    depth = models.PositiveIntegerField(
+        verbose_name=_("Length of the shortest path from the ancestor")
+    )
+
+    class Meta:
+        verbose_name = _("role closure")
+        verbose_name_plural = _("role closures")
+        db_table = "role_closure"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="role_closure_ancestor_descendant_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor} > {self.descendant} ({self.depth})"
 
 
 class User(AbstractBaseUser, AbstractBaseModel):
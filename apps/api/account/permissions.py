@@ -1,4 +1,4 @@
-from account.models import Role
+from account.hierarchy import get_descendant_ids
 from account.enums import RoleCode
 from django.db.models import Q
 from core.permissions import AbstractAccessPolicy
@@ -22,8 +22,7 @@ class RoleAccessPolicy(AbstractAccessPolicy):
             return queryset.none()
 
         # Get user role descendants
-        descendants = user_role.get_descendants()
-        descendant_ids = [role.id for role in descendants]
+        descendant_ids = get_descendant_ids(user_role.id)
 
         # Include the user's role and all descendants
         return queryset.filter(
@@ -39,8 +38,7 @@ class UserAccessPolicy(AbstractAccessPolicy):
         if user_role.code == RoleCode.ADMIN.value:
             return queryset
 
-        accessible_role_ids = {descendant.id for descendant in user_role.get_descendants()} # noqa
-        accessible_role_ids.add(user_role.id)
+        accessible_role_ids = get_descendant_ids(user_role.id) | {user_role.id}
 
         # Filter to include only users with roles in accessible_role_ids
         return queryset.filter(role__id__in=accessible_role_ids)
@@ -2,6 +2,7 @@ from django.utils.translation import gettext as _
 from account.enums import RoleCode
 from core.validators import validate_email
 from core.models import DataLookup
+from core.lookups import get_lookup
 from core.serializers import DataLookupSerializer
 from core.enums import AccountStateType
 from rest_framework import serializers
@@ -102,8 +103,7 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         with transaction.atomic():
             validated_data['role'] = Role.objects.get(code=RoleCode.PLAYER.value)
-            validated_data['state'] = DataLookup.objects.get(
-                value=AccountStateType.ACTIVE.value)
+            validated_data['state'] = get_lookup(AccountStateType.ACTIVE.value)
 
             UserModel.objects.create_user(**validated_data)
             return {'success': 'Registration successfull. Please login.'} 
@@ -119,7 +119,7 @@ class LoginSerializer(serializers.Serializer):
         email = attrs.get('email')
         password = attrs.get('password')
 
-        user = UserModel.objects.filter(email=email).first()
+        user = UserModel.objects.select_related('state').filter(email=email).first()
 
         # Create a dummy user instance for consistent password hashing time
         dummy_password = UserModel().password
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from account.authentication import invalidate_principals
+from account.hierarchy import rebuild_closure
+from account.models import Role
+
+
+@receiver(m2m_changed, sender=Role.parents.through)
+def rebuild_on_parents_change(sender, action, **kwargs):
+    """
+    Keeps the role closure table in step with `Role.parents`.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        rebuild_closure()
+
+
+@receiver(post_delete, sender=Role)
+def rebuild_on_role_delete(sender, **kwargs):
+    """
+    Deleting a role removes its edges without an `m2m_changed` signal.
+    """
+    rebuild_closure()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_principals_on_change(sender, **kwargs):
+    """
+    Cached users carry their role, so both invalidate the principal cache.
+    """
+    invalidate_principals()
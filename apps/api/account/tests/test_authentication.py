@@ -0,0 +1,81 @@
+import faker
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.authentication import CachedJWTAuthentication
+from account.enums import RoleCode
+from account.models import Role
+from core.enums import AccountStateType
+from core.models import DataLookup
+
+
+User = get_user_model()
+fake = faker.Faker()
+
+
+@override_settings(AUTH_PRINCIPAL_CACHE_TTL=60)
+class CachedJWTAuthenticationTest(APITestCase):
+
+    fixtures = ['lookup.json', 'role.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email=fake.email(),
+            password="1234",
+            full_name=fake.name(),
+            phone_number=fake.phone_number()[:15],
+            role=Role.objects.get(code=RoleCode.PLAYER.value),
+            state=DataLookup.objects.get(value=AccountStateType.ACTIVE.value)
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_user_loads_with_role_and_state_in_one_query(self):
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+            self.assertEqual(user.role.code, RoleCode.PLAYER.value)
+            self.assertEqual(user.state.value, AccountStateType.ACTIVE.value)
+
+    def test_repeated_requests_reuse_the_principal(self):
+        first = self.authenticate()
+
+        with self.assertNumQueries(0):
+            second = self.authenticate()
+        self.assertEqual(second.pk, self.user.pk)
+        self.assertIsNot(second, first)
+
+    def test_user_changes_invalidate_the_principal(self):
+        self.authenticate()
+
+        self.user.full_name = "Renamed"
+        self.user.save()
+
+        self.assertEqual(self.authenticate().full_name, "Renamed")
+
+    @override_settings(AUTH_PRINCIPAL_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        self.authenticate()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    def test_public_endpoints_skip_authentication(self):
+        response = self.client.post(
+            reverse("login"),
+            {"email": self.user.email, "password": "1234"},
+            HTTP_AUTHORIZATION="Bearer not-a-token"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_api_endpoints_accept_session_authentication(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
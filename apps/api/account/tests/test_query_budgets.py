@@ -0,0 +1,117 @@
+import faker
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.enums import RoleCode
+from account.models import Role
+from core.enums import AccountStateType
+from core.models import DataLookup
+from core.tests.budgets import QueryBudget, QueryBudgetMixin
+
+
+User = get_user_model()
+fake = faker.Faker()
+
+
+@override_settings(AUTH_PRINCIPAL_CACHE_TTL=0)
+class AccountQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    fixtures = ['lookup.json', 'role.json']
+    urlconf = "account.urls"
+    budgets = {
+        ("api-root", "get"): QueryBudget(1, 1),
+        ("roles-list", "get"): {
+            1: QueryBudget(3, 6), 10: QueryBudget(3, 24), 100: QueryBudget(3, 204)},
+        ("users-list", "get"): {
+            1: QueryBudget(3, 5), 10: QueryBudget(3, 14), 100: QueryBudget(3, 103)},
+        ("register-list", "post"): QueryBudget(9, 14),
+        ("account-state-detail", "patch"): QueryBudget(8, 7),
+        ("login", "post"): QueryBudget(2, 2),
+        # Refresh tokens are verified without the database
+        ("refresh-token", "post"): QueryBudget(0, 0),
+        ("profile", "get"): QueryBudget(1, 1),
+        ("profile", "patch"): QueryBudget(6, 3),
+    }
+
+    def setUp(self):
+        # Throttle history lives in the cache
+        cache.clear()
+        self.active_state = DataLookup.objects.get(value=AccountStateType.ACTIVE.value)
+        self.suspended_state = DataLookup.objects.get(value=AccountStateType.SUSPENDED.value)
+        self.admin_role = Role.objects.get(code=RoleCode.ADMIN.value)
+        self.player_role = Role.objects.get(code=RoleCode.PLAYER.value)
+        self.password = "password123"
+        self.admin = User.objects.create_user(
+            email=fake.unique.email(), password=self.password, full_name=fake.name(),
+            role=self.admin_role, state=self.active_state)
+        self.player = User.objects.create_user(
+            email=fake.unique.email(), password=self.password, full_name=fake.name(),
+            role=self.player_role, state=self.active_state)
+        self.authenticate(self.admin)
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_api_root(self):
+        self.assertWithinBudget(
+            "api-root", "get", lambda: self.client.get(reverse("api-root")))
+
+    def test_roles(self):
+        def populate(count):
+            for index in range(count):
+                role = Role.objects.create(name=fake.job(), code=f"{fake.unique.pystr()}-{index}")
+                role.parents.add(self.admin_role)
+
+        self.assertSizedWithinBudget(
+            "roles-list", "get", populate, lambda: self.client.get(reverse("roles-list")))
+
+    def test_users(self):
+        def populate(count):
+            # Without a usable password, which would be slow to hash
+            User.objects.bulk_create(
+                User(email=fake.unique.email(), full_name=fake.name(), password="!",
+                     role=self.player_role, state=self.active_state)
+                for _ in range(count)
+            )
+
+        self.assertSizedWithinBudget(
+            "users-list", "get", populate, lambda: self.client.get(reverse("users-list")))
+
+    def test_register(self):
+        self.client.credentials()
+        self.assertWithinBudget(
+            "register-list", "post",
+            lambda: self.client.post(reverse("register-list"), {
+                "full_name": fake.name(), "email": fake.unique.email(), "password": self.password}))
+
+    def test_account_state(self):
+        self.assertWithinBudget(
+            "account-state-detail", "patch",
+            lambda: self.client.patch(
+                reverse("account-state-detail", args=[self.player.id]),
+                {"state": str(self.suspended_state.id)}, format="json"))
+
+    def test_login(self):
+        self.client.credentials()
+        self.assertWithinBudget(
+            "login", "post",
+            lambda: self.client.post(
+                reverse("login"), {"email": self.player.email, "password": self.password}))
+
+    def test_refresh_token(self):
+        self.client.credentials()
+        token = RefreshToken.for_user(self.player)
+        self.assertWithinBudget(
+            "refresh-token", "post",
+            lambda: self.client.post(reverse("refresh-token"), {"refreshToken": str(token)}))
+
+    def test_profile(self):
+        self.authenticate(self.player)
+        self.assertWithinBudget("profile", "get", lambda: self.client.get(reverse("profile")))
+        self.assertWithinBudget(
+            "profile", "patch",
+            lambda: self.client.patch(reverse("profile"), {"full_name": fake.name()}, format="json"))
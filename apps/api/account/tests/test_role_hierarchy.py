@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from account.enums import RoleCode
+from account.hierarchy import get_descendant_ids
+from account.models import Role, RoleClosure
+
+
+class RoleHierarchyTestCase(TestCase):
+    fixtures = ['lookup.json', 'role.json']
+
+    def setUp(self):
+        self.admin_role = Role.objects.get(code=RoleCode.ADMIN.value)
+        self.player_role = Role.objects.get(code=RoleCode.PLAYER.value)
+
+        self.moderator_role = Role.objects.create(name="Moderator", code="MODERATOR")
+        self.moderator_role.parents.add(self.admin_role)
+        self.player_role.parents.set([self.moderator_role])
+
+    def test_closure_covers_indirect_descendants(self):
+        self.assertEqual(
+            RoleClosure.objects.get(ancestor=self.admin_role, descendant=self.player_role).depth, 2)
+
+        with self.assertNumQueries(1):
+            descendants = set(self.admin_role.get_descendants())
+        self.assertEqual(descendants, {self.moderator_role, self.player_role})
+
+    def test_descendant_ids_are_cached(self):
+        expected = {self.moderator_role.id, self.player_role.id}
+        self.assertEqual(get_descendant_ids(self.admin_role.id), expected)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_descendant_ids(self.admin_role.id), expected)
+            self.assertEqual(get_descendant_ids(self.player_role.id), frozenset())
+
+    def test_hierarchy_changes_refresh_descendants(self):
+        self.assertIn(self.player_role.id, get_descendant_ids(self.admin_role.id))
+
+        self.player_role.parents.remove(self.moderator_role)
+        self.assertEqual(get_descendant_ids(self.admin_role.id), {self.moderator_role.id})
+
+        self.moderator_role.delete()
+        self.assertEqual(get_descendant_ids(self.admin_role.id), frozenset())
+
+    def test_cycles_terminate(self):
+        self.admin_role.parents.add(self.player_role)
+
+        self.assertEqual(
+            get_descendant_ids(self.player_role.id), {self.admin_role.id, self.moderator_role.id})
+        self.assertFalse(RoleClosure.objects.filter(
+            ancestor=self.player_role, descendant=self.player_role).exists())
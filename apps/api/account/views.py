@@ -30,14 +30,17 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets, mixins
 from account.models import Role
+from core.authentication import AuthenticationChainMixin
 from core.decorators import swagger_safe
+from core.pagination import KeysetPagination
 
 
 UserModel = get_user_model()
 
 
-class RoleViewSet(mixins.ListModelMixin,
+class RoleViewSet(AuthenticationChainMixin, mixins.ListModelMixin,
                   viewsets.GenericViewSet):
+    authentication_chain = "api"
     permission_classes = [IsAuthenticated, RoleAccessPolicy]
     queryset = Role.objects.all()
     pagination_class = None
@@ -54,10 +57,12 @@ class RoleViewSet(mixins.ListModelMixin,
         )
 
 
-class UserViewSet(mixins.ListModelMixin,
+class UserViewSet(AuthenticationChainMixin, mixins.ListModelMixin,
                   viewsets.GenericViewSet):
+    authentication_chain = "api"
 
     permission_classes = [IsAuthenticated, UserAccessPolicy]
+    pagination_class = KeysetPagination
     serializer_class = AllUserSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_class = UserFilter
@@ -69,15 +74,17 @@ class UserViewSet(mixins.ListModelMixin,
 
     @swagger_safe(get_user_model())
     def get_queryset(self):
+        # The serializer nests both; join them instead of a query per user
         return self.access_policy.scope_queryset(
-            self.request, get_user_model().objects.all()
+            self.request, get_user_model().objects.select_related("role", "state")
         )
 
 
 @extend_schema(
     responses=LoginResponseSerializer
 )
-class EmailLoginView(APIView):
+class EmailLoginView(AuthenticationChainMixin, APIView):
+    authentication_chain = "public"
     permission_classes = (AllowAny,)
     serializer_class = LoginSerializer
 
@@ -96,7 +103,8 @@ class EmailLoginView(APIView):
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
-class ProfileView(APIView):
+class ProfileView(AuthenticationChainMixin, APIView):
+    authentication_chain = "api"
     permission_classes = [IsAuthenticated]
     serializer_class = ProfileSerializer
 
@@ -115,7 +123,9 @@ class ProfileView(APIView):
 @extend_schema(
     responses=ProfileSerializer
 )
-class AccountStateView(mixins.UpdateModelMixin, viewsets.GenericViewSet):
+class AccountStateView(AuthenticationChainMixin, mixins.UpdateModelMixin,
+                       viewsets.GenericViewSet):
+    authentication_chain = "api"
     http_method_names = ['patch']
     permission_classes = [IsAuthenticated, AccountStateAccessPolicy]
     serializer_class = AccountStateSerializer
@@ -131,7 +141,8 @@ class AccountStateView(mixins.UpdateModelMixin, viewsets.GenericViewSet):
         )
 
 
-class TokenRefreshView(BaseTokenRefreshView):
+class TokenRefreshView(AuthenticationChainMixin, BaseTokenRefreshView):
+    authentication_chain = "public"
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         return response
@@ -140,7 +151,9 @@ class TokenRefreshView(BaseTokenRefreshView):
 @extend_schema(
     responses=RegisterResponseSerializer
 )
-class RegisterViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
+class RegisterViewSet(AuthenticationChainMixin, mixins.CreateModelMixin,
+                      viewsets.GenericViewSet):
+    authentication_chain = "public"
     permission_classes = (AllowAny,)
     serializer_class = RegisterSerializer
     queryset = get_user_model().objects.all()
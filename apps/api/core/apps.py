@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        import os
+        from django.conf import settings
+        from core import signals  # noqa: F401
+        from core.cache import require_shared_cache
+        from core.permissions import AbstractAccessPolicy
+
+        require_shared_cache()
+
+        # Compile the access policies once at startup instead of on the
+        # first request
+        if os.path.exists(settings.POLICIES_FILE_PATH):
+            AbstractAccessPolicy.load_policies()
@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@lru_cache
+def _load_chain(paths):
+    return [import_string(path) for path in paths]
+
+
+def get_authentication_chain(name):
+    """
+    The authentication classes of a chain in `AUTHENTICATION_CHAINS`.
+    """
+    return _load_chain(tuple(settings.AUTHENTICATION_CHAINS[name]))
+
+
+class AuthenticationChainMixin:
+    """
+    Runs the authenticator chain named by `authentication_chain` instead of
+    `DEFAULT_AUTHENTICATION_CLASSES`. DRF tries authenticators in order, so a
+    short chain means requests without credentials stop early.
+    """
+    authentication_chain = None
+
+    def get_authenticators(self):
+        if self.authentication_chain is None:
+            return super().get_authenticators()
+        return [auth() for auth in get_authentication_chain(self.authentication_chain)]
@@ -0,0 +1,53 @@
+import random
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def _new_version():
+    # Random start so a version that was evicted from the shared cache
+    # never comes back as a value a worker has already seen.
+    return random.randint(1, 2 ** 31)
+
+
+def get_version(key):
+    """
+    Returns the current value of a shared version counter.
+    Process-local caches compare it with the version they were built from.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Advances a shared version counter, invalidating every process-local
+    cache built from an older version. Returns the new version.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _new_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def require_shared_cache():
+    """
+    Version counters and competition stamps reach other workers only
+    through a cache they share. Refuses to run several workers on a
+    process-local backend, where they would keep serving stale data.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.API_WORKERS > 1 and backend in PROCESS_LOCAL_BACKENDS:
+        raise ImproperlyConfigured(
+            f"{settings.API_WORKERS} workers cannot share the process-local cache {backend}; "
+            "set CACHE_BACKEND to a shared backend such as Redis or Memcached.")
@@ -28,4 +28,11 @@ class TiebreakerRule(enum.Enum):
     TYPE = "tiebreaker_rule"
 
     FIRST_TO_REACH = "tiebreaker_rule_first_to_reach"
-    LATEST_SUBMISSION = "tiebreaker_rule_latest_submission"
\ No newline at end of file
+    LATEST_SUBMISSION = "tiebreaker_rule_latest_submission"
+
+class ScoreSubmissionStatus(enum.Enum):
+    TYPE = "score_submission_status"
+
+    PENDING = "score_submission_status_pending"
+    ACCEPTED = "score_submission_status_accepted"
+    REJECTED = "score_submission_status_rejected"
@@ -0,0 +1,96 @@
+import threading
+
+from django.db import transaction
+
+from core.cache import bump_version, get_version
+from core.models import DataLookup
+
+VERSION_KEY = "core:lookups"
+
+
+class LookupRegistry:
+    """
+    Every `DataLookup` row, loaded in one query and indexed by id, by value,
+    by type and by the default of each type.
+    """
+
+    def __init__(self, lookups):
+        self.by_id = {}
+        self.by_value = {}
+        self.by_type = {}
+        self.defaults = {}
+
+        for lookup in sorted(lookups, key=lambda lookup: (lookup.type, lookup.index)):
+            self.by_id[lookup.id] = lookup
+            self.by_value[lookup.value] = lookup
+            self.by_type.setdefault(lookup.type, []).append(lookup)
+            if lookup.is_default:
+                self.defaults[lookup.type] = lookup
+
+
+_lock = threading.Lock()
+_registry = None
+
+
+def get_registry():
+    """
+    Returns this process's registry, reloading it when another worker has
+    changed a lookup since it was built.
+    """
+    global _registry
+
+    version = get_version(VERSION_KEY)
+    with _lock:
+        if _registry and _registry[0] == version:
+            return _registry[1]
+
+    registry = LookupRegistry(DataLookup.objects.all())
+    with _lock:
+        _registry = (version, registry)
+    return registry
+
+
+def get_lookup(value):
+    """
+    Returns the lookup with this value.
+    Raises `DataLookup.DoesNotExist` like `DataLookup.objects.get(value=...)`.
+    """
+    try:
+        return get_registry().by_value[value]
+    except KeyError:
+        raise DataLookup.DoesNotExist(f"No data lookup with value {value!r}.")
+
+
+def get_lookup_by_id(lookup_id):
+    """
+    Returns the lookup with this id, or None.
+    """
+    return get_registry().by_id.get(lookup_id)
+
+
+def get_lookups(lookup_type):
+    """
+    Returns the lookups of a type, ordered by index.
+    """
+    return list(get_registry().by_type.get(lookup_type, []))
+
+
+def get_default(lookup_type):
+    """
+    Returns the default lookup of a type, or None.
+    """
+    return get_registry().defaults.get(lookup_type)
+
+
+def invalidate():
+    """
+    Drops the registry in every worker. Bumped again once the surrounding
+    transaction commits, so a worker that reloaded before the commit does
+    not keep the old rows.
+    """
+    global _registry
+
+    bump_version(VERSION_KEY)
+    with _lock:
+        _registry = None
+    transaction.on_commit(lambda: bump_version(VERSION_KEY))
@@ -0,0 +1,243 @@
+import json
+import math
+import random
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.test import Client
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.enums import CompetitionType
+from core.lookups import get_lookup
+from core.queries import QueryMeter
+from games.models import Competition, CompetitionEntry
+
+ENDPOINTS = ("login", "competition_list", "competition_detail", "leaderboard", "join", "submit_score")
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = ('Drive the main endpoints through the URL conf against the current database '
+            '(see generate_load_data) and write latency, query and row statistics to JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Timed requests per endpoint (default: 200).',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Untimed requests per endpoint first (default: 5).',
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=ENDPOINTS,
+            help='Endpoint to run; repeat for several (default: all).',
+        )
+        parser.add_argument(
+            '--email-prefix',
+            default='load-',
+            help='Act as the players whose email starts with this (default: load-).',
+        )
+        parser.add_argument(
+            '--password',
+            default='password123',
+            help='Password of those players, for login (default: password123).',
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark-endpoints.json',
+            help='File to write the results to (default: benchmark-endpoints.json).',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Results of an earlier run to compare against.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed, for reproducible request sequences.',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        total = options['warmup'] + options['requests']
+
+        players = list(
+            get_user_model().objects.filter(email__startswith=options['email_prefix'])
+            .order_by("?")[:max(total * 2, 500)]
+        )
+        current = now()
+        competitions = list(Competition.objects.filter(
+            Q(end_time__isnull=True) | Q(end_time__gt=current),
+            start_time__lte=current,
+            type=get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value),
+        ))
+        if not players or not competitions:
+            raise CommandError(
+                'No players or running competitions to benchmark with; run generate_load_data first.')
+
+        self.players = players
+        self.competitions = competitions
+        # Popular competitions get proportionally more traffic
+        self.weights = [competition.entries_count + 1 for competition in competitions]
+        self.joined = set(
+            CompetitionEntry.objects.filter(player__in=players, competition__in=competitions)
+            .values_list("competition_id", "player_id")
+        )
+        self.new_entries = []
+        self.password = options['password']
+        self.client = Client()
+        self.tokens = {}
+
+        results = {}
+        for name in options['endpoint'] or ENDPOINTS:
+            requests = [getattr(self, f"request_{name}")() for _ in range(total)]
+            samples = [self.send(*request) for request in requests]
+            results[name] = self.summarize(samples[options['warmup']:])
+
+        report = {
+            "commit": self.commit(),
+            "created_at": current.isoformat(),
+            "requests": options['requests'],
+            "endpoints": results,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as previous:
+                baseline = json.load(previous)["endpoints"]
+        self.print_report(results, baseline)
+        self.stdout.write(f"Wrote {options['output']}")
+
+    def player_client(self, player):
+        """
+        Request headers of one simulated client: its own address, so
+        throttles apply per client as in production, and its token.
+        """
+        index = self.players.index(player)
+        headers = {"REMOTE_ADDR": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"}
+        if player.pk not in self.tokens:
+            self.tokens[player.pk] = f"Bearer {RefreshToken.for_user(player).access_token}"
+        headers["HTTP_AUTHORIZATION"] = self.tokens[player.pk]
+        return headers
+
+    def hot_competition(self):
+        return random.choices(self.competitions, weights=self.weights)[0]
+
+    def request_login(self):
+        player = random.choice(self.players)
+        headers = self.player_client(player)
+        del headers["HTTP_AUTHORIZATION"]
+        return "post", reverse("login"), {"email": player.email, "password": self.password}, headers
+
+    def request_competition_list(self):
+        return "get", reverse("competitions-list"), None, self.player_client(random.choice(self.players))
+
+    def request_competition_detail(self):
+        return ("get", reverse("competitions-detail", args=[self.hot_competition().id]), None,
+                self.player_client(random.choice(self.players)))
+
+    def request_leaderboard(self):
+        return ("get", reverse("competitions-leaderboard", args=[self.hot_competition().id]), None,
+                self.player_client(random.choice(self.players)))
+
+    def request_join(self):
+        for _ in range(100):
+            competition = self.hot_competition()
+            player = random.choice(self.players)
+            if (competition.id, player.id) not in self.joined:
+                break
+        else:
+            raise CommandError('Every sampled player already joined; generate more players.')
+        self.joined.add((competition.id, player.id))
+        self.new_entries.append((competition, player))
+        return ("post", reverse("competitions-join", args=[competition.id]),
+                {"entry_fee": competition.min_entry_fee}, self.player_client(player))
+
+    def request_submit_score(self):
+        if self.new_entries:
+            competition, player = random.choice(self.new_entries)
+        else:
+            competition_id, player_id = random.choice(sorted(self.joined))
+            competition = next(row for row in self.competitions if row.id == competition_id)
+            player = next(row for row in self.players if row.id == player_id)
+        return ("post", reverse("competitions-submit-score", args=[competition.id]),
+                {"score": random.randint(0, 10000)}, self.player_client(player))
+
+    def send(self, method, path, data, headers):
+        with QueryMeter() as meter:
+            started = time.perf_counter()
+            if method == "get":
+                response = self.client.get(path, **headers)
+            else:
+                response = self.client.post(path, data, content_type="application/json", **headers)
+            elapsed = time.perf_counter() - started
+        return {
+            "elapsed": elapsed,
+            "status": response.status_code,
+            "queries": meter.count,
+            "rows": meter.rows,
+        }
+
+    def summarize(self, samples):
+        latencies = sorted(sample["elapsed"] * 1000 for sample in samples)
+        elapsed = sum(sample["elapsed"] for sample in samples)
+        statuses = {}
+        for sample in samples:
+            statuses[str(sample["status"])] = statuses.get(str(sample["status"]), 0) + 1
+        return {
+            "requests": len(samples),
+            "statuses": statuses,
+            "errors": sum(1 for sample in samples if sample["status"] >= 400),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "requests_per_second": round(len(samples) / elapsed, 1),
+            "queries_per_request": round(sum(sample["queries"] for sample in samples) / len(samples), 2),
+            "rows_per_request": round(sum(sample["rows"] for sample in samples) / len(samples), 2),
+            "rows_per_second": round(sum(sample["rows"] for sample in samples) / elapsed, 1),
+        }
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, results, baseline):
+        self.stdout.write(
+            f"{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}"
+            f" {'queries':>8} {'rows/s':>10} {'errors':>7}"
+            + (f" {'p95 vs baseline':>16}" if baseline else ""))
+        for name, result in results.items():
+            line = (
+                f"{name:<20} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+                f" {result['requests_per_second']:>8.1f} {result['queries_per_request']:>8.1f}"
+                f" {result['rows_per_second']:>10.0f} {result['errors']:>7}")
+            if baseline and name in baseline:
+                change = result['p95_ms'] / baseline[name]['p95_ms'] - 1
+                line += f" {change:>+15.0%}"
+            self.stdout.write(line)
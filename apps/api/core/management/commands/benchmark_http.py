@@ -0,0 +1,129 @@
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = ('Serve the read endpoints with gunicorn sync workers and with an ASGI server, '
+            'and compare requests/sec and latency.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            action='append',
+            help='Path to request; repeat for several '
+                 '(default: the data lookup and competition lists).',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Requests per server (default: 2000).',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=64,
+            help='Concurrent clients (default: 64).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Server worker processes (default: 2).',
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Port to serve on (default: 8765).',
+        )
+
+    def handle(self, *args, **options):
+        if shutil.which('gunicorn') is None:
+            raise CommandError('gunicorn is not installed.')
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise CommandError('uvicorn is not installed.')
+
+        paths = options['path'] or [reverse('data-lookups-list'), reverse('competitions-list')]
+        bind = f"127.0.0.1:{options['port']}"
+        workers = str(options['workers'])
+        servers = (
+            ("wsgi", ["api_service.wsgi:application"], {}),
+            ("asgi", ["api_service.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+             {"ASYNC_READ_VIEWS": "true"}),
+        )
+
+        self.stdout.write(
+            f"{'server':>6} {'path':<40} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name, arguments, environment in servers:
+            server = self.start(
+                ["gunicorn", *arguments, "--workers", workers, "--bind", bind], environment)
+            try:
+                for path in paths:
+                    url = f"http://{bind}{path}"
+                    self.wait_until_ready(url, server)
+                    elapsed, latencies, errors = self.load(
+                        url, options['requests'], options['concurrency'])
+                    p50 = statistics.median(latencies) * 1000
+                    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+                    self.stdout.write(
+                        f"{name:>6} {path:<40} {options['requests'] / elapsed:>9.1f}"
+                        f" {p50:>8.1f} {p99:>8.1f} {errors:>7}")
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start(self, command, environment):
+        env = {
+            **os.environ,
+            **environment,
+            # The benchmark would otherwise measure the throttles
+            "ANON_THROTTLE_RATE": "1000000/second",
+            "USER_THROTTLE_RATE": "1000000/second",
+        }
+        return subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=sys.stderr)
+
+    def wait_until_ready(self, url, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError('The server exited during startup.')
+            try:
+                urllib.request.urlopen(url, timeout=1).read()
+                return
+            except urllib.error.HTTPError:
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'The server did not answer {url} within {timeout}s.')
+
+    def load(self, url, requests, concurrency):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                failed = False
+            except OSError:
+                failed = True
+            return time.perf_counter() - started, failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(fetch, range(requests)))
+        elapsed = time.perf_counter() - started
+        return elapsed, [latency for latency, _ in results], sum(failed for _, failed in results)
@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_access_policy import AccessPolicy
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from account.enums import RoleCode
+from account.models import Role
+from core.permissions import AbstractAccessPolicy
+from games.permissions import CompetitionAccessPolicy
+from games.views import CompetitionViewSet
+
+
+class LegacyCompetitionAccessPolicy(AccessPolicy):
+    """
+    The previous evaluation: statements looked up per instance and matched
+    one by one on every check.
+    """
+    group_prefix = "role:"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = AbstractAccessPolicy.load_policies().get(
+            "CompetitionAccessPolicy", {}).get("statements", [])
+
+    def get_user_group_values(self, user):
+        return [user.role.code] if user and user.is_authenticated and user.role else []
+
+
+class Command(BaseCommand):
+    help = 'Compare the compiled access policy against statement-by-statement evaluation.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--checks',
+            type=int,
+            default=20000,
+            help='Permission checks per run (default: 20000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per policy; the median is reported (default: 5).',
+        )
+
+    def handle(self, *args, **options):
+        user = get_user_model()(
+            email="bench@example.com", full_name="Bench",
+            role=Role(code=RoleCode.PLAYER.value, name="Player"))
+
+        request = APIRequestFactory().post("/competitions/1/submit_score/")
+        force_authenticate(request, user=user)
+        view = CompetitionViewSet()
+        view.action_map = {"post": "submit_score"}
+        view.action = "submit_score"
+        request = view.initialize_request(request)
+        request.user = user
+
+        self.stdout.write(f"{'policy':>10} {'us/check':>10}")
+        for name, policy_class in (
+                ("legacy", LegacyCompetitionAccessPolicy), ("compiled", CompetitionAccessPolicy)):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                for _ in range(options['checks']):
+                    assert policy_class().has_permission(request, view)
+                timings.append((time.perf_counter() - started) / options['checks'] * 1e6)
+            self.stdout.write(f"{name:>10} {statistics.median(timings):>10.2f}")
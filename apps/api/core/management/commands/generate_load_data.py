@@ -0,0 +1,240 @@
+import random
+import time
+from datetime import timedelta
+
+import faker
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from account.enums import RoleCode
+from account.models import Role
+from core.enums import AccountStateType, CompetitionType, RankingMethod, TiebreakerRule
+from core.lookups import get_lookup
+from games.models import Competition, CompetitionEntry, Score
+from games.services import invalidate_active_competitions, rebuild_competition_aggregates
+
+BATCH_SIZE = 5000
+
+
+def skewed_split(total, weights, caps):
+    """
+    Splits `total` into integer shares proportional to `weights`, none
+    above its cap. What a capped share cannot take goes to the others.
+    """
+    shares = [0] * len(weights)
+    remaining = total
+    candidates = [index for index, cap in enumerate(caps) if cap > 0]
+    while remaining and candidates:
+        weight = sum(weights[index] for index in candidates)
+        given = 0
+        for index in candidates:
+            share = min(caps[index] - shares[index], int(remaining * weights[index] / weight))
+            shares[index] += share
+            given += share
+        if not given:
+            # Only rounding leftovers remain
+            for index in candidates[:remaining]:
+                shares[index] += 1
+                given += 1
+        remaining -= given
+        candidates = [index for index in candidates if shares[index] < caps[index]]
+    return shares
+
+
+def lookups(values):
+    """
+    The lookups of an enum's values, without its `TYPE` member.
+    """
+    return [get_lookup(value.value) for value in values if value is not values.TYPE]
+
+
+class Command(BaseCommand):
+    help = ('Generate synthetic users, competitions, entries and scores with a few hot '
+            'competitions and a long tail, for load testing.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10000,
+            help='Players to create (default: 10000).',
+        )
+        parser.add_argument(
+            '--competitions',
+            type=int,
+            default=200,
+            help='Competitions to create (default: 200).',
+        )
+        parser.add_argument(
+            '--entries',
+            type=int,
+            default=100000,
+            help='Entries to create, capped at one per player and competition (default: 100000).',
+        )
+        parser.add_argument(
+            '--scores',
+            type=int,
+            default=1000000,
+            help='Scores to create (default: 1000000).',
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.2,
+            help='Zipf exponent of competition popularity; 0 spreads evenly (default: 1.2).',
+        )
+        parser.add_argument(
+            '--password',
+            default='password123',
+            help='Password of every generated player (default: password123).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed, for reproducible datasets.',
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['competitions'] < 1:
+            raise CommandError('At least one user and one competition are needed.')
+
+        random.seed(options['seed'])
+        self.fake = faker.Faker()
+        self.fake.seed_instance(options['seed'])
+        self.prefix = f"load-{self.fake.unique.pystr(min_chars=6, max_chars=6).lower()}"
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            users = self.create_users(options['users'], options['password'])
+            competitions = self.create_competitions(options['competitions'], users[0])
+
+            # Rank i gets weight 1 / (i + 1) ** skew: a few hot competitions
+            # hold most of the entries and scores, the rest form a long tail
+            weights = [1 / (rank + 1) ** options['skew'] for rank in range(len(competitions))]
+            entries = self.create_entries(competitions, users, options['entries'], weights)
+            scores = self.create_scores(competitions, entries, options['scores'], weights)
+
+            for competition in competitions:
+                rebuild_competition_aggregates(competition)
+            # Bulk inserts send no signals
+            invalidate_active_competitions()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(users)} users, {len(competitions)} competitions, "
+            f"{sum(len(rows) for rows in entries.values())} entries and {scores} scores "
+            f"in {time.perf_counter() - started:.1f}s. Player emails start with "
+            f"'{self.prefix}-'."))
+
+    def create_users(self, count, password):
+        UserModel = get_user_model()
+        role = Role.objects.get(code=RoleCode.PLAYER.value)
+        state = get_lookup(AccountStateType.ACTIVE.value)
+        # One hash for everyone; hashing per user would dominate the run
+        password = make_password(password)
+
+        return UserModel.objects.bulk_create(
+            (
+                UserModel(
+                    email=f"{self.prefix}-{index}@example.com",
+                    full_name=self.fake.name(),
+                    password=password,
+                    role=role,
+                    state=state,
+                )
+                for index in range(count)
+            ),
+            batch_size=BATCH_SIZE
+        )
+
+    def create_competitions(self, count, creator):
+        current = now()
+        types = lookups(CompetitionType)
+        ranking_methods = lookups(RankingMethod)
+        tiebreaker_rules = lookups(TiebreakerRule)
+
+        competitions = []
+        for index in range(count):
+            # Mostly running, with some finished and some upcoming ones
+            phase = random.choices(("running", "ended", "upcoming"), weights=(8, 1, 1))[0]
+            if phase == "running":
+                start_time = current - timedelta(days=random.randint(1, 30))
+                end_time = current + timedelta(days=random.randint(1, 30))
+            elif phase == "ended":
+                start_time = current - timedelta(days=random.randint(31, 90))
+                end_time = start_time + timedelta(days=random.randint(1, 30))
+            else:
+                start_time = current + timedelta(days=random.randint(1, 30))
+                end_time = start_time + timedelta(days=random.randint(1, 30))
+
+            competitions.append(Competition(
+                name=f"{self.fake.catch_phrase()} {self.prefix}-{index}",
+                description=self.fake.paragraph(),
+                min_entry_fee=0,
+                max_players=0,
+                start_time=start_time,
+                end_time=end_time,
+                created_by=creator,
+                type=random.choice(types),
+                ranking_method=random.choice(ranking_methods),
+                tiebreaker_rule=random.choice(tiebreaker_rules),
+            ))
+        return Competition.objects.bulk_create(competitions, batch_size=BATCH_SIZE)
+
+    def create_entries(self, competitions, users, total, weights):
+        shares = skewed_split(total, weights, [len(users)] * len(competitions))
+        entries = {}
+        batch = []
+        for competition, share in zip(competitions, shares):
+            players = random.sample(users, share)
+            entries[competition.id] = [
+                CompetitionEntry(competition=competition, player=player, entry_fee=0)
+                for player in players
+            ]
+            batch.extend(entries[competition.id])
+            competition.entries_count = len(players)
+            if len(batch) >= BATCH_SIZE:
+                CompetitionEntry.objects.bulk_create(batch)
+                batch = []
+        CompetitionEntry.objects.bulk_create(batch)
+        Competition.objects.bulk_update(competitions, ["entries_count"], batch_size=BATCH_SIZE)
+        return entries
+
+    def create_scores(self, competitions, entries, total, weights):
+        single_attempt = get_lookup(CompetitionType.SINGLE_ATTEMPT.value).id
+        shares = skewed_split(total, weights, [
+            len(entries[competition.id])
+            if competition.type_id == single_attempt or not entries[competition.id] else total
+            for competition in competitions
+        ])
+        created = 0
+        batch = []
+        for competition, share in zip(competitions, shares):
+            competition_entries = entries[competition.id]
+            if competition.type_id == single_attempt:
+                scored = random.sample(competition_entries, share)
+            else:
+                scored = random.choices(competition_entries, k=share)
+
+            attempts = {}
+            for entry in scored:
+                attempts[entry.id] = attempts.get(entry.id, 0) + 1
+                # Heavy-tailed scores: most players cluster low, a few excel
+                batch.append(Score(
+                    entry=entry, competition=competition,
+                    score=int(random.paretovariate(1.5) * 100)))
+                if len(batch) >= BATCH_SIZE:
+                    Score.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+
+            # Leave room for benchmark submissions on top of the generated ones
+            competition.max_score_per_player = (
+                1 if competition.type_id == single_attempt else max(attempts.values(), default=0) + 100)
+        Score.objects.bulk_create(batch)
+        created += len(batch)
+        Competition.objects.bulk_update(competitions, ["max_score_per_player"], batch_size=BATCH_SIZE)
+        return created
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+LEADERBOARD_SIZE_SCHEME = '{"type": "integer", "minimum": 1, "maximum": 100}'
+
+
+def set_leaderboard_size_scheme(apps, schema_editor):
+    SystemSetting = apps.get_model('core', 'SystemSetting')
+    SystemSetting.objects.filter(key='leaderboard_size', data_scheme__in=['', None]).update(
+        data_scheme=LEADERBOARD_SIZE_SCHEME)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_leaderboard_size_scheme, migrations.RunPython.noop),
+    ]
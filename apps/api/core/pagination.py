@@ -1,10 +1,18 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class Pagination(LimitOffsetPagination):
     def get_paginated_response(self, data):
-        print(self.limit)
         return Response({
             'results': data,
             'metadata': {
@@ -13,9 +21,8 @@ class Pagination(LimitOffsetPagination):
                 'total': self.count,
                 'next': self.get_next_link(),
                 'previous': self.get_previous_link()
-                },
-            }
-        )
+            },
+        })
 
     def get_paginated_response_schema(self, schema):
         return {
@@ -34,3 +41,167 @@ class Pagination(LimitOffsetPagination):
                 }
             }
         }
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pages newest first by (created_at, id), seeking from the edge of the
+    previous page instead of skipping rows with OFFSET, so deep pages cost
+    the same as the first. Cursors are opaque to clients.
+
+    The total is counted on every page unless the client passes
+    `total=false` or the view sets `include_total = False`.
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    total_query_param = 'total'
+    page_size = api_settings.PAGE_SIZE
+    max_limit = None
+    include_total = True
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.total = queryset.count() if self.get_include_total(request) else None
+        cursor, page_queryset = self.seek(queryset, request)
+        return self.set_page(list(page_queryset), cursor)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        `paginate_queryset` for async views, using the async ORM.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.total = await queryset.acount() if self.get_include_total(request) else None
+        cursor, page_queryset = self.seek(queryset, request)
+        return self.set_page([row async for row in page_queryset], cursor)
+
+    def seek(self, queryset, request):
+        """
+        Returns the decoded cursor and the queryset of the page, with one
+        extra row to tell whether there is more beyond it.
+        """
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            queryset = queryset.order_by('-created_at', '-id')
+        elif cursor[2]:
+            created_at, pk = cursor[:2]
+            queryset = queryset.filter(created_at__gte=created_at).exclude(
+                created_at=created_at, id__lte=pk).order_by('created_at', 'id')
+        else:
+            created_at, pk = cursor[:2]
+            queryset = queryset.filter(created_at__lte=created_at).exclude(
+                created_at=created_at, id__gte=pk).order_by('-created_at', '-id')
+        return cursor, queryset[:self.limit + 1]
+
+    def set_page(self, rows, cursor):
+        reverse = bool(cursor and cursor[2])
+        has_more = len(rows) > self.limit
+        self.page = rows[:self.limit]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_include_total(self, request):
+        value = request.query_params.get(self.total_query_param)
+        if value is None:
+            return self.include_total
+        return value.lower() not in ('false', '0', 'no')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, pk, reverse = base64.urlsafe_b64decode(
+                encoded.encode('ascii')).decode('ascii').split('|')
+            return datetime.fromisoformat(created_at), uuid.UUID(pk), reverse == '1'
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        position = f"{row.created_at.isoformat()}|{row.pk}|{int(reverse)}"
+        return base64.urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def get_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.get_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.get_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'metadata': {
+                'limit': self.limit,
+                'total': self.total,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link()
+            },
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'results': schema,
+                'metadata': {
+                    'type': 'object',
+                    'properties': {
+                        'limit': {'type': 'integer'},
+                        'total': {'type': 'integer', 'nullable': True},
+                        'next': {'type': 'string', 'format': 'uri', 'nullable': True},
+                        'previous': {'type': 'string', 'format': 'uri', 'nullable': True}
+                    }
+                }
+            }
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.total_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to false to skip counting the total.',
+                'schema': {'type': 'boolean'},
+            },
+        ]
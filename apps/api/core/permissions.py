@@ -1,28 +1,85 @@
 import json
+import os
+import threading
 from django.conf import settings
 from rest_access_policy import AccessPolicy
+from rest_access_policy.access_policy import AccessEnforcement
+
+
+class CompiledPolicy:
+    """
+    The statements of one policy class, normalized once, plus a decision
+    table keyed by (action, HTTP method, principal attributes).
+
+    Statements with conditions or `id:` principals depend on more than the
+    key, so policies that use them are evaluated statement by statement.
+    """
+
+    def __init__(self, statements):
+        self.statements = AccessPolicy()._normalize_statements(
+            [dict(statement) for statement in statements])
+        self.static = not any(
+            statement["condition"] or statement["condition_expression"]
+            or any(principal.startswith(AccessPolicy.id_prefix)
+                   for principal in statement["principal"])
+            for statement in self.statements
+        )
+        self.decisions = {}
 
 
 class AbstractAccessPolicy(AccessPolicy):
     group_prefix = "role:"
     policies = None
+    compiled = None
+    policies_mtime = None
+    _lock = threading.Lock()
 
     @classmethod
     def load_policies(cls):
-        """Load policies from the JSON file if not already loaded."""
-        if cls.policies is None:
-            policy_file_path = settings.POLICIES_FILE_PATH
+        """
+        Load and compile policies from the JSON file if not already loaded,
+        or again if the file changed and auto-reload is enabled.
+        """
+        base = AbstractAccessPolicy
+        if base.policies is not None and settings.POLICIES_AUTO_RELOAD:
             try:
-                with open(policy_file_path, 'r') as f:
-                    cls.policies = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                raise Exception(f"Error loading policies file: {e}")
-        return cls.policies
+                if os.path.getmtime(settings.POLICIES_FILE_PATH) != base.policies_mtime:
+                    cls.reload_policies()
+            except OSError:
+                pass
+
+        if base.policies is None:
+            cls.reload_policies()
+        return base.policies
+
+    @classmethod
+    def reload_policies(cls):
+        """Read the policies file again and rebuild every decision table."""
+        policy_file_path = settings.POLICIES_FILE_PATH
+        try:
+            with open(policy_file_path, 'r') as f:
+                policies = json.load(f)
+            mtime = os.path.getmtime(policy_file_path)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            raise Exception(f"Error loading policies file: {e}")
+
+        compiled = {
+            name: CompiledPolicy(policy.get("statements", []))
+            for name, policy in policies.items()
+        }
+        with cls._lock:
+            AbstractAccessPolicy.policies = policies
+            AbstractAccessPolicy.compiled = compiled
+            AbstractAccessPolicy.policies_mtime = mtime
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.statements = self.load_policies().get(
-            self.__class__.__name__, {}).get("statements", [])
+    @classmethod
+    def get_compiled_policy(cls):
+        cls.load_policies()
+        return AbstractAccessPolicy.compiled.get(cls.__name__) or CompiledPolicy([])
+
+    @property
+    def statements(self):
+        return self.get_compiled_policy().statements
 
     def get_user_group_values(self, user):
         # Return the user's role code if user is authenticated and role exists,
@@ -31,4 +88,33 @@ class AbstractAccessPolicy(AccessPolicy):
             [user.role.code]
             if user and user.is_authenticated and user.role
             else []
-        )
\ No newline at end of file
+        )
+
+    def get_principal_key(self, user):
+        """
+        Everything about the user that statements without conditions or
+        `id:` principals can match on.
+        """
+        if user is None or user.is_anonymous:
+            return (True, False, False, ())
+        return (
+            False, getattr(user, "is_superuser", False), getattr(user, "is_staff", False),
+            tuple(self.get_user_group_values(user))
+        )
+
+    def has_permission(self, request, view):
+        compiled = self.get_compiled_policy()
+        if not compiled.static:
+            return super().has_permission(request, view)
+
+        action = self._get_invoked_action(view)
+        key = (action, request.method, self.get_principal_key(request.user))
+
+        allowed = compiled.decisions.get(key)
+        if allowed is None:
+            allowed = bool(compiled.statements) and self._evaluate_statements(
+                compiled.statements, request, view, action)
+            compiled.decisions[key] = allowed
+
+        request.access_enforcement = AccessEnforcement(action=action, allowed=allowed)
+        return allowed
@@ -0,0 +1,58 @@
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class QueryMeter:
+    """
+    Records the SQL run on one connection while active: each statement,
+    the rows it returned and how long it took. Used by the endpoint
+    benchmarks and the query budgets in tests.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        self.queries = []
+
+    def __enter__(self):
+        self.wrapper = self.connection.execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wrapper.__exit__(*exc_info)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            cursor = context["cursor"]
+            # Only statements that return a result set fetch rows
+            rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+            self.queries.append({
+                "sql": sql,
+                "rows": rows,
+                "duration": time.perf_counter() - started,
+            })
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def rows(self):
+        return sum(query["rows"] for query in self.queries)
+
+    @property
+    def duration(self):
+        return sum(query["duration"] for query in self.queries)
+
+    def report(self):
+        """
+        The recorded statements, one per line, with their row counts.
+        """
+        return "\n".join(
+            f"{index}. [{query['rows']} rows] {query['sql']}"
+            for index, query in enumerate(self.queries, 1)
+        )
@@ -20,7 +20,7 @@ class Renderer(CustomRendererMixin, JSONRenderer):
     def render(self, data, accepted_media_type=None, renderer_context=None):
         response = renderer_context.get('response', None)
 
-        if response and response.status_code == 204:
+        if response and response.status_code in (204, 304, 412):
             data = None
         else:
             try:
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import DataLookup, SystemSetting
+from .services import parse_setting_value
 
 
 class DataLookupSerializer(serializers.ModelSerializer):
@@ -37,6 +38,17 @@ class SystemSettingSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'key', 'current_value',
                   'created_at', 'updated_at']
 
+    def validate_current_value(self, value):
+        """
+        Ensures the value conforms to the setting's `data_scheme`.
+        """
+        if self.instance:
+            try:
+                parse_setting_value(self.instance, value)
+            except ValueError as error:
+                raise serializers.ValidationError(str(error))
+        return value
+
     def to_representation(self, instance):
         return SystemSettingResponseSerializer(
             instance).to_representation(instance)
@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+
+import jsonschema
+from django.conf import settings
+from django.db import transaction
+
+from core.cache import bump_version, get_version
+from core.models import SystemSetting
+
+VERSION_KEY = "core:system-settings"
+
+PARSERS = {
+    "integer": int,
+    "number": float,
+    "boolean": lambda value: value.strip().lower() in ("true", "1", "yes"),
+    "object": json.loads,
+    "array": json.loads,
+}
+
+
+def get_schema(setting: SystemSetting):
+    """
+    The JSON schema stored in the setting's `data_scheme`, or an empty
+    schema that accepts any string.
+    """
+    return json.loads(setting.data_scheme) if setting.data_scheme else {}
+
+
+def parse_setting_value(setting: SystemSetting, raw_value: str):
+    """
+    Converts a stored string to the type declared by the setting's schema
+    and validates it. Raises `ValueError` if it does not conform.
+    """
+    schema = get_schema(setting)
+    parser = PARSERS.get(schema.get("type"), str)
+    try:
+        value = parser(raw_value)
+        jsonschema.validate(value, schema)
+    except (TypeError, ValueError, jsonschema.ValidationError) as error:
+        message = error.message if isinstance(error, jsonschema.ValidationError) else str(error)
+        raise ValueError(f"Invalid value for {setting.key}: {message}")
+    return value
+
+
+_lock = threading.Lock()
+_values = {}
+
+
+def get_setting(key):
+    """
+    Returns the typed current value of a system setting.
+
+    Values are cached per process for `SYSTEM_SETTINGS_CACHE_TTL` seconds and
+    dropped in every worker when `invalidate_settings` is called. A stored
+    value that fails validation falls back to the setting's default.
+    """
+    version = get_version(VERSION_KEY)
+    with _lock:
+        cached = _values.get(key)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            return cached[2]
+
+    setting = SystemSetting.objects.get(key=key)
+    try:
+        value = parse_setting_value(setting, setting.current_value)
+    except ValueError:
+        value = parse_setting_value(setting, setting.default_value)
+
+    with _lock:
+        _values[key] = (version, time.monotonic() + settings.SYSTEM_SETTINGS_CACHE_TTL, value)
+    return value
+
+
+def invalidate_settings():
+    """
+    Drops cached setting values in every worker, again once the surrounding
+    transaction commits.
+    """
+    bump_version(VERSION_KEY)
+    with _lock:
+        _values.clear()
+    transaction.on_commit(lambda: bump_version(VERSION_KEY))
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import lookups
+from core.models import DataLookup
+
+
+@receiver(post_save, sender=DataLookup)
+@receiver(post_delete, sender=DataLookup)
+def invalidate_lookup_registry(sender, **kwargs):
+    """
+    Reloads the lookup registry in every worker after a lookup changes.
+    """
+    lookups.invalidate()
@@ -0,0 +1,94 @@
+from typing import NamedTuple
+
+from django.urls import URLResolver, get_resolver
+
+from core.queries import QueryMeter
+
+IGNORED_METHODS = ("head", "options", "trace")
+
+
+class QueryBudget(NamedTuple):
+    queries: int
+    rows: int
+
+
+def route_methods(urlconf):
+    """
+    The (route name, HTTP method) pairs a URL conf serves.
+    """
+    routes = set()
+    patterns = list(get_resolver(urlconf).url_patterns)
+    while patterns:
+        pattern = patterns.pop()
+        if isinstance(pattern, URLResolver):
+            patterns.extend(pattern.url_patterns)
+            continue
+
+        callback = pattern.callback
+        if getattr(callback, "actions", None):
+            # Viewsets only answer the methods they allow
+            methods = [
+                method for method in callback.actions
+                if method not in IGNORED_METHODS and method in callback.cls.http_method_names]
+        elif hasattr(callback, "view_class"):
+            methods = [
+                method for method in callback.view_class.http_method_names
+                if method not in IGNORED_METHODS and hasattr(callback.view_class, method)]
+        else:
+            methods = ["get"]
+        routes.update((pattern.name, method) for method in methods)
+    return routes
+
+
+class QueryBudgetMixin:
+    """
+    Holds every route of `urlconf` to a budget of SQL queries and rows
+    fetched. `budgets` maps (route name, method) to a `QueryBudget`, or,
+    for routes whose work grows with the data, to one per list size.
+    """
+    urlconf = None
+    budgets = {}
+    list_sizes = (1, 10, 100)
+
+    def test_every_route_has_a_budget(self):
+        routes = route_methods(self.urlconf)
+        self.assertFalse(
+            routes - set(self.budgets),
+            f"Routes without a query budget: {sorted(routes - set(self.budgets))}")
+        self.assertFalse(
+            set(self.budgets) - routes,
+            f"Budgets of unknown routes: {sorted(set(self.budgets) - routes)}")
+
+    def assertWithinBudget(self, route, method, send, size=None):
+        """
+        Sends a request and fails, listing its SQL, if the response is an
+        error or the queries it ran exceed the route's budget.
+        """
+        budget = self.budgets[route, method]
+        if size is not None:
+            budget = budget[size]
+
+        with QueryMeter() as meter:
+            response = send()
+
+        label = f"{method.upper()} {route}" + (f" with {size} items" if size is not None else "")
+        self.assertLess(
+            response.status_code, 400,
+            f"{label} answered {response.status_code}: {getattr(response, 'data', '')}")
+        if meter.count > budget.queries or meter.rows > budget.rows:
+            self.fail(
+                f"{label} ran {meter.count} queries fetching {meter.rows} rows, over its "
+                f"budget of {budget.queries} queries and {budget.rows} rows:\n{meter.report()}")
+        return response
+
+    def assertSizedWithinBudget(self, route, method, populate, send):
+        """
+        Checks a route at each list size; `populate(count)` adds the items
+        that take the data from one size to the next.
+        """
+        created = 0
+        for size in self.list_sizes:
+            with self.subTest(size=size):
+                populate(size - created)
+                created = size
+                self.assertWithinBudget(route, method, send, size=size)
@@ -0,0 +1,23 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from core.cache import require_shared_cache
+
+LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SHARED_CACHE = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+
+
+class SharedCacheTest(SimpleTestCase):
+
+    @override_settings(CACHES=LOCAL_CACHE, API_WORKERS=4)
+    def test_workers_refuse_a_process_local_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            require_shared_cache()
+
+    @override_settings(CACHES=LOCAL_CACHE, API_WORKERS=1)
+    def test_single_worker_may_use_a_local_cache(self):
+        require_shared_cache()
+
+    @override_settings(CACHES=SHARED_CACHE, API_WORKERS=4)
+    def test_workers_with_a_shared_cache(self):
+        require_shared_cache()
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from core import lookups
+from core.enums import CompetitionType, RankingMethod
+from core.models import DataLookup
+
+
+class LookupRegistryTest(TestCase):
+    fixtures = ['lookup.json']
+
+    def setUp(self):
+        lookups.invalidate()
+
+    def test_lookups_are_served_from_the_registry(self):
+        lookups.get_registry()
+
+        with self.assertNumQueries(0):
+            multiple = lookups.get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value)
+            default = lookups.get_default(RankingMethod.TYPE.value)
+            methods = lookups.get_lookups(RankingMethod.TYPE.value)
+            by_id = lookups.get_lookup_by_id(multiple.id)
+
+        self.assertEqual(multiple.type, CompetitionType.TYPE.value)
+        self.assertTrue(default.is_default)
+        self.assertEqual([lookup.index for lookup in methods], sorted(lookup.index for lookup in methods))
+        self.assertEqual(by_id, multiple)
+
+    def test_unknown_value(self):
+        with self.assertRaises(DataLookup.DoesNotExist):
+            lookups.get_lookup("no_such_lookup")
+        self.assertIsNone(lookups.get_default("no_such_type"))
+
+    def test_changes_invalidate_the_registry(self):
+        lookup = lookups.get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value)
+        lookup_copy = DataLookup.objects.get(pk=lookup.pk)
+        lookup_copy.name = "Renamed"
+        lookup_copy.save()
+
+        self.assertEqual(
+            lookups.get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value).name, "Renamed")
+
+        lookup_copy.delete()
+        with self.assertRaises(DataLookup.DoesNotExist):
+            lookups.get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value)
+
+    def test_other_workers_reload_on_version_change(self):
+        """A version bump from another worker forces a reload."""
+        lookups.get_registry()
+        lookups.bump_version(lookups.VERSION_KEY)
+
+        with self.assertNumQueries(1):
+            lookups.get_registry()
@@ -0,0 +1,75 @@
+import base64
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase
+from django.utils.timezone import now
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from account.models import Role
+from core.pagination import KeysetPagination
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        self.roles = [
+            Role.objects.create(name=f"Role {index}", code=f"ROLE_{index}")
+            for index in range(7)
+        ]
+        # Give some rows the same timestamp so the id has to break ties
+        created_at = now()
+        for index, role in enumerate(self.roles):
+            role.created_at = created_at - timedelta(seconds=index // 3)
+        Role.objects.bulk_update(self.roles, ["created_at"])
+        self.ordered = sorted(self.roles, key=lambda role: (role.created_at, role.id), reverse=True)
+
+    def paginate(self, url="/roles?limit=3"):
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get(url))
+        page = paginator.paginate_queryset(Role.objects.all(), request)
+        return page, paginator.get_paginated_response([role.id for role in page]).data
+
+    def cursor_url(self, link):
+        return "/roles?" + urlparse(link).query
+
+    def test_pages_forward_and_back(self):
+        page, data = self.paginate()
+        self.assertEqual(page, self.ordered[:3])
+        self.assertEqual(data["metadata"]["total"], 7)
+        self.assertIsNone(data["metadata"]["previous"])
+
+        page, data = self.paginate(self.cursor_url(data["metadata"]["next"]))
+        self.assertEqual(page, self.ordered[3:6])
+
+        last_page, last_data = self.paginate(self.cursor_url(data["metadata"]["next"]))
+        self.assertEqual(last_page, self.ordered[6:])
+        self.assertIsNone(last_data["metadata"]["next"])
+
+        page, data = self.paginate(self.cursor_url(last_data["metadata"]["previous"]))
+        self.assertEqual(page, self.ordered[3:6])
+
+        page, data = self.paginate(self.cursor_url(data["metadata"]["previous"]))
+        self.assertEqual(page, self.ordered[:3])
+        self.assertIsNone(data["metadata"]["previous"])
+
+    def test_skip_total(self):
+        _, data = self.paginate()
+        next_url = self.cursor_url(data["metadata"]["next"]) + "&total=false"
+
+        with self.assertNumQueries(1):
+            page, data = self.paginate(next_url)
+        self.assertEqual(page, self.ordered[3:6])
+        self.assertIsNone(data["metadata"]["total"])
+        self.assertIn("total", parse_qs(urlparse(data["metadata"]["next"]).query))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            self.paginate("/roles?cursor=not-a-cursor")
+
+    def test_cursor_with_invalid_id(self):
+        cursor = base64.urlsafe_b64encode(b"2025-01-01T00:00:00+00:00|not-a-uuid|0").decode("ascii")
+        with self.assertRaises(NotFound):
+            self.paginate(f"/roles?cursor={cursor}")
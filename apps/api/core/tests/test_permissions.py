@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from account.models import Role, User
+from core.permissions import AbstractAccessPolicy
+
+
+class ExamplePolicy(AbstractAccessPolicy):
+    pass
+
+
+class View:
+    action_map = {"get": "list", "post": "create"}
+
+    def __init__(self, action):
+        self.action = action
+
+
+class CompiledAccessPolicyTest(SimpleTestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.write({"ExamplePolicy": {"statements": [
+            {"action": ["list"], "principal": ["*"], "effect": "allow"},
+            {"action": ["create"], "principal": ["role:admin"], "effect": "allow"},
+        ]}})
+        self.override = override_settings(POLICIES_FILE_PATH=self.path)
+        self.override.enable()
+        AbstractAccessPolicy.reload_policies()
+
+    def tearDown(self):
+        self.override.disable()
+        os.remove(self.path)
+        AbstractAccessPolicy.reload_policies()
+
+    def write(self, policies):
+        with open(self.path, "w") as f:
+            json.dump(policies, f)
+
+    def check(self, method, action, role_code):
+        request = APIRequestFactory().generic(method, "/")
+        request.user = User(email="policy@example.com", role=Role(code=role_code))
+        return ExamplePolicy().has_permission(request, View(action))
+
+    def test_decisions_are_compiled(self):
+        self.assertTrue(self.check("GET", "list", "player"))
+        self.assertFalse(self.check("POST", "create", "player"))
+        self.assertTrue(self.check("POST", "create", "admin"))
+
+        decisions = ExamplePolicy.get_compiled_policy().decisions
+        self.assertEqual(len(decisions), 3)
+        self.assertTrue(decisions[("create", "POST", (False, False, False, ("admin",)))])
+
+    @override_settings(POLICIES_AUTO_RELOAD=True)
+    def test_reload_when_the_file_changes(self):
+        self.assertFalse(self.check("POST", "create", "player"))
+
+        self.write({"ExamplePolicy": {"statements": [
+            {"action": ["create"], "principal": ["authenticated"], "effect": "allow"},
+        ]}})
+        mtime = AbstractAccessPolicy.policies_mtime + 1
+        os.utime(self.path, (mtime, mtime))
+
+        self.assertTrue(self.check("POST", "create", "player"))
+
+    def test_policies_with_conditions_are_not_compiled(self):
+        self.write({"ExamplePolicy": {"statements": [
+            {"action": ["list"], "principal": ["*"], "effect": "allow",
+             "condition": "is_weekday"},
+        ]}})
+        AbstractAccessPolicy.reload_policies()
+
+        self.assertFalse(ExamplePolicy.get_compiled_policy().static)
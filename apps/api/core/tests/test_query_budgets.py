@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.enums import SystemSettingKey
+from core.models import DataLookup, SystemSetting
+from core.services import invalidate_settings
+from core.tests.budgets import QueryBudget, QueryBudgetMixin
+
+
+class CoreQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    fixtures = ['lookup.json', 'setting.json']
+    urlconf = "core.urls"
+    budgets = {
+        ("api-root", "get"): QueryBudget(0, 0),
+        ("data-lookups-list", "get"): {
+            1: QueryBudget(1, 1), 10: QueryBudget(1, 10), 100: QueryBudget(1, 100)},
+        ("lookup-types-list", "get"): {
+            1: QueryBudget(1, 6), 10: QueryBudget(1, 15), 100: QueryBudget(1, 105)},
+        ("lookup-types-detail", "get"): QueryBudget(1, 1),
+        # Pages hold at most PAGE_SIZE settings, plus the count
+        ("system-settings-list", "get"): {
+            1: QueryBudget(2, 3), 10: QueryBudget(2, 12), 100: QueryBudget(2, 101)},
+        ("system-settings-detail", "patch"): QueryBudget(5, 4),
+        ("system-settings-reset", "patch"): QueryBudget(4, 3),
+    }
+
+    def setUp(self):
+        # Throttle history lives in the cache
+        cache.clear()
+        invalidate_settings()
+        self.setting = SystemSetting.objects.get(key=SystemSettingKey.LEADERBOARD_SIZE.value)
+        self.lookups = 0
+
+    def add_lookups(self, count, lookup_type="budget_test"):
+        DataLookup.objects.bulk_create(
+            DataLookup(type=lookup_type, name=f"Lookup {index}", value=f"{lookup_type}_{index}",
+                       index=index)
+            for index in range(self.lookups, self.lookups + count)
+        )
+        self.lookups += count
+
+    def test_api_root(self):
+        self.assertWithinBudget(
+            "api-root", "get", lambda: self.client.get(reverse("api-root")))
+
+    def test_data_lookups(self):
+        self.assertSizedWithinBudget(
+            "data-lookups-list", "get", self.add_lookups,
+            lambda: self.client.get(reverse("data-lookups-list"), {"type": "budget_test"}))
+
+    def test_lookup_types(self):
+        def populate(count):
+            for _ in range(count):
+                self.add_lookups(1, lookup_type=f"budget_test_{self.lookups}")
+
+        self.assertSizedWithinBudget(
+            "lookup-types-list", "get", populate,
+            lambda: self.client.get(reverse("lookup-types-list")))
+
+    def test_lookup_type(self):
+        lookup = DataLookup.objects.first()
+        self.assertWithinBudget(
+            "lookup-types-detail", "get",
+            lambda: self.client.get(reverse("lookup-types-detail", args=[lookup.id])))
+
+    def test_system_settings(self):
+        def populate(count):
+            offset = SystemSetting.objects.count()
+            SystemSetting.objects.bulk_create(
+                SystemSetting(name=f"Setting {index}", key=f"budget_test_{index}",
+                              default_value="1", current_value="1")
+                for index in range(offset, offset + count)
+            )
+
+        self.assertSizedWithinBudget(
+            "system-settings-list", "get", populate,
+            lambda: self.client.get(reverse("system-settings-list")))
+
+    def test_update_and_reset_setting(self):
+        self.assertWithinBudget(
+            "system-settings-detail", "patch",
+            lambda: self.client.patch(
+                reverse("system-settings-detail", args=[self.setting.id]),
+                {"current_value": "25"}, format="json"))
+        self.assertWithinBudget(
+            "system-settings-reset", "patch",
+            lambda: self.client.patch(
+                reverse("system-settings-reset", args=[self.setting.id]), {}, format="json"))
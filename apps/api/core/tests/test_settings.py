@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.enums import SystemSettingKey
+from core.models import SystemSetting
+from core.services import get_setting, invalidate_settings
+
+
+class SystemSettingServiceTest(APITestCase):
+    fixtures = ['setting.json']
+
+    def setUp(self):
+        cache.clear()
+        invalidate_settings()
+        self.setting = SystemSetting.objects.get(key=SystemSettingKey.LEADERBOARD_SIZE.value)
+
+    def test_typed_value_is_cached(self):
+        self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 10)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 10)
+
+    @override_settings(SYSTEM_SETTINGS_CACHE_TTL=0)
+    def test_value_is_reread_after_ttl(self):
+        get_setting(SystemSettingKey.LEADERBOARD_SIZE.value)
+        SystemSetting.objects.filter(pk=self.setting.pk).update(current_value="25")
+
+        self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 25)
+
+    def test_update_through_api_invalidates(self):
+        get_setting(SystemSettingKey.LEADERBOARD_SIZE.value)
+        url = reverse("system-settings-detail", args=[self.setting.id])
+
+        response = self.client.patch(url, {"current_value": "20"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 20)
+
+        response = self.client.patch(reverse("system-settings-reset", args=[self.setting.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 10)
+
+    def test_value_is_validated_against_the_scheme(self):
+        url = reverse("system-settings-detail", args=[self.setting.id])
+
+        for value in ("0", "many"):
+            response = self.client.patch(url, {"current_value": value}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_stored_value_falls_back_to_default(self):
+        SystemSetting.objects.filter(pk=self.setting.pk).update(current_value="-3")
+
+        self.assertEqual(get_setting(SystemSettingKey.LEADERBOARD_SIZE.value), 10)
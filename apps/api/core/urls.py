@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework import routers
 from .views import (
+    DataLookupListView,
     DataLookupViewSet,
     DataLookupTypeViewSet,
     SystemSettingViewSet)
@@ -12,3 +15,8 @@ router.register('system-settings', SystemSettingViewSet,
                 basename='system-settings')
 
 urlpatterns = router.urls
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('data-lookups', DataLookupListView.as_view(), name='data-lookups-list'),
+    ] + urlpatterns
@@ -10,7 +10,9 @@ from http import HTTPMethod
 
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .async_views import AsyncGenericAPIView
 from .models import DataLookup, SystemSetting
+from .services import invalidate_settings
 from .serializers import (DataLookupSerializer,
                           DataLookupTypeSerializer,
                           SystemSettingSerializer,
@@ -31,6 +33,24 @@ class DataLookupViewSet(mixins.ListModelMixin,
                         "is_default", 'is_active']
 
 
+class DataLookupListView(AsyncGenericAPIView):
+    """
+    Async variant of the `DataLookupViewSet` list, enabled by
+    `ASYNC_READ_VIEWS`.
+    """
+    permission_classes = DataLookupViewSet.permission_classes
+    queryset = DataLookupViewSet.queryset
+    serializer_class = DataLookupViewSet.serializer_class
+    filter_backends = DataLookupViewSet.filter_backends
+    search_fields = DataLookupViewSet.search_fields
+    filterset_fields = DataLookupViewSet.filterset_fields
+
+    async def get(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookups = [lookup async for lookup in queryset.aiterator()]
+        return Response(self.get_serializer(lookups, many=True).data)
+
+
 class DataLookupTypeViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     pagination_class = None
@@ -49,6 +69,10 @@ class SystemSettingViewSet(mixins.ListModelMixin, mixins.UpdateModelMixin,
     serializer_class = SystemSettingSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
 
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_settings()
+
     @extend_schema(
         responses=SystemSettingResponseSerializer
     )
@@ -63,5 +87,6 @@ class SystemSettingViewSet(mixins.ListModelMixin, mixins.UpdateModelMixin,
         if serializer.is_valid(raise_exception=True):
             instance.current_value = instance.default_value
             instance.save()
+            invalidate_settings()
             return Response(SystemSettingResponseSerializer(
                 instance).data, status=status.HTTP_200_OK)
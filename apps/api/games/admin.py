@@ -1,6 +1,8 @@
 from django.contrib import admin
-from games.models import Competition, CompetitionEntry, Score
+from games.models import (
+    Competition, CompetitionEntry, CompetitionStanding, EntryAggregate, Score, ScoreSubmission)
 from core.admin import BaseModelAdmin
+from games.services import reopen_competition
 
 
 @admin.register(Competition)
@@ -8,11 +10,11 @@ class CompetitionAdmin(BaseModelAdmin):
     """
     Admin configuration for the Competition model.
     """
-    list_display = ("name", "type", "max_players", "start_time", "end_time", "is_full", "created_by")
+    list_display = ("name", "type", "max_players", "entries_count", "start_time", "end_time", "is_full", "created_by")
     list_filter = ("type", "ranking_method", "tiebreaker_rule", "start_time")
     search_fields = ("name", "description", "created_by__email")
     ordering = ("-created_at",)
-    readonly_fields = ("is_full",)
+    readonly_fields = ("entries_count", "is_full", "finalized_at", "scores_compacted")
 
     fieldsets = (
         ("Basic Info", {
@@ -25,10 +27,18 @@ class CompetitionAdmin(BaseModelAdmin):
             "fields": ("start_time", "end_time")
         }),
         ("Status", {
-            "fields": ("is_full",)
+            "fields": ("entries_count", "is_full", "finalized_at", "scores_compacted")
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Extending a finalized competition reopens its standings
+        previous_end_time = form.initial.get("end_time")
+        if change and obj.finalized_at is not None and "end_time" in form.changed_data and (
+                obj.end_time is None or obj.end_time > previous_end_time):
+            reopen_competition(obj)
+
 
 @admin.register(CompetitionEntry)
 class CompetitionEntryAdmin(BaseModelAdmin):
@@ -62,3 +72,51 @@ class ScoreAdmin(BaseModelAdmin):
             "fields": ("entry", "score")
         }),
     )
+
+
+@admin.register(EntryAggregate)
+class EntryAggregateAdmin(BaseModelAdmin):
+    """
+    Admin configuration for the EntryAggregate model.
+    Aggregates are maintained by score submissions, so they are read-only here.
+    """
+    list_display = ("entry", "best_score", "total_score", "score_count", "last_submitted_at")
+    list_filter = ("competition",)
+    search_fields = ("competition__name", "entry__player__email")
+    ordering = ("competition", "-best_score", "best_reached_at")
+    readonly_fields = (
+        "entry", "competition", "best_score", "total_score", "score_count",
+        "mean_score", "best_reached_at", "last_submitted_at"
+    )
+
+
+@admin.register(CompetitionStanding)
+class CompetitionStandingAdmin(BaseModelAdmin):
+    """
+    Admin configuration for the CompetitionStanding model.
+    Standings are frozen when a competition is finalized, so they are read-only here.
+    """
+    list_display = ("competition", "position", "rank", "player", "best_score", "score_count")
+    list_filter = ("competition",)
+    search_fields = ("competition__name", "player__email")
+    ordering = ("competition", "position")
+    readonly_fields = (
+        "competition", "player", "position", "rank", "best_score", "total_score",
+        "mean_score", "score_count"
+    )
+
+
+@admin.register(ScoreSubmission)
+class ScoreSubmissionAdmin(BaseModelAdmin):
+    """
+    Admin configuration for the ScoreSubmission model.
+    Submissions are processed by the batch writer, so they are read-only here.
+    """
+    list_display = ("competition", "player", "score", "status", "created_at", "processed_at")
+    list_filter = ("status", "competition")
+    search_fields = ("competition__name", "player__email")
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "competition", "player", "score", "status", "recorded_score", "errors",
+        "processed_at"
+    )
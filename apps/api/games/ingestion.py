@@ -0,0 +1,296 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from core.enums import ScoreSubmissionStatus
+from core.lookups import get_lookup
+from games.models import ScoreSubmission
+from games.services import submit_scores
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreBroker(ABC):
+    """
+    Queue of pending `ScoreSubmission` ids between the API and the batch
+    writer. The submission rows are the durable record of each score; a
+    broker only decides the order in which the writer picks them up.
+    """
+
+    @abstractmethod
+    def publish(self, submission_ids):
+        ...
+
+    @abstractmethod
+    def consume(self, batch_size):
+        """
+        Claims up to `batch_size` submission ids. Called inside the writer's
+        transaction.
+        """
+
+    def ack(self):
+        """
+        Confirms the last consumed batch once its transaction has committed.
+        """
+
+    def reject(self):
+        """
+        Returns the last consumed batch to the queue after a failed write.
+        """
+
+
+class DatabaseBroker(ScoreBroker):
+    """
+    Uses the `score_submission` table itself as the queue. Concurrent
+    writers skip each other's locked rows.
+    """
+
+    def publish(self, submission_ids):
+        pass
+
+    def consume(self, batch_size):
+        return list(
+            ScoreSubmission.objects.select_for_update(skip_locked=True)
+            .filter(status=get_lookup(ScoreSubmissionStatus.PENDING.value))
+            .order_by("created_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+
+class InMemoryBroker(ScoreBroker):
+    """
+    Process-local queue, for tests and single-process development.
+    """
+
+    def __init__(self):
+        self.queue = deque()
+        self.in_flight = []
+        self.lock = threading.Lock()
+
+    def publish(self, submission_ids):
+        with self.lock:
+            self.queue.extend(submission_ids)
+
+    def consume(self, batch_size):
+        with self.lock:
+            self.in_flight = [
+                self.queue.popleft() for _ in range(min(batch_size, len(self.queue)))
+            ]
+            return list(self.in_flight)
+
+    def ack(self):
+        self.in_flight = []
+
+    def reject(self):
+        with self.lock:
+            self.queue.extendleft(reversed(self.in_flight))
+            self.in_flight = []
+
+
+class RabbitMQBroker(ScoreBroker):
+    """
+    Durable RabbitMQ queue, for deployments with several API and writer
+    processes. One broker serves the whole process, but pika connections
+    are not thread-safe, so each thread opens its own connection and keeps
+    its own in-flight delivery.
+    """
+
+    def __init__(self):
+        import pika
+
+        self.pika = pika
+        self.queue = settings.SCORE_INGESTION_QUEUE
+        self.local = threading.local()
+
+    @property
+    def last_delivery_tag(self):
+        return getattr(self.local, "last_delivery_tag", None)
+
+    @last_delivery_tag.setter
+    def last_delivery_tag(self, delivery_tag):
+        self.local.last_delivery_tag = delivery_tag
+
+    def channel(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None or connection.is_closed:
+            self.local.connection = self.pika.BlockingConnection(
+                self.pika.URLParameters(settings.RABBITMQ_URL))
+            self.local.channel = self.local.connection.channel()
+            self.local.channel.queue_declare(queue=self.queue, durable=True)
+        return self.local.channel
+
+    def publish(self, submission_ids):
+        channel = self.channel()
+        for submission_id in submission_ids:
+            channel.basic_publish(
+                exchange="",
+                routing_key=self.queue,
+                body=json.dumps(str(submission_id)),
+                properties=self.pika.BasicProperties(
+                    delivery_mode=self.pika.DeliveryMode.Persistent),
+            )
+
+    def consume(self, batch_size):
+        channel = self.channel()
+        submission_ids = []
+        for _ in range(batch_size):
+            method, _, body = channel.basic_get(queue=self.queue)
+            if method is None:
+                break
+            self.last_delivery_tag = method.delivery_tag
+            submission_ids.append(json.loads(body))
+        return submission_ids
+
+    def ack(self):
+        if self.last_delivery_tag is not None:
+            self.channel().basic_ack(delivery_tag=self.last_delivery_tag, multiple=True)
+            self.last_delivery_tag = None
+
+    def reject(self):
+        if self.last_delivery_tag is not None:
+            self.channel().basic_nack(
+                delivery_tag=self.last_delivery_tag, multiple=True, requeue=True)
+            self.last_delivery_tag = None
+
+
+@lru_cache
+def _load_broker(path):
+    return import_string(path)()
+
+
+def get_broker():
+    return _load_broker(settings.SCORE_INGESTION_BROKER)
+
+
+def is_async():
+    return settings.SCORE_INGESTION_ASYNC
+
+
+def publish_submissions(submission_ids):
+    """
+    Queues stored submissions. A failure is only logged: the rows are
+    already committed, and the writer requeues submissions left pending.
+    """
+    try:
+        get_broker().publish(submission_ids)
+    except Exception:
+        logger.exception("Queueing %d score submissions failed", len(submission_ids))
+
+
+def enqueue_score(competition, player, score):
+    """
+    Records a score for asynchronous ingestion and queues it once the
+    submission row has committed.
+    """
+    submission = ScoreSubmission.objects.create(
+        competition=competition,
+        player=player,
+        score=score,
+        status=get_lookup(ScoreSubmissionStatus.PENDING.value),
+    )
+    transaction.on_commit(lambda: publish_submissions([submission.id]))
+    return submission
+
+
+class ScoreBatchWriter:
+    """
+    Drains queued submissions into `Score` in large transactions, using the
+    same validation and bulk writes as the bulk submission endpoint.
+    """
+
+    def __init__(self, broker=None, batch_size=500):
+        self.broker = broker or get_broker()
+        self.batch_size = batch_size
+
+    def drain_batch(self):
+        """
+        Processes one batch. Returns the number of submissions processed.
+        """
+        try:
+            with transaction.atomic():
+                submission_ids = self.broker.consume(self.batch_size)
+                submissions = list(
+                    ScoreSubmission.objects.select_for_update()
+                    .filter(id__in=submission_ids,
+                            status=get_lookup(ScoreSubmissionStatus.PENDING.value))
+                    .order_by("created_at")
+                )
+
+                results = submit_scores([
+                    {
+                        "index": index,
+                        "competition": submission.competition_id,
+                        "player": submission.player_id,
+                        "score": submission.score,
+                        "submitted_at": submission.created_at,
+                    }
+                    for index, submission in enumerate(submissions)
+                ])
+
+                processed_at = now()
+                for submission, result in zip(submissions, results):
+                    if result["status"] == "created":
+                        submission.status = get_lookup(ScoreSubmissionStatus.ACCEPTED.value)
+                        submission.recorded_score_id = result["id"]
+                    else:
+                        submission.status = get_lookup(ScoreSubmissionStatus.REJECTED.value)
+                        submission.errors = result["errors"]
+                    submission.processed_at = processed_at
+                    submission.updated_at = processed_at
+
+                ScoreSubmission.objects.bulk_update(
+                    submissions,
+                    ["status", "recorded_score", "errors", "processed_at", "updated_at"],
+                    batch_size=500
+                )
+        except Exception:
+            self.broker.reject()
+            raise
+
+        self.broker.ack()
+        return len(submission_ids)
+
+    def requeue_stale(self):
+        """
+        Publishes again the submissions still pending after
+        `SCORE_INGESTION_REQUEUE_AFTER` seconds, whose publish failed or was
+        lost. Their `updated_at` moves on, so each is requeued at most once
+        per interval; duplicates are harmless, as only pending rows are
+        written. Returns the number requeued.
+        """
+        requeued_at = now()
+        with transaction.atomic():
+            stale = list(
+                ScoreSubmission.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=get_lookup(ScoreSubmissionStatus.PENDING.value),
+                    updated_at__lt=requeued_at - timedelta(
+                        seconds=settings.SCORE_INGESTION_REQUEUE_AFTER))
+                .values_list("id", flat=True)[:self.batch_size]
+            )
+            ScoreSubmission.objects.filter(id__in=stale).update(updated_at=requeued_at)
+        if stale:
+            publish_submissions(stale)
+        return len(stale)
+
+    def drain(self):
+        """
+        Requeues stale submissions, then processes batches until the queue
+        is empty. Returns the total processed.
+        """
+        self.requeue_stale()
+        total = 0
+        while True:
+            processed = self.drain_batch()
+            total += processed
+            if processed < self.batch_size:
+                return total
@@ -0,0 +1,280 @@
+import threading
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F
+
+from core.cache import bump_version, get_version
+from games.models import EntryAggregate
+
+
+class LeaderboardIndex:
+    """
+    Sorted, in-memory copy of one competition's ranking.
+
+    Rankings are kept in compact parallel arrays ordered best-first: the
+    negated ranking score, the tiebreaker timestamp (negated when the latest
+    submission wins), and the 16-byte entry and player ids. Lookups are
+    binary searches; updates shift the arrays in place. Reads and updates
+    hold the index's lock, so a reader never sees the arrays half-shifted.
+    """
+
+    ID_SIZE = 16
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.scores = array("d")
+        self.tiebreaks = array("d")
+        self.entries = bytearray()
+        self.players = bytearray()
+        # player id bytes -> (score key, tiebreak key, player name,
+        #                     score, best score, score count)
+        self.members = {}
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.scores)
+
+    def keys(self, score, tiebreak_at):
+        timestamp = tiebreak_at.timestamp()
+        return -float(score), -timestamp if self.strategy.latest_first else timestamp
+
+    def _bounds(self, score_key, tiebreak_key):
+        """
+        Range of positions holding entries with exactly these keys.
+        """
+        lo = bisect_left(self.scores, score_key)
+        hi = bisect_right(self.scores, score_key, lo)
+        return (
+            bisect_left(self.tiebreaks, tiebreak_key, lo, hi),
+            bisect_right(self.tiebreaks, tiebreak_key, lo, hi),
+        )
+
+    def _player_at(self, position):
+        return bytes(self.players[position * self.ID_SIZE:(position + 1) * self.ID_SIZE])
+
+    def _position_of(self, player_key, member):
+        lo, hi = self._bounds(*member[:2])
+        for position in range(lo, hi):
+            if self._player_at(position) == player_key:
+                return position
+        return None
+
+    def _member(self, row):
+        score = row[self.strategy.score_field]
+        return (
+            *self.keys(score, row[self.strategy.tiebreak_field]),
+            row["player_name"], score, row["best_score"], row["score_count"]
+        )
+
+    def add(self, row):
+        """
+        Inserts or moves an entry. `row` carries the aggregate columns plus
+        `entry_id`, `player_id` and `player_name`.
+        """
+        size = self.ID_SIZE
+        player_key = row["player_id"].bytes
+        member = self._member(row)
+
+        with self.lock:
+            previous = self.members.get(player_key)
+            if previous is not None:
+                position = self._position_of(player_key, previous)
+                del self.scores[position]
+                del self.tiebreaks[position]
+                del self.entries[position * size:(position + 1) * size]
+                del self.players[position * size:(position + 1) * size]
+
+            _, position = self._bounds(*member[:2])
+            self.scores.insert(position, member[0])
+            self.tiebreaks.insert(position, member[1])
+            self.entries[position * size:position * size] = row["entry_id"].bytes
+            self.players[position * size:position * size] = player_key
+            self.members[player_key] = member
+
+    def extend_sorted(self, rows):
+        """
+        Appends rows that already arrive in ranking order, skipping the
+        binary searches. Used for the initial load.
+        """
+        with self.lock:
+            for row in rows:
+                player_key = row["player_id"].bytes
+                member = self._member(row)
+                self.scores.append(member[0])
+                self.tiebreaks.append(member[1])
+                self.entries += row["entry_id"].bytes
+                self.players += player_key
+                self.members[player_key] = member
+
+    def rank_of_keys(self, score_key, tiebreak_key):
+        """
+        Number of entries strictly ahead of these keys, plus one.
+        """
+        return self._bounds(score_key, tiebreak_key)[0] + 1
+
+    def standing(self, player_key, member, rank):
+        _, _, name, score, best_score, score_count = member
+        return {
+            "rank": rank,
+            "player_id": uuid.UUID(bytes=player_key),
+            "player_name": name,
+            "score": score,
+            "highest_score": best_score,
+            "total_entries": score_count,
+        }
+
+    def rank_of(self, player_id):
+        """
+        Returns the player's leaderboard row, or None if unranked.
+        """
+        player_key = player_id.bytes
+        with self.lock:
+            member = self.members.get(player_key)
+            if member is None:
+                return None
+            rank = self.rank_of_keys(*member[:2])
+        return self.standing(player_key, member, rank)
+
+    def slice(self, start, stop):
+        """
+        Leaderboard rows for positions [start, stop).
+        """
+        rows = []
+        previous = None
+        with self.lock:
+            for position in range(max(start, 0), min(stop, len(self))):
+                player_key = self._player_at(position)
+                member = self.members[player_key]
+                if previous and previous[1][:2] == member[:2]:
+                    rank = previous[2]
+                else:
+                    rank = self.rank_of_keys(*member[:2])
+                previous = (player_key, member, rank)
+                rows.append(previous)
+        return [self.standing(*row) for row in rows]
+
+    def top(self, limit):
+        return self.slice(0, limit)
+
+    def around(self, player_id, radius):
+        """
+        Rows within `radius` positions of the player, or None if unranked.
+        """
+        player_key = player_id.bytes
+        with self.lock:
+            member = self.members.get(player_key)
+            if member is None:
+                return None
+            position = self._position_of(player_key, member)
+            return self.slice(position - radius, position + radius + 1)
+
+    def memory_usage(self):
+        """
+        Approximate bytes held by the sorted arrays.
+        """
+        with self.lock:
+            return (
+                self.scores.itemsize * len(self.scores)
+                + self.tiebreaks.itemsize * len(self.tiebreaks)
+                + len(self.entries) + len(self.players)
+            )
+
+
+AGGREGATE_FIELDS = (
+    "entry_id", "best_score", "total_score", "score_count", "mean_score",
+    "best_reached_at", "last_submitted_at",
+)
+
+_lock = threading.Lock()
+# competition id -> (version, index), least recently used first
+_indexes = OrderedDict()
+
+
+def _version_key(competition_id):
+    return f"games:leaderboard-index:{competition_id}"
+
+
+def index_row_fields():
+    """
+    Extra `values()` expressions that complete an aggregate row for the index.
+    """
+    return {
+        "player_id": F("entry__player_id"),
+        "player_name": F("entry__player__full_name"),
+    }
+
+
+def is_enabled():
+    return settings.LEADERBOARD_INDEX_ENABLED
+
+
+def _keep(competition_id, version, index):
+    """
+    Caches an index, evicting the least recently used ones beyond
+    `LEADERBOARD_INDEX_MAX_COMPETITIONS`. Call with `_lock` held.
+    """
+    _indexes[competition_id] = (version, index)
+    _indexes.move_to_end(competition_id)
+    while len(_indexes) > settings.LEADERBOARD_INDEX_MAX_COMPETITIONS:
+        _indexes.popitem(last=False)
+
+
+def _load(competition_id, strategy):
+    index = LeaderboardIndex(strategy)
+    index.extend_sorted(
+        EntryAggregate.objects.filter(competition_id=competition_id)
+        .order_by(*strategy.order_by())
+        .values(*AGGREGATE_FIELDS, **index_row_fields())
+        .iterator(chunk_size=5000)
+    )
+    return index
+
+
+def get_index(competition_id, strategy):
+    """
+    Returns this process's index for a competition, building it on first use
+    or when another worker has changed the competition since it was built.
+    """
+    version = get_version(_version_key(competition_id))
+    with _lock:
+        cached = _indexes.get(competition_id)
+        if cached and cached[0] == version and cached[1].strategy is strategy:
+            _indexes.move_to_end(competition_id)
+            return cached[1]
+
+    index = _load(competition_id, strategy)
+    with _lock:
+        _keep(competition_id, version, index)
+    return index
+
+
+def apply(competition_id, row):
+    """
+    Publishes a changed aggregate. The local index is patched in place with
+    `row`, which must be complete already (no queries run under the lock),
+    when it is current; every other worker rebuilds on its next read.
+    """
+    version = bump_version(_version_key(competition_id))
+    with _lock:
+        cached = _indexes.get(competition_id)
+        if cached is None:
+            return
+        if cached[0] == version - 1:
+            cached[1].add(row)
+            _keep(competition_id, version, cached[1])
+        else:
+            del _indexes[competition_id]
+
+
+def invalidate(competition_id):
+    """
+    Forces every worker to rebuild the competition's index on its next read,
+    and frees this worker's copy.
+    """
+    bump_version(_version_key(competition_id))
+    with _lock:
+        _indexes.pop(competition_id, None)
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from core.enums import SystemSettingKey
+from core.services import get_setting
+from games import services
+from games.models import Competition
+
+logger = logging.getLogger(__name__)
+
+
+class Backplane(ABC):
+    """
+    Carries "the standings of this competition may have changed" between
+    workers. Every worker delivers the ids it receives to its own hub.
+    """
+
+    @abstractmethod
+    def publish(self, competition_id):
+        ...
+
+    @abstractmethod
+    def start(self, deliver):
+        """
+        Starts calling `deliver(competition_id)` for ids published by any
+        worker. Called once per process.
+        """
+
+
+class InMemoryBackplane(Backplane):
+    """
+    Delivers within the publishing process only, for tests and single-worker
+    deployments.
+    """
+
+    def __init__(self):
+        self.deliver = None
+
+    def publish(self, competition_id):
+        if self.deliver is not None:
+            self.deliver(competition_id)
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+
+class PostgresBackplane(Backplane):
+    """
+    Fans out through Postgres `NOTIFY`, so every API worker connected to the
+    database hears about every score, without another service to run.
+    """
+    channel = "leaderboard_changes"
+    # Seconds between reconnection attempts, doubling up to the maximum
+    retry_delay = 1
+    max_retry_delay = 60
+
+    def publish(self, competition_id):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, str(competition_id)])
+
+    def start(self, deliver):
+        threading.Thread(target=self.listen, args=(deliver,), daemon=True).start()
+
+    def listen(self, deliver):
+        """
+        Delivers notifications for the life of the process, reconnecting
+        with backoff whenever the LISTEN connection fails or drops.
+        """
+        delay = self.retry_delay
+        while True:
+            try:
+                for competition_id in self.notifications():
+                    delay = self.retry_delay
+                    deliver(competition_id)
+            except Exception:
+                logger.exception("Listening for leaderboard changes failed; retrying in %ss", delay)
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    def notifications(self):
+        import psycopg
+
+        database = settings.DATABASES["default"]
+        with psycopg.connect(
+            host=database["HOST"],
+            port=database["PORT"],
+            dbname=database["NAME"],
+            user=database["USER"],
+            password=database["PASSWORD"],
+            autocommit=True,
+        ) as listener:
+            listener.execute(f"LISTEN {self.channel}")
+            for notify in listener.notifies():
+                yield uuid.UUID(notify.payload)
+
+
+@lru_cache
+def _load_backplane(path):
+    return import_string(path)()
+
+
+def get_backplane():
+    return _load_backplane(settings.LEADERBOARD_BACKPLANE)
+
+
+def publish(competition_id):
+    """
+    Announces that a competition's standings may have changed. Called after
+    the write commits.
+    """
+    get_backplane().publish(competition_id)
+
+
+def load_leaderboard(competition_id):
+    competition = Competition.objects.get(pk=competition_id)
+    rows = services.get_leaderboard(
+        competition, limit=get_setting(SystemSettingKey.LEADERBOARD_SIZE.value))
+    return [{**row, "player_id": str(row["player_id"])} for row in rows]
+
+
+def rank_deltas(previous, current):
+    """
+    Rows of `current` that are new or changed since `previous`, with the
+    rank each player held before, and the players who left the board.
+    """
+    before = {row["player_id"]: row for row in previous}
+    changed = [
+        {**row, "previous_rank": before[row["player_id"]]["rank"] if row["player_id"] in before else None}
+        for row in current
+        if before.get(row["player_id"]) != row
+    ]
+    remaining = {row["player_id"] for row in current}
+    removed = [player_id for player_id in before if player_id not in remaining]
+    return {"changed": changed, "removed": removed}
+
+
+class CompetitionChannel:
+    """
+    One competition's subscribers in one process. A single publisher task
+    reloads the leaderboard when it is marked dirty, at most `rate` times a
+    second, and hands the same deltas to every subscriber. If a reload
+    fails, the current subscribers are closed (clients reconnect and get a
+    fresh snapshot) and the task carries on for the next update.
+    """
+
+    def __init__(self, competition_id, rate):
+        self.competition_id = competition_id
+        self.rate = rate
+        self.loop = asyncio.get_running_loop()
+        self.subscribers = set()
+        self.dirty = asyncio.Event()
+        self.rows = None
+        self.task = None
+
+    def mark_dirty(self):
+        self.loop.call_soon_threadsafe(self.dirty.set)
+
+    async def snapshot(self):
+        if self.rows is None:
+            self.rows = await sync_to_async(load_leaderboard)(self.competition_id)
+        return self.rows
+
+    async def run(self):
+        while True:
+            await self.dirty.wait()
+            self.dirty.clear()
+
+            try:
+                rows = await sync_to_async(load_leaderboard)(self.competition_id)
+            except Exception:
+                logger.exception("Reloading the leaderboard of competition %s failed", self.competition_id)
+                self.close_subscribers()
+            else:
+                deltas = rank_deltas(self.rows or [], rows)
+                self.rows = rows
+                if deltas["changed"] or deltas["removed"]:
+                    for queue in self.subscribers:
+                        queue.put_nowait(deltas)
+
+            # Writes that land while sleeping coalesce into the next update
+            await asyncio.sleep(1 / self.rate)
+
+    def close_subscribers(self):
+        """
+        Ends every current subscriber's stream; their last deltas can no
+        longer be trusted.
+        """
+        self.rows = None
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+
+
+class LeaderboardHub:
+    """
+    The process's subscriptions, by competition.
+    """
+
+    def __init__(self):
+        self.channels = {}
+        self.lock = threading.Lock()
+
+    def notify(self, competition_id):
+        with self.lock:
+            channel = self.channels.get(competition_id)
+        if channel is not None:
+            channel.mark_dirty()
+
+    async def subscribe(self, competition_id):
+        """
+        Returns `(channel, queue)`. The queue receives the deltas of every
+        update until `unsubscribe` is called.
+        """
+        with self.lock:
+            channel = self.channels.get(competition_id)
+            if channel is None:
+                channel = CompetitionChannel(competition_id, settings.LEADERBOARD_PUSH_RATE)
+                self.channels[competition_id] = channel
+            queue = asyncio.Queue()
+            channel.subscribers.add(queue)
+        if channel.task is None:
+            channel.task = asyncio.create_task(channel.run())
+        return channel, queue
+
+    def unsubscribe(self, channel, queue):
+        with self.lock:
+            channel.subscribers.discard(queue)
+            if channel.subscribers:
+                return
+            self.channels.pop(channel.competition_id, None)
+        if channel.task is not None:
+            channel.task.cancel()
+
+
+_hub_lock = threading.Lock()
+_hub = None
+
+
+def get_hub():
+    """
+    Returns this process's hub, connecting it to the backplane on first use.
+    """
+    global _hub
+
+    with _hub_lock:
+        if _hub is None:
+            _hub = LeaderboardHub()
+            get_backplane().start(_hub.notify)
+        return _hub
+
+
+def server_sent_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def leaderboard_events(competition_id):
+    """
+    Server-sent events for one competition: a `snapshot` of the leaderboard,
+    then a `delta` whenever the standings change, with comments in between
+    to keep idle connections open. Ends when the channel closes it.
+    """
+    hub = get_hub()
+    channel, queue = await hub.subscribe(competition_id)
+    try:
+        yield server_sent_event("snapshot", await channel.snapshot())
+        while True:
+            try:
+                deltas = await asyncio.wait_for(
+                    queue.get(), timeout=settings.LEADERBOARD_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if deltas is None:
+                return
+            yield server_sent_event("delta", deltas)
+    finally:
+        hub.unsubscribe(channel, queue)
@@ -0,0 +1,131 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, connection, transaction
+from django.utils.timezone import now
+
+from core.enums import CompetitionType, RankingMethod, TiebreakerRule
+from core.lookups import get_lookup
+from games.models import Competition, CompetitionEntry
+from games.services import join_competition
+
+
+def legacy_join(competition, player):
+    """
+    The previous join path: check the capacity, then insert.
+    """
+    with transaction.atomic():
+        if competition.max_players and (
+                CompetitionEntry.objects.filter(competition=competition).count()
+                >= competition.max_players):
+            return None
+        return CompetitionEntry.objects.create(
+            competition=competition, player=player, entry_fee=0)
+
+
+class Command(BaseCommand):
+    help = 'Run concurrent joins against one competition and report throughput and overshoot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Concurrent joining threads (default: 16).',
+        )
+        parser.add_argument(
+            '--players',
+            type=int,
+            default=2000,
+            help='Players attempting to join (default: 2000).',
+        )
+        parser.add_argument(
+            '--max-players',
+            type=int,
+            default=1000,
+            help='Capacity of the competition, 0 for no limit (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'path':>8} {'joins/s':>10} {'admitted':>9} {'rejected':>9} {'entries':>8} {'capacity':>9}")
+
+        for name, join in (("legacy", legacy_join), ("guarded", self.guarded_join)):
+            # Threads need committed data, so the run cleans up after itself
+            # instead of rolling back.
+            competition, players = self.populate(options['players'], options['max_players'])
+            try:
+                elapsed, admitted, rejected = self.run(
+                    join, competition, players, options['threads'])
+                entries = CompetitionEntry.objects.filter(competition=competition).count()
+            finally:
+                self.cleanup(competition, players)
+
+            self.stdout.write(
+                f"{name:>8} {len(players) / elapsed:>10.1f} {admitted:>9} {rejected:>9}"
+                f" {entries:>8} {options['max_players'] or '-':>9}")
+
+    def guarded_join(self, competition, player):
+        return join_competition(competition, player, 0)
+
+    def run(self, join, competition, players, threads):
+        admitted = []
+        rejected = []
+        barrier = threading.Barrier(threads)
+
+        def worker(chunk):
+            try:
+                barrier.wait()
+                for player in chunk:
+                    try:
+                        entry = join(competition, player)
+                    except IntegrityError:
+                        entry = None
+                    (admitted if entry else rejected).append(player)
+            finally:
+                connection.close()
+
+        workers = [
+            threading.Thread(target=worker, args=(players[index::threads],))
+            for index in range(threads)
+        ]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return time.perf_counter() - started, len(admitted), len(rejected)
+
+    def populate(self, size, max_players):
+        UserModel = get_user_model()
+        run_id = uuid.uuid4().hex[:8]
+
+        players = UserModel.objects.bulk_create(
+            (
+                UserModel(email=f"bench-{run_id}-{i}@example.com", full_name=f"Player {i}")
+                for i in range(size)
+            ),
+            batch_size=5000
+        )
+        competition = Competition.objects.create(
+            name=f"Join benchmark {run_id}",
+            description="Join benchmark",
+            min_entry_fee=0,
+            max_players=max_players,
+            max_score_per_player=1,
+            start_time=now() - timedelta(days=1),
+            end_time=now() + timedelta(days=1),
+            created_by=players[0],
+            type=get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value),
+            ranking_method=get_lookup(RankingMethod.HIGHEST_SCORE.value),
+            tiebreaker_rule=get_lookup(TiebreakerRule.FIRST_TO_REACH.value),
+        )
+        return competition, players
+
+    def cleanup(self, competition, players):
+        competition.delete()
+        get_user_model().objects.filter(id__in=[player.id for player in players]).delete()
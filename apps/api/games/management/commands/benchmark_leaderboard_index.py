@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from games.leaderboard_index import LeaderboardIndex
+from games.services import DEFAULT_RANKING_STRATEGY
+
+
+class Command(BaseCommand):
+    help = 'Measure memory use and latency of the in-process leaderboard index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entries',
+            type=int,
+            default=100000,
+            help='Number of ranked entries to index (default: 100000).',
+        )
+        parser.add_argument(
+            '--operations',
+            type=int,
+            default=1000,
+            help='Timed lookups and updates per operation (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        size = options['entries']
+        start = datetime(2025, 1, 1)
+
+        rows = [
+            {
+                "entry_id": uuid.uuid4(),
+                "player_id": uuid.uuid4(),
+                "player_name": f"Player {i}",
+                "best_score": random.randint(0, 1_000_000),
+                "total_score": 0,
+                "score_count": 1,
+                "mean_score": 0.0,
+                "best_reached_at": start + timedelta(seconds=i),
+                "last_submitted_at": start + timedelta(seconds=i),
+            }
+            for i in range(size)
+        ]
+        rows.sort(key=lambda row: (-row["best_score"], row["best_reached_at"]))
+
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        index = LeaderboardIndex(DEFAULT_RANKING_STRATEGY)
+        index.extend_sorted(rows)
+        build_ms = (time.perf_counter() - started) * 1000
+        allocated = sum(
+            stat.size_diff for stat in
+            tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+        tracemalloc.stop()
+
+        players = [row["player_id"] for row in rows]
+        operations = options['operations']
+
+        def measure(func):
+            timings = []
+            for _ in range(operations):
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1_000_000)
+            return statistics.median(timings)
+
+        def update():
+            row = dict(random.choice(rows))
+            row["best_score"] = random.randint(0, 1_000_000)
+            row["best_reached_at"] = datetime.now()
+            index.add(row)
+
+        top_us = measure(lambda: index.top(10))
+        rank_us = measure(lambda: index.rank_of(random.choice(players)))
+        around_us = measure(lambda: index.around(random.choice(players), 5))
+        update_us = measure(update)
+
+        self.stdout.write(f"entries:           {size}")
+        self.stdout.write(f"build:             {build_ms:.1f} ms")
+        self.stdout.write(f"sorted arrays:     {index.memory_usage() / 1024 / 1024:.2f} MiB")
+        self.stdout.write(f"total allocated:   {allocated / 1024 / 1024:.2f} MiB")
+        self.stdout.write(f"per 100k entries:  {allocated / size * 100000 / 1024 / 1024:.2f} MiB")
+        self.stdout.write(f"top 10:            {top_us:.1f} us")
+        self.stdout.write(f"rank of player:    {rank_us:.1f} us")
+        self.stdout.write(f"around player (5): {around_us:.1f} us")
+        self.stdout.write(f"update:            {update_us:.1f} us")
@@ -0,0 +1,149 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.utils.timezone import now
+
+from core.enums import CompetitionType, RankingMethod, TiebreakerRule
+from core.lookups import get_lookup
+from games.models import Competition, CompetitionEntry, Score
+from games.services import get_leaderboard, rebuild_competition_aggregates
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_leaderboard(competition_id, limit):
+    """
+    The previous leaderboard path: group every raw score of the competition
+    and number the rows in Python.
+    """
+    rows = (
+        Score.objects.filter(entry__competition_id=competition_id)
+        .values("entry__player_id", "entry__player__full_name")
+        .annotate(highest_score=Max("score"), total_entries=Count("id"))
+        .order_by("-highest_score")[:limit]
+    )
+    return [dict(row, rank=index + 1) for index, row in enumerate(rows)]
+
+
+class Command(BaseCommand):
+    help = 'Compare the ranking engine against the legacy leaderboard query.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='10000,100000,1000000',
+            help='Comma separated number of scores to benchmark with.',
+        )
+        parser.add_argument(
+            '--attempts',
+            type=int,
+            default=10,
+            help='Scores submitted per player (default: 10).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Leaderboard size to fetch (default: 10).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per path; the median is reported (default: 5).',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        self.stdout.write(
+            f"{'scores':>10} {'legacy ms':>12} {'engine ms':>12} {'speedup':>9}")
+
+        for size in sizes:
+            try:
+                # Everything is created inside a transaction that is rolled
+                # back, so the benchmark never leaves data behind.
+                with transaction.atomic():
+                    legacy, engine = self.run(size, options)
+                    raise Rollback()
+            except Rollback:
+                pass
+
+            self.stdout.write(
+                f"{size:>10} {legacy:>12.2f} {engine:>12.2f} {legacy / engine:>8.1f}x")
+
+    def run(self, size, options):
+        competition = self.populate(size, options['attempts'])
+        limit = options['limit']
+
+        legacy = self.measure(
+            lambda: legacy_leaderboard(competition.id, limit), options['repeat'])
+        engine = self.measure(
+            lambda: get_leaderboard(competition, limit), options['repeat'])
+        return legacy, engine
+
+    def measure(self, func, repeat):
+        func()  # Warm up caches and the query plan
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def populate(self, size, attempts):
+        UserModel = get_user_model()
+        players = max(size // attempts, 1)
+        run_id = uuid.uuid4().hex[:8]
+
+        users = UserModel.objects.bulk_create(
+            (
+                UserModel(email=f"bench-{run_id}-{i}@example.com", full_name=f"Player {i}")
+                for i in range(players)
+            ),
+            batch_size=5000
+        )
+
+        competition = Competition.objects.create(
+            name=f"Ranking benchmark {run_id}",
+            description="Ranking benchmark",
+            min_entry_fee=0,
+            max_players=0,
+            max_score_per_player=attempts,
+            start_time=now() - timedelta(days=1),
+            end_time=now() + timedelta(days=1),
+            created_by=users[0],
+            type=get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value),
+            ranking_method=get_lookup(RankingMethod.HIGHEST_SCORE.value),
+            tiebreaker_rule=get_lookup(TiebreakerRule.FIRST_TO_REACH.value),
+        )
+
+        entries = CompetitionEntry.objects.bulk_create(
+            (CompetitionEntry(competition=competition, player=user, entry_fee=0) for user in users),
+            batch_size=5000
+        )
+
+        batch = []
+        for i in range(size):
+            batch.append(Score(entry=entries[i % players], competition=competition, score=random.randint(0, 1_000_000)))
+            if len(batch) == 10000:
+                Score.objects.bulk_create(batch)
+                batch = []
+        Score.objects.bulk_create(batch)
+
+        rebuild_competition_aggregates(competition)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        return competition
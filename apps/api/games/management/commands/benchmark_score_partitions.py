@@ -0,0 +1,204 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from core.enums import CompetitionType, RankingMethod, TiebreakerRule
+from core.lookups import get_lookup
+from games import partitions
+from games.models import Competition, CompetitionEntry, Score
+
+
+class Rollback(Exception):
+    pass
+
+
+def score_leaderboard(competition_id, limit):
+    """
+    Best score per entry straight from the raw scores, as aggregate
+    rebuilds read them.
+    """
+    return list(
+        Score.objects.filter(competition_id=competition_id)
+        .values("entry_id")
+        .annotate(best_score=Max("score"))
+        .order_by("-best_score")[:limit]
+    )
+
+
+def attempt_count(competition_id, entry_id):
+    return Score.objects.filter(competition_id=competition_id, entry_id=entry_id).count()
+
+
+class Command(BaseCommand):
+    help = ('Load scores spread over many competitions and compare leaderboard and '
+            'attempt-count latency before and after partitioning the score table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=50_000_000,
+            help='Scores to load (default: 50000000).',
+        )
+        parser.add_argument(
+            '--competitions',
+            type=int,
+            default=1000,
+            help='Competitions the scores are spread over (default: 1000).',
+        )
+        parser.add_argument(
+            '--attempts',
+            type=int,
+            default=10,
+            help='Scores per entry (default: 10).',
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=list(partitions.STRATEGIES),
+            default=partitions.HASH,
+            help='Partitioning to compare against (default: hash).',
+        )
+        parser.add_argument(
+            '--partitions',
+            type=int,
+            default=16,
+            help='Number of hash partitions (default: 16).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Leaderboard size to fetch (default: 10).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed runs per query, each on a random competition; the median is reported (default: 20).',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning needs PostgreSQL.')
+
+        try:
+            # Everything is created inside a transaction that is rolled back,
+            # so the benchmark never leaves data or partitions behind.
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def run(self, options):
+        started = time.perf_counter()
+        competition_ids, entries = self.populate(
+            options['rows'], options['competitions'], options['attempts'])
+        self.stdout.write(f"Loaded {options['rows']} scores in {time.perf_counter() - started:.1f}s")
+
+        queries = {
+            "leaderboard": lambda: score_leaderboard(random.choice(competition_ids), options['limit']),
+            "attempt count": lambda: attempt_count(*random.choice(entries)),
+        }
+        before = {name: self.measure(query, options['repeat']) for name, query in queries.items()}
+
+        started = time.perf_counter()
+        names = partitions.convert(options['strategy'], options['partitions'])
+        self.analyze()
+        self.stdout.write(
+            f"Partitioned by {options['strategy']} into {len(names)} partitions"
+            f" in {time.perf_counter() - started:.1f}s")
+
+        after = {name: self.measure(query, options['repeat']) for name, query in queries.items()}
+
+        self.stdout.write(
+            f"{'query':<14} {'plain ms':>10} {'partitioned ms':>15} {'speedup':>9}")
+        for name in queries:
+            self.stdout.write(
+                f"{name:<14} {before[name]:>10.2f} {after[name]:>15.2f}"
+                f" {before[name] / after[name]:>8.1f}x")
+
+    def measure(self, func, repeat):
+        func()  # Warm up caches and the query plan
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Score._meta.db_table)}")
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(CompetitionEntry._meta.db_table)}")
+
+    def populate(self, rows, competitions, attempts):
+        """
+        Creates the players and competitions with the ORM, and the entries
+        and scores with set-based inserts, which is what makes 50M rows
+        practical. Scores are spread over the past year.
+        """
+        UserModel = get_user_model()
+        players = max(rows // (competitions * attempts), 1)
+        run_id = uuid.uuid4().hex[:8]
+
+        users = UserModel.objects.bulk_create(
+            (
+                UserModel(email=f"bench-{run_id}-{i}@example.com", full_name=f"Player {i}")
+                for i in range(players)
+            ),
+            batch_size=5000
+        )
+        created = Competition.objects.bulk_create(
+            (
+                Competition(
+                    name=f"Partition benchmark {run_id} {i}",
+                    description="Partition benchmark",
+                    min_entry_fee=0,
+                    max_players=0,
+                    max_score_per_player=attempts,
+                    start_time=now() - timedelta(days=365),
+                    end_time=now() + timedelta(days=1),
+                    created_by=users[0],
+                    type=get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value),
+                    ranking_method=get_lookup(RankingMethod.HIGHEST_SCORE.value),
+                    tiebreaker_rule=get_lookup(TiebreakerRule.FIRST_TO_REACH.value),
+                )
+                for i in range(competitions)
+            ),
+            batch_size=5000
+        )
+        competition_ids = [competition.id for competition in created]
+        user_ids = [user.id for user in users]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {CompetitionEntry._meta.db_table}"
+                " (id, created_at, updated_at, entry_fee, competition_id, player_id)"
+                " SELECT gen_random_uuid(), now(), now(), 0, competition_id, player_id"
+                " FROM unnest(%s::uuid[]) competition_id CROSS JOIN unnest(%s::uuid[]) player_id",
+                [competition_ids, user_ids])
+            cursor.execute(
+                f"INSERT INTO {Score._meta.db_table}"
+                " (id, created_at, updated_at, entry_id, competition_id, score)"
+                " SELECT gen_random_uuid(), now() - random() * interval '365 days', now(),"
+                " entry.id, entry.competition_id, (random() * 1000000)::int"
+                f" FROM {CompetitionEntry._meta.db_table} entry"
+                " CROSS JOIN generate_series(1, %s)"
+                " WHERE entry.competition_id = ANY(%s::uuid[])",
+                [attempts, competition_ids])
+
+        entries = list(
+            CompetitionEntry.objects.filter(competition_id__in=competition_ids[:100])
+            .values_list("competition_id", "id")[:10000]
+        )
+        self.analyze()
+        return competition_ids, entries
@@ -0,0 +1,106 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+
+from account.enums import RoleCode
+from account.models import Role
+from core.enums import CompetitionType, RankingMethod, TiebreakerRule
+from core.lookups import get_lookup
+from games.models import Competition, CompetitionEntry
+from games.views import CompetitionViewSet
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare score throughput of the single and bulk submission endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scores',
+            type=int,
+            default=1000,
+            help='Number of scores to submit through each endpoint (default: 1000).',
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=500,
+            help='Scores per bulk request (default: 500).',
+        )
+
+    def handle(self, *args, **options):
+        # Throttling would dominate the single endpoint; measure raw throughput.
+        try:
+            with patch.object(CompetitionViewSet, "throttle_classes", []), transaction.atomic():
+                single, bulk = self.run(options['scores'], options['batch'])
+                raise Rollback()
+        except Rollback:
+            pass
+
+        self.stdout.write(f"single endpoint: {single:>10.1f} scores/s")
+        self.stdout.write(f"bulk endpoint:   {bulk:>10.1f} scores/s")
+        self.stdout.write(f"speedup:         {bulk / single:>10.1f}x")
+
+    def run(self, size, batch):
+        UserModel = get_user_model()
+        run_id = uuid.uuid4().hex[:8]
+        admin = UserModel.objects.create(
+            email=f"bench-{run_id}-admin@example.com", full_name="Admin",
+            role=Role.objects.get(code=RoleCode.ADMIN.value))
+        player_role = Role.objects.get(code=RoleCode.PLAYER.value)
+
+        competitions = []
+        for name in ("single", "bulk"):
+            competitions.append(Competition.objects.create(
+                name=f"Submission benchmark {name} {run_id}",
+                description="Submission benchmark",
+                min_entry_fee=0,
+                max_players=0,
+                max_score_per_player=size,
+                start_time=now() - timedelta(days=1),
+                end_time=now() + timedelta(days=1),
+                created_by=admin,
+                type=get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value),
+                ranking_method=get_lookup(RankingMethod.HIGHEST_SCORE.value),
+                tiebreaker_rule=get_lookup(TiebreakerRule.FIRST_TO_REACH.value),
+            ))
+
+        player = UserModel.objects.create(
+            email=f"bench-{run_id}-player@example.com", full_name="Player", role=player_role)
+        for competition in competitions:
+            CompetitionEntry.objects.create(competition=competition, player=player, entry_fee=0)
+
+        client = APIClient()
+
+        client.force_authenticate(user=player)
+        url = reverse("competitions-submit-score", args=[competitions[0].id])
+        started = time.perf_counter()
+        for i in range(size):
+            response = client.post(url, {"score": i}, format="json")
+            assert response.status_code == 201, response.content
+        single = size / (time.perf_counter() - started)
+
+        client.force_authenticate(user=admin)
+        url = reverse("competitions-submit-scores")
+        items = [
+            {"competition": str(competitions[1].id), "player": str(player.id), "score": i}
+            for i in range(size)
+        ]
+        started = time.perf_counter()
+        for offset in range(0, size, batch):
+            response = client.post(url, {"scores": items[offset:offset + batch]}, format="json")
+            assert response.status_code == 200, response.content
+        bulk = size / (time.perf_counter() - started)
+
+        return single, bulk
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from games.ingestion import ScoreBatchWriter
+
+
+class Command(BaseCommand):
+    help = 'Write queued score submissions to the leaderboard in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Submissions written per transaction (default: 500).',
+        )
+        parser.add_argument(
+            '--forever',
+            action='store_true',
+            help='Keep polling the queue instead of exiting once it is empty.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls of an empty queue (default: 1).',
+        )
+
+    def handle(self, *args, **options):
+        writer = ScoreBatchWriter(batch_size=options['batch_size'])
+
+        while True:
+            processed = writer.drain()
+            if processed:
+                self.stdout.write(f"Processed {processed} score submissions.")
+            if not options['forever']:
+                return
+            time.sleep(options['interval'])
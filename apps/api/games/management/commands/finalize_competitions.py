@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from games.models import Competition
+from games.services import finalize_competition
+
+
+class Command(BaseCommand):
+    help = 'Freeze the final standings of competitions that have ended.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competition',
+            action='append',
+            default=[],
+            help='Only finalize this competition id (can be repeated).',
+        )
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            default=settings.COMPETITION_FINALIZE_COMPACT_SCORES,
+            help='Delete the raw scores once the standings are frozen.',
+        )
+
+    def handle(self, *args, **options):
+        competitions = Competition.objects.filter(
+            finalized_at__isnull=True,
+            end_time__lte=now() - timedelta(seconds=settings.COMPETITION_FINALIZE_DELAY),
+        )
+        if options['competition']:
+            competitions = competitions.filter(id__in=options['competition'])
+
+        finalized = 0
+        for competition in competitions.iterator():
+            if finalize_competition(competition, compact=options['compact']):
+                finalized += 1
+                self.stdout.write(f"Finalized {competition.name}.")
+        self.stdout.write(self.style.SUCCESS(f"Finalized {finalized} competitions."))
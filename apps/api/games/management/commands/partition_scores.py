@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from games import partitions
+
+
+def month(value):
+    return datetime.strptime(value, "%Y-%m").replace(tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = ('Partition the score table by competition hash or by month, add upcoming '
+            'month partitions, or detach old ones.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'operation',
+            choices=['convert', 'extend', 'detach'],
+            help='convert: rebuild the table as partitioned; extend: create upcoming '
+                 'month partitions; detach: detach month partitions before --before.',
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=list(partitions.STRATEGIES),
+            default=partitions.HASH,
+            help='Partition by competition hash or created_at month (default: hash).',
+        )
+        parser.add_argument(
+            '--partitions',
+            type=int,
+            default=16,
+            help='Number of hash partitions (default: 16).',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Month partitions to create ahead of the current month (default: 3).',
+        )
+        parser.add_argument(
+            '--before',
+            type=month,
+            help='Detach the month partitions that end by this month, as YYYY-MM.',
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop detached partitions instead of keeping them for archiving.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning needs PostgreSQL.')
+
+        try:
+            if options['operation'] == 'convert':
+                names = partitions.convert(
+                    options['strategy'], options['partitions'], options['months_ahead'])
+                verb = 'Created'
+            elif options['operation'] == 'extend':
+                names = partitions.extend(options['months_ahead'])
+                verb = 'Created'
+            else:
+                if options['before'] is None:
+                    raise CommandError('detach needs --before YYYY-MM.')
+                names = partitions.detach(options['before'], options['drop'])
+                verb = 'Dropped' if options['drop'] else 'Detached'
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(f"{verb} {len(names)} partitions{': ' if names else '.'}{', '.join(names)}")
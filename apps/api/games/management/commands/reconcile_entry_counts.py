@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from games.models import Competition
+from games.services import reconcile_entry_counts
+
+
+class Command(BaseCommand):
+    help = 'Fold entry counter shards into Competition.entries_count and repair drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competition',
+            action='append',
+            default=[],
+            help='Only reconcile this competition id (can be repeated).',
+        )
+
+    def handle(self, *args, **options):
+        competitions = Competition.objects.all()
+        if options['competition']:
+            competitions = competitions.filter(id__in=options['competition'])
+
+        repaired = reconcile_entry_counts(competitions)
+
+        for competition in repaired:
+            self.stdout.write(
+                f"Repaired {competition.name}: {competition.entries_count} entries.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled entry counts, {len(repaired)} competitions repaired."))
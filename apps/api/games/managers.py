@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils.timezone import now
+from django_softdelete.managers import SoftDeleteManager
+
+
+class LiveQuerySet(models.QuerySet):
+
+    def soft_delete(self):
+        """
+        Marks the rows deleted with one `UPDATE`. Sends no signals; callers
+        adjust counters and aggregates themselves.
+        """
+        deleted_at = now()
+        return self.update(deleted_at=deleted_at, updated_at=deleted_at)
+
+
+class LiveManager(SoftDeleteManager):
+    """
+    Rows that have not been soft-deleted. Unlike the library's queryset,
+    `delete()` stays Django's hard delete, since these models are not
+    `SoftDeleteModel`s; `soft_delete()` marks rows deleted instead.
+    """
+
+    def get_queryset(self):
+        return LiveQuerySet(self.model, using=self._db).filter(deleted_at__isnull=True)
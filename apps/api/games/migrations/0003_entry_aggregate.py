@@ -0,0 +1,81 @@
+# Generated by Django 5.1.3 on 2026-10-17 20:26
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def backfill_entry_aggregates(apps, schema_editor):
+    CompetitionEntry = apps.get_model('games', 'CompetitionEntry')
+    EntryAggregate = apps.get_model('games', 'EntryAggregate')
+    Score = apps.get_model('games', 'Score')
+
+    totals = (
+        Score.objects.values('entry_id')
+        .annotate(
+            best_score=Max('score'),
+            total_score=Sum('score'),
+            score_count=Count('id'),
+            last_submitted_at=Max('created_at'),
+        )
+        .order_by()
+    )
+    competitions = dict(CompetitionEntry.objects.values_list('id', 'competition_id'))
+
+    aggregates = []
+    for row in totals.iterator():
+        best_reached_at = Score.objects.filter(
+            entry_id=row['entry_id'], score=row['best_score']
+        ).aggregate(reached_at=Min('created_at'))['reached_at']
+        aggregates.append(EntryAggregate(
+            entry_id=row['entry_id'],
+            competition_id=competitions[row['entry_id']],
+            best_score=row['best_score'],
+            total_score=row['total_score'],
+            score_count=row['score_count'],
+            mean_score=row['total_score'] / row['score_count'],
+            best_reached_at=best_reached_at,
+            last_submitted_at=row['last_submitted_at'],
+        ))
+
+    EntryAggregate.objects.bulk_create(aggregates, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_alter_competition_created_by'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='competition',
+            name='max_score_per_player',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='EntryAggregate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='deleted at')),
+                ('best_score', models.IntegerField(verbose_name='Highest submitted score')),
+                ('total_score', models.BigIntegerField(default=0, verbose_name='Sum of all submitted scores')),
+                ('score_count', models.IntegerField(default=0, verbose_name='Number of submitted scores')),
+                ('mean_score', models.FloatField(default=0.0, verbose_name='Average of all submitted scores')),
+                ('best_reached_at', models.DateTimeField(verbose_name='When the highest score was first reached')),
+                ('last_submitted_at', models.DateTimeField(verbose_name='When the latest score was submitted')),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aggregates', to='games.competition')),
+                ('entry', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='aggregate', to='games.competitionentry')),
+            ],
+            options={
+                'verbose_name': 'Entry Aggregate',
+                'verbose_name_plural': 'Entry Aggregates',
+                'db_table': 'entry_aggregate',
+                'indexes': [models.Index(models.F('competition'), models.OrderBy(models.F('best_score'), descending=True), models.F('best_reached_at'), name='entry_aggregate_best_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_entry_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-17 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_entry_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entryaggregate',
+            index=models.Index(models.F('competition'), models.OrderBy(models.F('mean_score'), descending=True), models.F('last_submitted_at'), name='entry_aggregate_mean_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entryaggregate',
+            index=models.Index(models.F('competition'), models.OrderBy(models.F('total_score'), descending=True), models.F('last_submitted_at'), name='entry_aggregate_total_idx'),
+        ),
+    ]
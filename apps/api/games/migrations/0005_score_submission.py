@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-17 20:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('games', '0004_entry_aggregate_ranking_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreSubmission',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='deleted at')),
+                ('score', models.IntegerField(verbose_name='Submitted Score')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='Validation errors of a rejected submission')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='When the batch writer processed the submission')),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_submissions', to='games.competition')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_submissions', to=settings.AUTH_USER_MODEL)),
+                ('recorded_score', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='games.score')),
+                ('status', models.ForeignKey(limit_choices_to={'type': 'score_submission_status'}, on_delete=django.db.models.deletion.RESTRICT, related_name='+', to='core.datalookup')),
+            ],
+            options={
+                'verbose_name': 'Score Submission',
+                'verbose_name_plural': 'Score Submissions',
+                'db_table': 'score_submission',
+                'ordering': ('created_at',),
+                'indexes': [models.Index(fields=['status', 'created_at'], name='score_submission_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.3 on 2026-10-17 21:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_entries_count(apps, schema_editor):
+    Competition = apps.get_model('games', 'Competition')
+    CompetitionEntry = apps.get_model('games', 'CompetitionEntry')
+
+    Competition.objects.update(entries_count=Coalesce(Subquery(
+        CompetitionEntry.objects.filter(competition=OuterRef('pk'))
+        .order_by().values('competition').annotate(total=Count('id')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_score_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='entries_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of entries, maintained as entries are added and removed'),
+        ),
+        migrations.CreateModel(
+            name='CompetitionEntryCounter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='deleted at')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entry_counters', to='games.competition')),
+            ],
+            options={
+                'verbose_name': 'Competition Entry Counter',
+                'verbose_name_plural': 'Competition Entry Counters',
+                'db_table': 'competition_entry_counter',
+                'constraints': [models.UniqueConstraint(fields=('competition', 'shard'), name='unique_competition_entry_counter_shard')],
+            },
+        ),
+        migrations.RunPython(backfill_entries_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-17 22:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_leaderboard_size_scheme'),
+        ('games', '0006_competition_entries_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['end_time', 'start_time'], name='competition_active_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.3 on 2026-10-17 22:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_leaderboard_size_scheme'),
+        ('games', '0007_competition_active_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='competitionentry',
+            name='unique_competition_entry',
+        ),
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('deleted_at__isnull', True)), name='competition_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competitionentry',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['player', 'competition'], name='competition_entry_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['entry', 'score', 'created_at'], name='score_entry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='competitionentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('competition', 'player'), name='unique_competition_entry'),
+        ),
+    ]
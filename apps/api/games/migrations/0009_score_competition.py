@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-17 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_score_competition(apps, schema_editor):
+    Score = apps.get_model('games', 'Score')
+    CompetitionEntry = apps.get_model('games', 'CompetitionEntry')
+
+    Score.objects.update(competition=Subquery(
+        CompetitionEntry.objects.filter(pk=OuterRef('entry_id')).values('competition_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_soft_delete_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='score',
+            name='competition',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='games.competition'),
+        ),
+        migrations.RunPython(backfill_score_competition, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='score',
+            name='competition',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='games.competition'),
+        ),
+        migrations.AlterField(
+            model_name='scoresubmission',
+            name='recorded_score',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='games.score'),
+        ),
+    ]
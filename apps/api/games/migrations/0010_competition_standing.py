@@ -0,0 +1,47 @@
+# Generated by Django 5.1.3 on 2026-10-17 23:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_score_competition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='finalized_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='When the final standings were frozen'),
+        ),
+        migrations.CreateModel(
+            name='CompetitionStanding',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='deleted at')),
+                ('position', models.PositiveIntegerField(verbose_name='Unique place on the leaderboard, 1 first')),
+                ('rank', models.PositiveIntegerField(verbose_name='Final rank, shared on ties')),
+                ('best_score', models.IntegerField()),
+                ('total_score', models.BigIntegerField()),
+                ('mean_score', models.FloatField()),
+                ('score_count', models.IntegerField()),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='games.competition')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Competition Standing',
+                'verbose_name_plural': 'Competition Standings',
+                'db_table': 'competition_standing',
+                'ordering': ('position',),
+                'indexes': [models.Index(fields=['competition', 'player'], name='standing_player_idx')],
+                'constraints': [models.UniqueConstraint(fields=('competition', 'position'), name='unique_competition_standing_position')],
+            },
+        ),
+    ]
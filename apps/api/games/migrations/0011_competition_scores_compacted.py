@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_competition_standing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='scores_compacted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Whether the raw scores were deleted at finalization'),
+        ),
+    ]
@@ -1,9 +1,11 @@
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from django_softdelete.managers import DeletedManager, GlobalManager
 
 from core.models import DataLookup
 from core.abstract import AbstractBaseModel
+from games.managers import LiveManager
 
 
 class Competition(AbstractBaseModel):
@@ -83,6 +85,29 @@ class Competition(AbstractBaseModel):
         limit_choices_to={'type': "tiebreaker_rule"}
     )
 
+    entries_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Number of entries, maintained as entries are added and removed")
+    )
+
+    finalized_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("When the final standings were frozen")
+    )
+
+    scores_compacted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name=_("Whether the raw scores were deleted at finalization")
+    )
+
+    objects = LiveManager()
+    deleted_objects = DeletedManager()
+    global_objects = GlobalManager()
+
     class Meta:
         verbose_name = _("Competition")
         verbose_name_plural = _("Competitions")
@@ -107,12 +132,38 @@ class Competition(AbstractBaseModel):
             models.Index(
                 fields=["deleted_at"],
                 name="competition_deleted_at_idx"
+            ),
+            # Running and upcoming competitions: end_time >= now() narrows
+            # the scan to the few that have not ended, start_time is
+            # filtered from the index
+            models.Index(
+                fields=["end_time", "start_time"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="competition_active_idx"
+            ),
+            # Keyset pages of live competitions
+            models.Index(
+                models.F("created_at").desc(),
+                models.F("id").desc(),
+                condition=models.Q(deleted_at__isnull=True),
+                name="competition_listing_idx"
             )
         ]
 
     def __str__(self):
         return self.name
     
+    @property
+    def players_joined(self):
+        """
+        Number of entries: the denormalized counter plus any joins still held
+        in counter shards when sharded counting is enabled.
+        """
+        if not settings.COMPETITION_ENTRY_COUNTER_SHARDS:
+            return self.entries_count
+        # Reads prefetched shards when the queryset loaded them
+        return self.entries_count + sum(counter.count for counter in self.entry_counters.all())
+
     @property
     def is_full(self):
         """
@@ -121,7 +172,7 @@ class Competition(AbstractBaseModel):
         """
         if self.max_players == 0:
             return False
-        return self.entries.count() >= self.max_players
+        return self.players_joined >= self.max_players
 
 
 class CompetitionEntry(AbstractBaseModel):
@@ -143,16 +194,30 @@ class CompetitionEntry(AbstractBaseModel):
         related_name="entries"
     )
 
+    objects = LiveManager()
+    deleted_objects = DeletedManager()
+    global_objects = GlobalManager()
+
     class Meta:
         verbose_name = _("Competition Entry")
         verbose_name_plural = _("Competition Entries")
         ordering = ("-created_at",)
         db_table = "competition_entry"
         constraints = [
+            # A removed player may join again
             models.UniqueConstraint(
                 fields=['competition', 'player'],
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_competition_entry')
         ]
+        indexes = [
+            # A player's live entries, for listings and standings
+            models.Index(
+                fields=["player", "competition"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="competition_entry_player_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.player} in {self.competition}"
@@ -165,15 +230,272 @@ class Score(AbstractBaseModel):
         related_name="scores"
     )
 
+    # Denormalized from the entry, so queries on a partitioned `score`
+    # table can filter on the partition key directly
+    competition = models.ForeignKey(
+        Competition,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name="scores"
+    )
+
     score = models.IntegerField(
         verbose_name=_("Submitted Score")
     )
 
+    objects = LiveManager()
+    deleted_objects = DeletedManager()
+    global_objects = GlobalManager()
+
     class Meta:
         verbose_name = _("Score")
         verbose_name_plural = _("Scores")
         ordering = ['-score']
         db_table = "score"
+        indexes = [
+            # Attempt counts, best scores and when each was first reached,
+            # per entry, over live scores only
+            models.Index(
+                fields=["entry", "score", "created_at"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="score_entry_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.entry.player} - {self.score}"
+
+    def save(self, *args, **kwargs):
+        if self.competition_id is None:
+            self.competition_id = self.entry.competition_id
+        super().save(*args, **kwargs)
+
+
+class CompetitionEntryCounter(AbstractBaseModel):
+    """
+    One shard of a competition's entry counter. Joins increment a random
+    shard instead of the competition row, so a popular competition does not
+    serialise every join on one row; the shards are folded back into
+    `Competition.entries_count` by `reconcile_entry_counts`.
+    """
+    competition = models.ForeignKey(
+        Competition,
+        on_delete=models.CASCADE,
+        related_name="entry_counters"
+    )
+
+    shard = models.PositiveSmallIntegerField()
+
+    count = models.IntegerField(
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _("Competition Entry Counter")
+        verbose_name_plural = _("Competition Entry Counters")
+        db_table = "competition_entry_counter"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["competition", "shard"],
+                name="unique_competition_entry_counter_shard"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.competition} #{self.shard}: {self.count}"
+
+
+class EntryAggregate(AbstractBaseModel):
+    """
+    Running totals of an entry's scores, folded in as each score is
+    submitted so leaderboards never have to aggregate the raw `Score` rows.
+    """
+    entry = models.OneToOneField(
+        CompetitionEntry,
+        on_delete=models.CASCADE,
+        related_name="aggregate"
+    )
+
+    competition = models.ForeignKey(
+        Competition,
+        on_delete=models.CASCADE,
+        related_name="aggregates"
+    )
+
+    best_score = models.IntegerField(
+        verbose_name=_("Highest submitted score")
+    )
+
+    total_score = models.BigIntegerField(
+        default=0,
+        verbose_name=_("Sum of all submitted scores")
+    )
+
+    score_count = models.IntegerField(
+        default=0,
+        verbose_name=_("Number of submitted scores")
+    )
+
+    mean_score = models.FloatField(
+        default=0.0,
+        verbose_name=_("Average of all submitted scores")
+    )
+
+    best_reached_at = models.DateTimeField(
+        verbose_name=_("When the highest score was first reached")
+    )
+
+    last_submitted_at = models.DateTimeField(
+        verbose_name=_("When the latest score was submitted")
+    )
+
+    class Meta:
+        verbose_name = _("Entry Aggregate")
+        verbose_name_plural = _("Entry Aggregates")
+        db_table = "entry_aggregate"
+        indexes = [
+            models.Index(
+                "competition",
+                models.F("best_score").desc(),
+                "best_reached_at",
+                name="entry_aggregate_best_idx"
+            ),
+            models.Index(
+                "competition",
+                models.F("mean_score").desc(),
+                "last_submitted_at",
+                name="entry_aggregate_mean_idx"
+            ),
+            models.Index(
+                "competition",
+                models.F("total_score").desc(),
+                "last_submitted_at",
+                name="entry_aggregate_total_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.entry} :: {self.best_score}"
+
+
+class CompetitionStanding(AbstractBaseModel):
+    """
+    One row of a competition's final leaderboard, frozen by
+    `finalize_competition` once the competition has ended. Leaderboards,
+    ranks and leaders of finalized competitions are read from here.
+    """
+    competition = models.ForeignKey(
+        Competition,
+        on_delete=models.CASCADE,
+        related_name="standings"
+    )
+
+    player = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+
+    position = models.PositiveIntegerField(
+        verbose_name=_("Unique place on the leaderboard, 1 first")
+    )
+
+    rank = models.PositiveIntegerField(
+        verbose_name=_("Final rank, shared on ties")
+    )
+
+    best_score = models.IntegerField()
+
+    total_score = models.BigIntegerField()
+
+    mean_score = models.FloatField()
+
+    score_count = models.IntegerField()
+
+    class Meta:
+        verbose_name = _("Competition Standing")
+        verbose_name_plural = _("Competition Standings")
+        ordering = ("position",)
+        db_table = "competition_standing"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["competition", "position"],
+                name="unique_competition_standing_position"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["competition", "player"],
+                name="standing_player_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.competition} #{self.position}: {self.player_id}"
+
+
+class ScoreSubmission(AbstractBaseModel):
+    """
+    A score accepted for asynchronous ingestion. It records what the client
+    sent and, once a batch writer has processed it, the outcome.
+    """
+    competition = models.ForeignKey(
+        Competition,
+        on_delete=models.CASCADE,
+        related_name="score_submissions"
+    )
+
+    player = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="score_submissions"
+    )
+
+    score = models.IntegerField(
+        verbose_name=_("Submitted Score")
+    )
+
+    status = models.ForeignKey(
+        DataLookup,
+        on_delete=models.RESTRICT,
+        related_name="+",
+        limit_choices_to={'type': "score_submission_status"}
+    )
+
+    # No database constraint: once `score` is partitioned its primary key
+    # includes the partition key, and `id` alone is no longer referenceable
+    recorded_score = models.ForeignKey(
+        Score,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    errors = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Validation errors of a rejected submission")
+    )
+
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("When the batch writer processed the submission")
+    )
+
+    class Meta:
+        verbose_name = _("Score Submission")
+        verbose_name_plural = _("Score Submissions")
+        ordering = ("created_at",)
+        db_table = "score_submission"
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="score_submission_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - {self.score} ({self.status.name})"
@@ -0,0 +1,194 @@
+"""
+Opt-in Postgres declarative partitioning of the `score` table.
+
+Scores are append-only and almost every query names a competition, so the
+table can be split by competition hash, which keeps each competition's
+scores in one small partition, or by `created_at` month, which lets whole
+months be detached once they are no longer ranked. Django keeps treating
+`id` as the primary key; in the database the key also carries the
+partition column, as Postgres requires.
+"""
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+
+from games.models import Score
+
+HASH = "hash"
+MONTH = "month"
+STRATEGIES = {
+    HASH: ("HASH", "competition_id"),
+    MONTH: ("RANGE", "created_at"),
+}
+
+MONTH_FORMAT = "y%Ym%m"
+
+
+def get_strategy(cursor):
+    """
+    The strategy the score table is partitioned with, or None.
+    """
+    cursor.execute(
+        "SELECT partstrat FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+        [Score._meta.db_table])
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return HASH if row[0] == "h" else MONTH
+
+
+def get_partitions(cursor):
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits"
+        " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+        " WHERE pg_inherits.inhparent = %s::regclass ORDER BY child.relname",
+        [Score._meta.db_table])
+    return [name for name, in cursor.fetchall()]
+
+
+def add_months(moment, months):
+    """
+    The start of the month `months` after the month of `moment`, in UTC.
+    """
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def month_partition(month):
+    return f"{Score._meta.db_table}_{month.strftime(MONTH_FORMAT)}"
+
+
+def partition_month(name):
+    """
+    The first day of a month partition, from its name, or None for the
+    default partition.
+    """
+    try:
+        return datetime.strptime(
+            name.rsplit("_", 1)[1], MONTH_FORMAT).replace(tzinfo=timezone.utc)
+    except (IndexError, ValueError):
+        return None
+
+
+def create_month_partitions(cursor, first, last):
+    """
+    Creates the missing month partitions from the month of `first` up to
+    and including the month of `last`.
+    """
+    table = connection.ops.quote_name(Score._meta.db_table)
+    existing = set(get_partitions(cursor))
+    created = []
+    month = add_months(first, 0)
+    while month <= last:
+        name = month_partition(month)
+        if name not in existing:
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(name)} PARTITION OF {table}"
+                " FOR VALUES FROM (%s) TO (%s)", [month, add_months(month, 1)])
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def convert(strategy, partitions=16, months_ahead=3):
+    """
+    Rebuilds `score` as a partitioned table with the same columns, indexes
+    and foreign keys, and copies the rows over. Takes an exclusive lock on
+    the table for the duration of the copy.
+    """
+    method, column = STRATEGIES[strategy]
+    table = Score._meta.db_table
+    quoted = connection.ops.quote_name(table)
+    previous = connection.ops.quote_name(f"{table}_unpartitioned")
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if get_strategy(cursor) is not None:
+            raise ValueError("The score table is already partitioned.")
+
+        cursor.execute(f"LOCK TABLE {quoted} IN ACCESS EXCLUSIVE MODE")
+        # Django's foreign keys are deferred; checks still pending for rows
+        # written earlier in the transaction would block dropping the table
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes"
+            " WHERE schemaname = current_schema() AND tablename = %s"
+            " AND indexname NOT IN (SELECT conname FROM pg_constraint"
+            " WHERE conrelid = %s::regclass AND contype = 'p')", [table, table])
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+            " WHERE conrelid = %s::regclass AND contype = 'f'", [table])
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute(f"ALTER TABLE {quoted} RENAME TO {previous}")
+        cursor.execute(
+            f"CREATE TABLE {quoted} (LIKE {previous} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            f" PARTITION BY {method} ({column})")
+
+        if strategy == HASH:
+            for remainder in range(partitions):
+                cursor.execute(
+                    f"CREATE TABLE {connection.ops.quote_name(f'{table}_p{remainder}')}"
+                    f" PARTITION OF {quoted} FOR VALUES WITH (MODULUS %s, REMAINDER %s)",
+                    [partitions, remainder])
+        else:
+            cursor.execute(f"SELECT min(created_at), now() FROM {previous}")
+            oldest, current = cursor.fetchone()
+            create_month_partitions(cursor, oldest or current, add_months(current, months_ahead))
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(f'{table}_default')}"
+                f" PARTITION OF {quoted} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {quoted} SELECT * FROM {previous}")
+        cursor.execute(f"DROP TABLE {previous}")
+
+        # The old table's names are free again
+        cursor.execute(
+            f"ALTER TABLE {quoted} ADD CONSTRAINT {connection.ops.quote_name(f'{table}_pkey')}"
+            f" PRIMARY KEY (id, {column})")
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {quoted} ADD CONSTRAINT {connection.ops.quote_name(name)} {definition}")
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+        return get_partitions(cursor)
+
+
+def extend(months_ahead=3):
+    """
+    Creates month partitions up to `months_ahead` months from now. Rows of
+    those months already in the default partition make this fail; move them
+    out first.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if get_strategy(cursor) != MONTH:
+            raise ValueError("The score table is not partitioned by month.")
+        cursor.execute("SELECT now()")
+        current, = cursor.fetchone()
+        return create_month_partitions(cursor, current, add_months(current, months_ahead))
+
+
+def detach(before, drop=False):
+    """
+    Detaches the month partitions that end on or before `before`. Detaching
+    only changes the catalog, so it is cheap at any size; the detached
+    tables keep their rows for archiving until dropped, or are dropped at
+    once with `drop`.
+    """
+    table = connection.ops.quote_name(Score._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        if get_strategy(cursor) != MONTH:
+            raise ValueError("The score table is not partitioned by month.")
+
+        detached = []
+        for name in get_partitions(cursor):
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > before:
+                continue
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {connection.ops.quote_name(name)}")
+            if drop:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+            detached.append(name)
+        return detached
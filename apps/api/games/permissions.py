@@ -1,14 +1,19 @@
 from account.enums import RoleCode
-from django.utils.timezone import now
 from core.permissions import AbstractAccessPolicy
+from games.services import get_active_competition_ids
 
 
 class CompetitionAccessPolicy(AbstractAccessPolicy):
 
+    @classmethod
+    def sees_all(cls, request):
+        user_role = getattr(request.user, "role", None)
+        return bool(user_role and user_role.code == RoleCode.ADMIN.value)
+
     @classmethod
     def scope_queryset(cls, request, queryset):
-        user_role = request.user.role
-        if user_role.code == RoleCode.ADMIN.value:
+        if cls.sees_all(request):
             return queryset
-        # The rest of the users can only see currenly active competitions
-        return queryset.filter(start_time__lte=now(), end_time__gte=now())
+        # The rest of the users can only see currenly active competitions,
+        # looked up by primary key from the cached active set
+        return queryset.filter(pk__in=get_active_competition_ids())
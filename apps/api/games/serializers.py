@@ -1,13 +1,34 @@
 from rest_framework import serializers
 from django.utils.timezone import now
-from django.db.models import Max
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from games.models import Competition, CompetitionEntry, Score
+from django.db import IntegrityError, transaction
+from games.models import Competition, CompetitionEntry, Score, ScoreSubmission
 from account.serializers import UserSerializer
 from core.serializers import DataLookupSerializer
-from core.models import DataLookup
+from core.lookups import get_default, get_lookup
 from core.enums import CompetitionType, RankingMethod, TiebreakerRule
+from games.services import (
+    competition_listing, join_competition, load_competition_standings,
+    record_score, rebuild_entry_aggregate, reopen_competition, submit_scores)
+from games.ingestion import enqueue_score
+
+
+def _request_user(context):
+    request = context.get("request")
+    if not request or not request.user or not request.user.is_authenticated:
+        return None
+    return request.user
+
+
+class CompetitionListSerializer(serializers.ListSerializer):
+    """
+    Loads leaders and ranks for a whole page of competitions at once.
+    """
+
+    def to_representation(self, data):
+        competitions = list(data.all() if hasattr(data, "all") else data)
+        load_competition_standings(competitions, _request_user(self.context))
+        return super().to_representation(competitions)
 
 
 class BaseCompetitionSerializer(serializers.ModelSerializer):
@@ -22,6 +43,7 @@ class BaseCompetitionSerializer(serializers.ModelSerializer):
             'max_score_per_player', 'start_time', 'end_time', 'type',
             'ranking_method', 'tiebreaker_rule', 'created_by', 'created_at', 'updated_at'
         ]
+        list_serializer_class = CompetitionListSerializer
     
     def validate(self, attrs):
         """
@@ -92,101 +114,64 @@ class CompetitionResponseSerializer(BaseCompetitionSerializer):
             "current_leader",
             "current_user_rank",
             "can_submit_score",
-            "has_joined"
+            "has_joined",
+            "finalized_at"
         ]
 
+    def to_representation(self, instance):
+        """
+        Competitions that were not loaded through `competition_listing`
+        (e.g. right after a create or update) are reloaded through it.
+        """
+        user = _request_user(self.context)
+        if user is not None and not hasattr(instance, "user_entries"):
+            instance = competition_listing(
+                Competition.objects.filter(pk=instance.pk), user).get()
+        if not hasattr(instance, "leader"):
+            load_competition_standings([instance], user)
+        return super().to_representation(instance)
+
     def get_total_players_joined(self, obj):
         """
         Returns the total number of players who have joined the competition.
         """
-        return obj.entries.count()
+        return obj.players_joined
 
     def get_current_leader(self, obj):
         """
-        Returns the player with the highest score.
+        Returns the player ranked first by the competition's ranking method.
         """
-        top_score_entry = obj.entries.annotate(
-            highest_score=Max("scores__score")
-        ).order_by("-highest_score").first()
-
-        if top_score_entry and top_score_entry.highest_score is not None:
-            return {
-                "id": top_score_entry.player.id,
-                "name": top_score_entry.player.full_name,
-                "score": top_score_entry.highest_score,
-            }
-        return None
+        return obj.leader
     
     def get_current_user_rank(self, obj):
         """
         Returns the rank of the current authenticated user in the competition.
         - `null` if the user is not authenticated.
         - `null` if the user has not joined the competition.
+        - `null` if the user has not submitted a score yet.
         - Otherwise, returns the rank (1-based index).
         """
-        request = self.context.get("request")
-        if not request or not request.user or not request.user.is_authenticated:
-            return None
-
-        user = request.user
-
-        # Check if the user has an entry in the competition
-        user_entry = obj.entries.filter(player=user).first()
-        if not user_entry:
-            # User has not joined the competition
-            return None 
-
-        # Get the ranking of all players based on their highest score
-        ranked_players = (
-            obj.entries.annotate(highest_score=Max("scores__score"))
-            .filter(highest_score__isnull=False)  # Exclude players with no score
-            .order_by("-highest_score")  # Order by highest score descending
-        )
-
-        # Create a ranking list with 1-based index
-        ranking = {entry.player.id: rank + 1 for rank, entry in enumerate(ranked_players)}
-
-        # Return the user's rank if available
-        return ranking.get(user.id)
+        return obj.user_rank
 
     def get_can_submit_score(self, obj):
         """
         Determines whether the authenticated user can submit a score.
         """
-        request = self.context.get("request")
-        if not request or not request.user or not request.user.is_authenticated:
+        user_entries = getattr(obj, "user_entries", [])
+        if not user_entries:
             return False
 
-        user = request.user
-
-        user_entry = obj.entries.filter(player=user).first()
-        if not user_entry:
-            return False
-
-        has_submitted_score = user_entry.scores.exists()
-
-        if not has_submitted_score:
-            return True
-
-        multi_attempt_type = DataLookup.objects.get(value=CompetitionType.MULTIPLE_ATTEMPTS.value)
-
-        if obj.type == multi_attempt_type:
+        if not user_entries[0].has_scores:
             return True
 
-        return False
+        return obj.type_id == get_lookup(CompetitionType.MULTIPLE_ATTEMPTS.value).id
 
     def get_has_joined(self, obj):
         """
         Determines whether the authenticated user has joined the competition.
         """
-        request = self.context.get("request")
-
-        if not request or not request.user or not request.user.is_authenticated:
-            return False
-
-        user = request.user
+        return bool(getattr(obj, "user_entries", []))
 
-        return obj.entries.filter(player=user).exists() 
 
 class CompetitionSerializer(BaseCompetitionSerializer):
 
@@ -201,20 +186,18 @@ class CompetitionSerializer(BaseCompetitionSerializer):
             validated_data["created_by"] = request.user
         
         if "type" not in validated_data:
-            validated_data["type"] = DataLookup.objects.filter(
-                type=CompetitionType.TYPE.value, is_default=True).first()
+            validated_data["type"] = get_default(CompetitionType.TYPE.value)
 
         if "ranking_method" not in validated_data:
-            validated_data["ranking_method"] = DataLookup.objects.filter(
-                type=RankingMethod.TYPE.value, is_default=True).first()
+            validated_data["ranking_method"] = get_default(RankingMethod.TYPE.value)
 
         if "tiebreaker_rule" not in validated_data:
-            validated_data["tiebreaker_rule"] = DataLookup.objects.filter(
-                type=TiebreakerRule.TYPE.value, is_default=True).first()
+            validated_data["tiebreaker_rule"] = get_default(TiebreakerRule.TYPE.value)
 
         return super().create(validated_data)
     
     def update(self, instance, validated_data):
+        previous_end_time = instance.end_time
         instance.name = validated_data.get("name", instance.name)
         instance.description = validated_data.get("description", instance.description)
         instance.min_entry_fee = validated_data.get("min_entry_fee", instance.min_entry_fee)
@@ -230,6 +213,10 @@ class CompetitionSerializer(BaseCompetitionSerializer):
         instance.tiebreaker_rule = validated_data.get("tiebreaker_rule", instance.tiebreaker_rule)
 
         instance.save()
+        # Extending a finalized competition reopens its standings
+        if instance.finalized_at is not None and (
+                instance.end_time is None or instance.end_time > previous_end_time):
+            reopen_competition(instance)
         return instance
 
 
@@ -289,10 +276,10 @@ class CompetitionEntrySerializer(BaseCompetitionEntrySerializer):
         """
         Check if the player is already registered in a SINGLE_ATTEMPT competition.
         """
-        if CompetitionEntry.objects.filter(
-                competition=competition,
-                player=player,
-                competition__type__value=CompetitionType.SINGLE_ATTEMPT.value).exists():
+        if competition.type_id != get_lookup(CompetitionType.SINGLE_ATTEMPT.value).id:
+            return
+
+        if CompetitionEntry.objects.filter(competition=competition, player=player).exists():
             raise serializers.ValidationError({"player": "Player is already registered in this competition."})
 
     def create(self, validated_data):
@@ -309,7 +296,16 @@ class CompetitionEntrySerializer(BaseCompetitionEntrySerializer):
 
         self.check_duplicate_entry(competition, player)
 
-        return super().create(validated_data)
+        try:
+            entry = join_competition(competition, player, validated_data["entry_fee"])
+        except IntegrityError:
+            raise serializers.ValidationError({"player": "Player is already registered in this competition."})
+
+        if entry is None:
+            raise serializers.ValidationError({
+                "competition": "This competition is full and cannot accept more entries."
+            })
+        return entry
 
 
 ####################  SCORE  ####################
@@ -351,7 +347,7 @@ class BaseScoreSerializer(serializers.ModelSerializer):
                 {"competition": "The competition has ended. Scores cannot be submitted."})
 
         # Ensure the player hasn’t exceeded the max_score_per_player limit
-        if Score.objects.filter(entry__competition=competition, entry__player=player).count() >= competition.max_score_per_player:
+        if Score.objects.filter(competition=competition, entry=entry).count() >= competition.max_score_per_player:
             raise serializers.ValidationError(
                 {"score": "You have reached the maximum number of score submissions allowed in this competition."}
             )
@@ -371,14 +367,98 @@ class ScoreSerializer(BaseScoreSerializer):
         ).to_representation(instance)
 
     def create(self, validated_data):
-        return super().create(validated_data)
+        with transaction.atomic():
+            score = super().create(validated_data)
+            record_score(score)
+        return score
 
     def update(self, instance, validated_data):
-        instance.score = validated_data.get("score", instance.score)
-        instance.save()
+        with transaction.atomic():
+            instance.score = validated_data.get("score", instance.score)
+            instance.save()
+            rebuild_entry_aggregate(instance.entry)
         return instance
 
 
+class BulkScoreItemSerializer(serializers.Serializer):
+    """
+    One score in a bulk submission.
+    """
+    competition = serializers.UUIDField()
+    player = serializers.UUIDField()
+    score = serializers.IntegerField()
+
+
+class BulkScoreSerializer(serializers.Serializer):
+    """
+    Accepts a batch of scores, typically reported by a game server at the
+    end of a round. Items are validated and stored independently; the
+    response reports the outcome of each one.
+    """
+    scores = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=1000)
+
+    def create(self, validated_data):
+        results = []
+        items = []
+        for index, item in enumerate(validated_data["scores"]):
+            item_serializer = BulkScoreItemSerializer(data=item)
+            if item_serializer.is_valid():
+                items.append({"index": index, **item_serializer.validated_data})
+            else:
+                results.append({"index": index, "status": "rejected", "errors": item_serializer.errors})
+
+        results.extend(submit_scores(items))
+        return {"results": sorted(results, key=lambda result: result["index"])}
+
+    def to_representation(self, instance):
+        return instance
+
+
+class BulkScoreResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=["created", "rejected"])
+    id = serializers.UUIDField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class ScoreSubmissionSerializer(serializers.ModelSerializer):
+    """
+    A score queued for asynchronous ingestion, and its processing outcome.
+    """
+    status = DataLookupSerializer(read_only=True)
+
+    class Meta:
+        model = ScoreSubmission
+        fields = [
+            'id', 'competition', 'player', 'score', 'status', 'recorded_score',
+            'errors', 'processed_at', 'created_at'
+        ]
+        read_only_fields = [
+            'player', 'recorded_score', 'errors', 'processed_at', 'created_at'
+        ]
+
+    def validate(self, attrs):
+        """
+        Rejects what can be decided without the batch writer; attempt limits
+        are enforced when the submission is processed.
+        """
+        if attrs["score"] < 0:
+            raise serializers.ValidationError(
+                {"score": "Score must be a positive integer."})
+
+        competition = attrs["competition"]
+        if competition.end_time and now() > competition.end_time:
+            raise serializers.ValidationError(
+                {"competition": "The competition has ended. Scores cannot be submitted."})
+
+        return attrs
+
+    def create(self, validated_data):
+        return enqueue_score(
+            validated_data["competition"], self.context["request"].user, validated_data["score"])
+
+
 ####################  LEADERBOARD  ####################
 
 
@@ -387,7 +467,15 @@ class LeaderboardSerializer(serializers.Serializer):
     Serializer for representing the leaderboard.
     """
     rank = serializers.IntegerField()
-    player_id = serializers.IntegerField()
+    player_id = serializers.UUIDField()
     player_name = serializers.CharField()
+    score = serializers.FloatField()
     highest_score = serializers.IntegerField()
     total_entries = serializers.IntegerField()
+
+
+class LeaderboardWindowSerializer(serializers.Serializer):
+    """
+    Query parameters of the leaderboard window around the current player.
+    """
+    radius = serializers.IntegerField(min_value=1, max_value=50, default=5)
@@ -1,28 +1,1030 @@
-from django.db.models import Max, Count
-from games.models import Score
+import random
+import threading
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial, reduce
+from operator import or_
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+from django.db.models import (
+    F, Max, Min, Count, Exists, OuterRef, Prefetch, Q, Subquery, Sum, Window)
+from django.db.models.functions import Rank, RowNumber
+from core.cache import bump_version, get_version
+from core.enums import RankingMethod, ScoreSubmissionStatus, TiebreakerRule
+from core.lookups import get_lookup, get_lookup_by_id
+from games.models import (
+    Competition, CompetitionEntry, CompetitionEntryCounter, CompetitionStanding,
+    EntryAggregate, Score, ScoreSubmission)
+from games import leaderboard_index, live
 
+STAMP_KEY = "games:competition-stamp:{}"
 
-def get_leaderboard(competition_id: int, limit: int = 10):
+
+def get_competition_stamp(competition_id):
+    """
+    Returns `(version, modified_at)` for everything readable about a
+    competition: its fields, entries, scores and leaderboard. Conditional
+    GETs derive their `ETag` and `Last-Modified` from it.
+    """
+    try:
+        competition_id = uuid.UUID(str(competition_id))
+    except ValueError:
+        pass
+    key = STAMP_KEY.format(competition_id)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, (uuid.uuid4().hex, now()), timeout=None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def touch_competition(competition_id):
+    """
+    Gives a competition a new stamp, and again once the surrounding
+    transaction commits, so a read racing the write cannot keep the new
+    stamp with the old data. Live leaderboards hear about it after the
+    commit.
+    """
+    def touch():
+        cache.set(STAMP_KEY.format(competition_id), (uuid.uuid4().hex, now()), timeout=None)
+
+    touch()
+    transaction.on_commit(touch)
+    transaction.on_commit(partial(live.publish, competition_id))
+
+
+ACTIVE_VERSION_KEY = "games:active-competitions"
+
+_active_lock = threading.Lock()
+_active = None
+
+
+def get_active_competition_ids():
+    """
+    Ids of the competitions running now. Kept per process until the next
+    competition starts or a running one ends, or until a competition is
+    changed anywhere.
+    """
+    global _active
+
+    version = get_version(ACTIVE_VERSION_KEY)
+    current = now()
+    with _active_lock:
+        if _active and _active[0] == version:
+            _, next_start, first_end, ids = _active
+            if ((next_start is None or current < next_start)
+                    and (first_end is None or current <= first_end)):
+                return ids
+
+    ids = set()
+    next_start = None
+    first_end = None
+    for competition_id, start_time, end_time in Competition.objects.filter(
+            deleted_at__isnull=True, end_time__gte=current
+    ).values_list("id", "start_time", "end_time"):
+        if start_time <= current:
+            ids.add(competition_id)
+            first_end = end_time if first_end is None else min(first_end, end_time)
+        else:
+            next_start = start_time if next_start is None else min(next_start, start_time)
+
+    ids = frozenset(ids)
+    with _active_lock:
+        _active = (version, next_start, first_end, ids)
+    return ids
+
+
+def invalidate_active_competitions():
+    """
+    Drops the active competition ids in every worker, again once the
+    surrounding transaction commits.
+    """
+    global _active
+
+    bump_version(ACTIVE_VERSION_KEY)
+    with _active_lock:
+        _active = None
+    transaction.on_commit(lambda: bump_version(ACTIVE_VERSION_KEY))
+
+
+def count_entry(competition_id, delta: int = 1):
+    """
+    Adjusts a competition's entry counter in the database with an `F()`
+    update, inside the caller's transaction. Joins go to a random counter
+    shard when sharding is enabled; removals always update the competition
+    row, so they never recreate shards of a competition being deleted.
+    """
+    shards = settings.COMPETITION_ENTRY_COUNTER_SHARDS
+    if not shards or delta < 0:
+        Competition.objects.filter(pk=competition_id).update(
+            entries_count=F("entries_count") + delta)
+        return
+
+    shard = random.randrange(shards)
+    counter = CompetitionEntryCounter.objects.filter(competition_id=competition_id, shard=shard)
+    if not counter.update(count=F("count") + delta):
+        CompetitionEntryCounter.objects.bulk_create(
+            [CompetitionEntryCounter(competition_id=competition_id, shard=shard)],
+            ignore_conflicts=True
+        )
+        counter.update(count=F("count") + delta)
+
+
+def join_competition(competition: Competition, player, entry_fee):
+    """
+    Admits a player into a competition. Returns the new entry, or None if
+    the competition is full.
+
+    For capacity-limited competitions the seat is claimed with one guarded
+    `UPDATE ... SET entries_count = entries_count + 1 WHERE entries_count <
+    max_players`, so concurrent joins cannot overshoot `max_players`. The
+    row lock it takes lasts only until the entry insert commits. Unlimited
+    competitions skip the guard and are counted like any other entry.
+    """
+    with transaction.atomic():
+        entry = CompetitionEntry(competition=competition, player=player, entry_fee=entry_fee)
+
+        if competition.max_players > 0:
+            admitted = Competition.objects.filter(
+                pk=competition.pk, entries_count__lt=F("max_players")
+            ).update(entries_count=F("entries_count") + 1)
+            if not admitted:
+                return None
+            # Already counted by the guarded update
+            entry._counted = True
+
+        entry.save()
+    return entry
+
+
+def soft_delete_competition(competition: Competition):
+    """
+    Soft-deletes a competition. Its entries and scores are kept as history
+    but are no longer listed, ranked or counted.
+    """
+    competition.deleted_at = now()
+    competition.save(update_fields=["deleted_at", "updated_at"])
+
+
+def soft_delete_entry(entry: CompetitionEntry):
+    """
+    Soft-deletes an entry with its scores: the player leaves the
+    leaderboard, stops counting towards `entries_count` and may join again.
+    """
+    with transaction.atomic():
+        if not CompetitionEntry.objects.filter(pk=entry.pk).soft_delete():
+            return
+        Score.objects.filter(competition_id=entry.competition_id, entry=entry).soft_delete()
+        EntryAggregate.objects.filter(entry=entry).delete()
+        count_entry(entry.competition_id, -1)
+        touch_competition(entry.competition_id)
+        if leaderboard_index.is_enabled():
+            transaction.on_commit(partial(leaderboard_index.invalidate, entry.competition_id))
+
+
+def soft_delete_score(score: Score):
+    """
+    Soft-deletes a score and recomputes its entry's aggregate without it.
+    """
+    with transaction.atomic():
+        Score.objects.filter(competition_id=score.competition_id, pk=score.pk).soft_delete()
+        entry = CompetitionEntry.objects.select_for_update().get(pk=score.entry_id)
+        return rebuild_entry_aggregate(entry)
+
+
+def reconcile_entry_counts(competitions=None):
+    """
+    Folds counter shards into `Competition.entries_count` and repairs any
+    drift from the real number of entries. Returns the competitions whose
+    count changed.
+    """
+    queryset = Competition.objects.all() if competitions is None else competitions
+    repaired = []
+
+    for competition_id in queryset.values_list("id", flat=True).iterator():
+        with transaction.atomic():
+            # Lock the counters before counting, so a join that has already
+            # counted itself commits first and is included in the count.
+            competition = Competition.objects.select_for_update().get(pk=competition_id)
+            shards = list(
+                CompetitionEntryCounter.objects.select_for_update()
+                .filter(competition=competition)
+            )
+            actual = CompetitionEntry.objects.filter(competition=competition).count()
+
+            if shards:
+                CompetitionEntryCounter.objects.filter(
+                    id__in=[shard.id for shard in shards]).delete()
+
+            if actual != competition.entries_count + sum(shard.count for shard in shards):
+                repaired.append(competition)
+
+            if actual != competition.entries_count:
+                competition.entries_count = actual
+                competition.save(update_fields=["entries_count", "updated_at"])
+
+    return repaired
+
+
+def record_score(score: Score):
+    """
+    Folds a newly created score into its entry's aggregate.
+    Must run inside the transaction that created the score.
     """
-    Fetches the leaderboard for a given competition.
+    # Lock the entry so concurrent submissions for the same player queue up
+    # instead of racing on the aggregate row. The player comes along (not
+    # locked) for the leaderboard index row.
+    entry = (
+        CompetitionEntry.objects.select_related("player")
+        .select_for_update(of=("self",)).get(pk=score.entry_id)
+    )
+    aggregate = fold_score(EntryAggregate.objects.filter(entry=entry).first(), entry, score)
+    aggregate.save()
+    touch_competition(entry.competition_id)
+
+    if leaderboard_index.is_enabled():
+        transaction.on_commit(partial(
+            leaderboard_index.apply, entry.competition_id, _index_row(aggregate, entry)
+        ))
+    return aggregate
+
+
+def fold_score(aggregate, entry: CompetitionEntry, score: Score):
     """
-    leaderboard_entries = (
-        Score.objects.filter(entry__competition_id=competition_id)
-        .values("entry__player_id", "entry__player__full_name")
+    Applies one score to an entry's aggregate in memory, creating the
+    aggregate for the entry's first score. The caller saves it.
+    """
+    if aggregate is None:
+        return EntryAggregate(
+            entry=entry,
+            competition_id=entry.competition_id,
+            best_score=score.score,
+            total_score=score.score,
+            score_count=1,
+            mean_score=float(score.score),
+            best_reached_at=score.created_at,
+            last_submitted_at=score.created_at,
+        )
+
+    if score.score > aggregate.best_score:
+        aggregate.best_score = score.score
+        aggregate.best_reached_at = score.created_at
+
+    aggregate.total_score += score.score
+    aggregate.score_count += 1
+    aggregate.mean_score = aggregate.total_score / aggregate.score_count
+    aggregate.last_submitted_at = max(aggregate.last_submitted_at, score.created_at)
+    return aggregate
+
+
+def _score_item_errors(item, entry, attempts, submitted_at):
+    """
+    Why one item of a score batch is rejected, or None if it is valid.
+    """
+    if entry is None:
+        return {"player": "The player must join the competition before submitting a score."}
+    if item["score"] < 0:
+        return {"score": "Score must be a positive integer."}
+    if entry.competition.end_time and submitted_at > entry.competition.end_time:
+        return {"competition": "The competition has ended. Scores cannot be submitted."}
+    if attempts.get(entry.id, 0) >= entry.competition.max_score_per_player:
+        return {"score": "The player has reached the maximum number of score submissions allowed in this competition."}
+    return None
+
+
+def _fold_scores(scores, aggregates, updated_at):
+    """
+    Folds stored scores into their entries' aggregates, with one bulk
+    insert for new aggregates and one bulk update for the rest.
+    """
+    created, updated = {}, {}
+    for score in scores:
+        aggregate = fold_score(aggregates.get(score.entry_id), score.entry, score)
+        if aggregate.entry_id not in aggregates:
+            created[aggregate.entry_id] = aggregate
+        elif aggregate.entry_id not in created:
+            aggregate.updated_at = updated_at
+            updated[aggregate.entry_id] = aggregate
+        aggregates[aggregate.entry_id] = aggregate
+
+    EntryAggregate.objects.bulk_create(created.values())
+    EntryAggregate.objects.bulk_update(
+        updated.values(),
+        ["best_score", "total_score", "score_count", "mean_score",
+         "best_reached_at", "last_submitted_at", "updated_at"],
+        batch_size=500
+    )
+
+
+def submit_scores(items):
+    """
+    Validates and stores a batch of scores in one transaction.
+
+    `items` are dicts with `index`, `competition`, `player` and `score`,
+    and optionally `submitted_at` for scores accepted earlier (queued
+    submissions); it is checked against the end time and becomes the
+    score's `created_at`. Entries, attempt counts and end times are loaded
+    once for the whole batch, scores are written with a single bulk
+    insert, and aggregates with one bulk insert and one bulk update.
+    Returns one result per item.
+    """
+    submitted_at = now()
+    pairs = Q()
+    for item in items:
+        pairs |= Q(competition_id=item["competition"], player_id=item["player"])
+
+    with transaction.atomic():
+        # Lock the entries in a stable order, like record_score does for one
+        # entry, so attempt limits hold under concurrent batches.
+        entries = {
+            (entry.competition_id, entry.player_id): entry
+            for entry in CompetitionEntry.objects.select_for_update(of=("self",))
+            .select_related("competition").filter(pairs).order_by("id")
+        } if items else {}
+        aggregates = {
+            aggregate.entry_id: aggregate
+            for aggregate in EntryAggregate.objects.filter(entry__in=entries.values())
+        }
+        attempts = {
+            entry_id: aggregate.score_count for entry_id, aggregate in aggregates.items()
+        }
+
+        results = []
+        accepted = []
+        backdated = []
+        for item in items:
+            entry = entries.get((item["competition"], item["player"]))
+            errors = _score_item_errors(
+                item, entry, attempts, item.get("submitted_at", submitted_at))
+
+            if errors:
+                results.append({"index": item["index"], "status": "rejected", "errors": errors})
+                continue
+
+            attempts[entry.id] = attempts.get(entry.id, 0) + 1
+            score = Score(entry=entry, competition_id=entry.competition_id, score=item["score"])
+            accepted.append(score)
+            if "submitted_at" in item:
+                backdated.append((score, item["submitted_at"]))
+            results.append({"index": item["index"], "status": "created", "id": score.id})
+
+        Score.objects.bulk_create(accepted)
+        if backdated:
+            # created_at is auto_now_add, so the accepted time is set after the insert
+            for score, created_at in backdated:
+                score.created_at = created_at
+            Score.objects.bulk_update([score for score, _ in backdated], ["created_at"], batch_size=500)
+
+        _fold_scores(accepted, aggregates, submitted_at)
+
+        for competition_id in {score.entry.competition_id for score in accepted}:
+            touch_competition(competition_id)
+            if leaderboard_index.is_enabled():
+                transaction.on_commit(partial(leaderboard_index.invalidate, competition_id))
+
+    return results
+
+
+def _index_row(aggregate: EntryAggregate, entry: CompetitionEntry):
+    row = {field: getattr(aggregate, field) for field in leaderboard_index.AGGREGATE_FIELDS}
+    row["player_id"] = entry.player_id
+    row["player_name"] = entry.player.full_name
+    return row
+
+
+def rebuild_entry_aggregate(entry: CompetitionEntry):
+    """
+    Recomputes an entry's aggregate from its raw scores.
+    Used when a score is edited and the running totals can no longer be patched.
+    Refused for competitions whose scores were compacted away, where the
+    aggregate is the only record left.
+    """
+    if entry.competition.scores_compacted:
+        raise ValueError("The scores of this competition were compacted; its aggregates cannot be rebuilt.")
+
+    scores = entry.scores.filter(competition_id=entry.competition_id)
+    totals = scores.aggregate(
+        best_score=Max("score"),
+        total_score=Sum("score"),
+        score_count=Count("id"),
+        last_submitted_at=Max("created_at"),
+    )
+
+    touch_competition(entry.competition_id)
+    if leaderboard_index.is_enabled():
+        transaction.on_commit(partial(leaderboard_index.invalidate, entry.competition_id))
+
+    if not totals["score_count"]:
+        EntryAggregate.objects.filter(entry=entry).delete()
+        return None
+
+    best_reached_at = scores.filter(
+        score=totals["best_score"]
+    ).aggregate(reached_at=Min("created_at"))["reached_at"]
+
+    aggregate, _ = EntryAggregate.objects.update_or_create(
+        entry=entry,
+        defaults={
+            "competition_id": entry.competition_id,
+            "best_score": totals["best_score"],
+            "total_score": totals["total_score"],
+            "score_count": totals["score_count"],
+            "mean_score": totals["total_score"] / totals["score_count"],
+            "best_reached_at": best_reached_at,
+            "last_submitted_at": totals["last_submitted_at"],
+        }
+    )
+    return aggregate
+
+
+def rebuild_competition_aggregates(competition: Competition):
+    """
+    Recomputes every entry aggregate of a competition from its raw scores
+    with set-based queries. Used after bulk loads and for repairs.
+    """
+    touch_competition(competition.id)
+    if leaderboard_index.is_enabled():
+        transaction.on_commit(partial(leaderboard_index.invalidate, competition.id))
+
+    EntryAggregate.objects.filter(competition=competition).delete()
+
+    totals = (
+        Score.objects.filter(competition=competition, entry__deleted_at__isnull=True)
+        .values("entry_id")
         .annotate(
-            highest_score=Max("score"),
-            total_entries=Count("id")
+            best_score=Max("score"),
+            total_score=Sum("score"),
+            score_count=Count("id"),
+            last_submitted_at=Max("created_at"),
+        )
+        .order_by()
+    )
+
+    EntryAggregate.objects.bulk_create(
+        (
+            EntryAggregate(
+                entry_id=row["entry_id"],
+                competition=competition,
+                best_score=row["best_score"],
+                total_score=row["total_score"],
+                score_count=row["score_count"],
+                mean_score=row["total_score"] / row["score_count"],
+                best_reached_at=row["last_submitted_at"],
+                last_submitted_at=row["last_submitted_at"],
+            )
+            for row in totals.iterator()
+        ),
+        batch_size=5000
+    )
+
+    # Second pass: the first time each entry reached its best score
+    EntryAggregate.objects.filter(competition=competition).update(
+        best_reached_at=Subquery(
+            Score.objects.filter(
+                competition=competition, entry_id=OuterRef("entry_id"), score=OuterRef("best_score")
+            ).order_by("created_at").values("created_at")[:1]
         )
-        .order_by("-highest_score")[:limit]
     )
 
+
+class RankingStrategy:
+    """
+    Describes how a ranking method and tiebreaker rule order entries,
+    in terms of `EntryAggregate` columns.
+    """
+
+    def __init__(self, score_field: str, tiebreak_field: str, latest_first: bool = False):
+        self.score_field = score_field
+        self.tiebreak_field = tiebreak_field
+        self.latest_first = latest_first
+
+    def order_by(self, reverse=False):
+        """
+        Ordering that ranks the best entry first (or last, when reversed).
+        Entries that tie on both the score and the tiebreaker share a rank.
+        """
+        score = F(self.score_field)
+        tiebreak = F(self.tiebreak_field)
+        if reverse:
+            return [score.asc(), tiebreak.asc() if self.latest_first else tiebreak.desc()]
+        return [score.desc(), tiebreak.desc() if self.latest_first else tiebreak.asc()]
+
+    def beats(self, score, tiebreak):
+        """
+        Filter matching the entries ranked strictly ahead of an entry with
+        the given score and tiebreaker value.
+        """
+        tiebreak_lookup = "gt" if self.latest_first else "lt"
+        return Q(**{f"{self.score_field}__gt": score}) | Q(**{
+            self.score_field: score,
+            f"{self.tiebreak_field}__{tiebreak_lookup}": tiebreak,
+        })
+
+    def precedes(self, score, tiebreak, pk):
+        """
+        Keyset filter for the entries listed before the given one, using the
+        id as the final key so that full ties still have a stable order.
+        """
+        return self.beats(score, tiebreak) | Q(**{
+            self.score_field: score, self.tiebreak_field: tiebreak, "id__lt": pk,
+        })
+
+    def follows(self, score, tiebreak, pk):
+        """
+        Keyset filter for the entries listed after the given one.
+        """
+        tiebreak_lookup = "lt" if self.latest_first else "gt"
+        return (
+            Q(**{f"{self.score_field}__lt": score})
+            | Q(**{self.score_field: score, f"{self.tiebreak_field}__{tiebreak_lookup}": tiebreak})
+            | Q(**{self.score_field: score, self.tiebreak_field: tiebreak, "id__gt": pk})
+        )
+
+    def rank(self, queryset):
+        """
+        Annotates `rank` (shared on ties) and `position` (unique, stable)
+        on an `EntryAggregate` queryset, computed by the database in one pass.
+        """
+        order_by = self.order_by()
+        return queryset.annotate(
+            rank=Window(Rank(), order_by=order_by),
+            position=Window(RowNumber(), order_by=order_by + [F("id").asc()]),
+        ).order_by("position")
+
+
+# Pluggable registry of (ranking method, tiebreaker rule) -> strategy.
+# Averages and totals change on every submission, so the time they were
+# "reached" is the latest submission time.
+RANKING_STRATEGIES = {
+    (RankingMethod.HIGHEST_SCORE.value, TiebreakerRule.FIRST_TO_REACH.value):
+        RankingStrategy("best_score", "best_reached_at"),
+    (RankingMethod.HIGHEST_SCORE.value, TiebreakerRule.LATEST_SUBMISSION.value):
+        RankingStrategy("best_score", "last_submitted_at", latest_first=True),
+    (RankingMethod.AVERAGE_SCORE.value, TiebreakerRule.FIRST_TO_REACH.value):
+        RankingStrategy("mean_score", "last_submitted_at"),
+    (RankingMethod.AVERAGE_SCORE.value, TiebreakerRule.LATEST_SUBMISSION.value):
+        RankingStrategy("mean_score", "last_submitted_at", latest_first=True),
+    (RankingMethod.CUMULATIVE_SCORE.value, TiebreakerRule.FIRST_TO_REACH.value):
+        RankingStrategy("total_score", "last_submitted_at"),
+    (RankingMethod.CUMULATIVE_SCORE.value, TiebreakerRule.LATEST_SUBMISSION.value):
+        RankingStrategy("total_score", "last_submitted_at", latest_first=True),
+}
+
+DEFAULT_RANKING_STRATEGY = RANKING_STRATEGIES[
+    (RankingMethod.HIGHEST_SCORE.value, TiebreakerRule.FIRST_TO_REACH.value)
+]
+
+
+def get_ranking_strategy(competition: Competition) -> RankingStrategy:
+    """
+    Returns the ranking strategy configured on a competition.
+    """
+    ranking_method = get_lookup_by_id(competition.ranking_method_id)
+    tiebreaker_rule = get_lookup_by_id(competition.tiebreaker_rule_id)
+    key = (
+        ranking_method.value if ranking_method else None,
+        tiebreaker_rule.value if tiebreaker_rule else None,
+    )
+    return RANKING_STRATEGIES.get(key, DEFAULT_RANKING_STRATEGY)
+
+
+def is_finalized(competition: Competition):
+    """
+    Whether a competition's standings are frozen. The first call once the
+    competition has ended, plus `COMPETITION_FINALIZE_DELAY`, finalizes it.
+    """
+    if competition.finalized_at is not None:
+        return True
+    if competition.end_time is None or now() < competition.end_time + timedelta(
+            seconds=settings.COMPETITION_FINALIZE_DELAY):
+        return False
+    finalize_competition(competition)
+    return competition.finalized_at is not None
+
+
+def finalize_competition(competition: Competition, compact=None):
+    """
+    Ranks an ended competition once with its ranking strategy and stores
+    the result as `CompetitionStanding` rows. With `compact` (by default
+    `COMPETITION_FINALIZE_COMPACT_SCORES`) the raw scores are deleted too,
+    leaving the aggregates as the per-entry record. Returns False if the
+    competition was already finalized, or still has queued submissions
+    that were accepted before the end and must be ranked first.
+    """
+    if compact is None:
+        compact = settings.COMPETITION_FINALIZE_COMPACT_SCORES
+    strategy = get_ranking_strategy(competition)
+
+    with transaction.atomic():
+        # Concurrent first reads queue on the row lock; one of them freezes
+        finalized_at = (
+            Competition.objects.select_for_update()
+            .values_list("finalized_at", flat=True).get(pk=competition.pk)
+        )
+        if finalized_at is not None:
+            competition.finalized_at = finalized_at
+            return False
+        if ScoreSubmission.objects.filter(
+                competition_id=competition.id,
+                status=get_lookup(ScoreSubmissionStatus.PENDING.value)).exists():
+            return False
+
+        ranked = strategy.rank(
+            EntryAggregate.objects.filter(competition_id=competition.id)
+        ).values_list(
+            "position", "rank", "entry__player_id",
+            "best_score", "total_score", "mean_score", "score_count")
+        CompetitionStanding.objects.bulk_create(
+            (
+                CompetitionStanding(
+                    competition_id=competition.id,
+                    position=position,
+                    rank=rank,
+                    player_id=player_id,
+                    best_score=best_score,
+                    total_score=total_score,
+                    mean_score=mean_score,
+                    score_count=score_count,
+                )
+                for position, rank, player_id, best_score, total_score, mean_score, score_count
+                in ranked.iterator()
+            ),
+            batch_size=5000
+        )
+
+        if compact:
+            # Two set-based statements: Django's delete() would load every
+            # score to null the submissions pointing at it, one by one
+            ScoreSubmission.objects.filter(
+                competition_id=competition.id, recorded_score__isnull=False
+            ).update(recorded_score=None)
+            scores = Score.objects.filter(competition_id=competition.id)
+            scores._raw_delete(scores.db)
+            competition.scores_compacted = True
+
+        competition.finalized_at = now()
+        Competition.objects.filter(pk=competition.pk).update(
+            finalized_at=competition.finalized_at, scores_compacted=competition.scores_compacted)
+        touch_competition(competition.id)
+        # Finalized competitions are read from their standings
+        if leaderboard_index.is_enabled():
+            transaction.on_commit(partial(leaderboard_index.invalidate, competition.id))
+    return True
+
+
+def reopen_competition(competition: Competition):
+    """
+    Unfreezes a finalized competition whose end time moved later. Its
+    standings are dropped so reads rank it live again, and it is finalized
+    anew once the new end time passes.
+    """
+    with transaction.atomic():
+        CompetitionStanding.objects.filter(competition_id=competition.id).delete()
+        competition.finalized_at = None
+        Competition.objects.filter(pk=competition.pk).update(finalized_at=None)
+        touch_competition(competition.id)
+        if leaderboard_index.is_enabled():
+            transaction.on_commit(partial(leaderboard_index.invalidate, competition.id))
+
+
+FINAL_FIELDS = (
+    "position", "rank", "player_id", "player__full_name",
+    "best_score", "total_score", "mean_score", "score_count",
+)
+
+
+def final_standings(competition: Competition):
+    """
+    The frozen leaderboard of a finalized competition, in position order.
+    """
+    return CompetitionStanding.objects.filter(competition_id=competition.id).values(*FINAL_FIELDS)
+
+
+def final_row(strategy: RankingStrategy, values: dict):
+    return {
+        "rank": values["rank"],
+        "player_id": values["player_id"],
+        "player_name": values["player__full_name"],
+        "score": values[strategy.score_field],
+        "highest_score": values["best_score"],
+        "total_entries": values["score_count"],
+    }
+
+
+def get_leaderboard(competition: Competition, limit: int = 10):
+    """
+    Fetches the leaderboard for a given competition, ranked by its
+    ranking method and tiebreaker rule in a single query.
+    """
+    strategy = get_ranking_strategy(competition)
+
+    if is_finalized(competition):
+        return [final_row(strategy, values) for values in final_standings(competition)[:limit]]
+
+    if leaderboard_index.is_enabled():
+        return leaderboard_index.get_index(competition.id, strategy).top(limit)
+
+    leaderboard_entries = strategy.rank(
+        EntryAggregate.objects.filter(competition_id=competition.id)
+    ).values("rank", *standing_fields(strategy))[:limit]
+
     return [
-        {
-            "rank": index + 1,
-            "player_id": entry["entry__player_id"],
-            "player_name": entry["entry__player__full_name"],
-            "highest_score": entry["highest_score"],
-            "total_entries": entry["total_entries"],
-        }
-        for index, entry in enumerate(leaderboard_entries)
+        standing_row(strategy, entry, entry["rank"])
+        for entry in leaderboard_entries
     ]
+
+
+async def aget_leaderboard(competition: Competition, limit: int = 10):
+    """
+    `get_leaderboard` for async views. The ranking query streams through
+    the async ORM; the in-memory index, when enabled, is read in a thread
+    since it may have to load.
+    """
+    strategy = await sync_to_async(get_ranking_strategy)(competition)
+
+    if await sync_to_async(is_finalized)(competition):
+        return [
+            final_row(strategy, values)
+            async for values in final_standings(competition)[:limit]
+        ]
+
+    if leaderboard_index.is_enabled():
+        return await sync_to_async(get_leaderboard)(competition, limit)
+
+    leaderboard_entries = strategy.rank(
+        EntryAggregate.objects.filter(competition_id=competition.id)
+    ).values("rank", *standing_fields(strategy))[:limit]
+
+    return [
+        standing_row(strategy, entry, entry["rank"])
+        async for entry in leaderboard_entries
+    ]
+
+
+def standing_fields(strategy: RankingStrategy):
+    """
+    `EntryAggregate` values needed to build a leaderboard row.
+    """
+    return (
+        "id", "entry__player_id", "entry__player__full_name", "best_score",
+        "score_count", strategy.score_field, strategy.tiebreak_field,
+    )
+
+
+def standing_row(strategy: RankingStrategy, values: dict, rank: int):
+    return {
+        "rank": rank,
+        "player_id": values["entry__player_id"],
+        "player_name": values["entry__player__full_name"],
+        "score": values[strategy.score_field],
+        "highest_score": values["best_score"],
+        "total_entries": values["score_count"],
+    }
+
+
+def get_player_standing(competition: Competition, player):
+    """
+    Returns a player's leaderboard row without ranking the whole competition:
+    the rank is one indexed count of the entries that beat the player.
+    Returns None if the player has no score in the competition.
+    """
+    strategy = get_ranking_strategy(competition)
+
+    if is_finalized(competition):
+        values = final_standings(competition).filter(player=player).first()
+        return final_row(strategy, values) if values else None
+
+    if leaderboard_index.is_enabled():
+        return leaderboard_index.get_index(competition.id, strategy).rank_of(player.id)
+
+    aggregate = EntryAggregate.objects.filter(
+        competition_id=competition.id, entry__player=player
+    ).values(*standing_fields(strategy)).first()
+
+    if aggregate is None:
+        return None
+
+    ahead = EntryAggregate.objects.filter(competition_id=competition.id).filter(
+        strategy.beats(aggregate[strategy.score_field], aggregate[strategy.tiebreak_field])
+    ).count()
+
+    return standing_row(strategy, aggregate, ahead + 1)
+
+
+def get_player_rank(competition: Competition, player):
+    """
+    Returns a player's 1-based rank in a competition, or None if unranked.
+    """
+    standing = get_player_standing(competition, player)
+    return standing["rank"] if standing else None
+
+
+def get_leaderboard_around(competition: Competition, player, radius: int = 5):
+    """
+    Returns the leaderboard rows within `radius` positions of a player.
+    The window is read with keyset bounds on the ranking index, so its cost
+    does not depend on the player's position or the competition size.
+    Returns None if the player has no score in the competition.
+    """
+    strategy = get_ranking_strategy(competition)
+
+    if is_finalized(competition):
+        standings = final_standings(competition)
+        own = standings.filter(player=player).values_list("position", flat=True).first()
+        if own is None:
+            return None
+        return [
+            final_row(strategy, values)
+            for values in standings.filter(position__range=(own - radius, own + radius))
+        ]
+
+    if leaderboard_index.is_enabled():
+        return leaderboard_index.get_index(competition.id, strategy).around(player.id, radius)
+
+    fields = standing_fields(strategy)
+    aggregates = EntryAggregate.objects.filter(competition_id=competition.id)
+
+    own = aggregates.filter(entry__player=player).values(*fields).first()
+    if own is None:
+        return None
+
+    keys = (own[strategy.score_field], own[strategy.tiebreak_field], own["id"])
+
+    ahead = list(
+        aggregates.filter(strategy.precedes(*keys))
+        .order_by(*strategy.order_by(reverse=True), "-id")
+        .values(*fields)[:radius]
+    )
+    ahead.reverse()
+    behind = list(
+        aggregates.filter(strategy.follows(*keys))
+        .order_by(*strategy.order_by(), "id")
+        .values(*fields)[:radius]
+    )
+    window = ahead + [own] + behind
+
+    # Only the first row needs counting; the rest follow from their order.
+    first = window[0]
+    first_keys = (first[strategy.score_field], first[strategy.tiebreak_field])
+    counts = aggregates.aggregate(
+        ahead=Count("id", filter=strategy.beats(*first_keys)),
+        before=Count("id", filter=strategy.precedes(*first_keys, first["id"])),
+    )
+
+    rows = []
+    previous_keys = first_keys
+    rank = counts["ahead"] + 1
+    for offset, values in enumerate(window):
+        keys = (values[strategy.score_field], values[strategy.tiebreak_field])
+        if keys != previous_keys:
+            rank = counts["before"] + 1 + offset
+        previous_keys = keys
+        rows.append(standing_row(strategy, values, rank))
+    return rows
+
+
+def competition_listing(queryset, user=None):
+    """
+    Prepares a Competition queryset for `CompetitionResponseSerializer`:
+    related lookups are joined, entry counter shards are prefetched when in
+    use, and the user's own entry is prefetched as `user_entries`, so a page
+    of competitions costs the same number of queries whatever its size.
+    """
+    queryset = queryset.select_related(
+        "created_by", "type", "ranking_method", "tiebreaker_rule")
+
+    if settings.COMPETITION_ENTRY_COUNTER_SHARDS:
+        queryset = queryset.prefetch_related("entry_counters")
+
+    if user is not None and user.is_authenticated:
+        queryset = queryset.prefetch_related(Prefetch(
+            "entries",
+            queryset=CompetitionEntry.objects.filter(player=user)
+            .select_related("aggregate")
+            .annotate(has_scores=Exists(Score.objects.filter(
+                competition_id=OuterRef("competition_id"), entry=OuterRef("pk")))),
+            to_attr="user_entries",
+        ))
+    return queryset
+
+
+def load_competition_standings(competitions, user=None):
+    """
+    Sets `leader` and `user_rank` on competitions loaded by
+    `competition_listing`. Competitions are grouped by ranking strategy and
+    each group costs one query for the leaders and one for the user's ranks;
+    finalized competitions are read from their frozen standings instead.
+    """
+    groups = defaultdict(list)
+    finalized = defaultdict(list)
+    for competition in competitions:
+        competition.leader = None
+        competition.user_rank = None
+        strategy = get_ranking_strategy(competition)
+        if competition.finalized_at is not None:
+            finalized[strategy].append(competition)
+        else:
+            groups[strategy].append(competition)
+
+    for strategy, group in finalized.items():
+        load_final_standings(strategy, group, user)
+
+    for strategy, group in groups.items():
+        if leaderboard_index.is_enabled():
+            _load_indexed_standings(strategy, group, user)
+        else:
+            _load_leaders(strategy, group)
+            _load_user_ranks(strategy, group)
+
+
+def _load_indexed_standings(strategy: RankingStrategy, competitions, user=None):
+    """
+    Sets `leader` and `user_rank` from the in-memory leaderboard indexes.
+    """
+    for competition in competitions:
+        index = leaderboard_index.get_index(competition.id, strategy)
+        top = index.top(1)
+        if top:
+            competition.leader = {
+                "id": top[0]["player_id"],
+                "name": top[0]["player_name"],
+                "score": top[0]["score"],
+            }
+        if user is not None and user.is_authenticated:
+            standing = index.rank_of(user.id)
+            competition.user_rank = standing["rank"] if standing else None
+
+
+def _load_leaders(strategy: RankingStrategy, competitions):
+    """
+    Sets `leader` on competitions with one query. Leaders are picked with the
+    leaderboard's own ordering, id included, so full ties name the same
+    player the leaderboard lists first.
+    """
+    leaders = (
+        EntryAggregate.objects.filter(competition__in=competitions)
+        .select_related("entry__player")
+        .order_by("competition_id", *strategy.order_by(), "id")
+        .distinct("competition_id")
+    )
+    by_competition = {competition.id: competition for competition in competitions}
+    for aggregate in leaders:
+        by_competition[aggregate.competition_id].leader = {
+            "id": aggregate.entry.player.id,
+            "name": aggregate.entry.player.full_name,
+            "score": getattr(aggregate, strategy.score_field),
+        }
+
+
+def _load_user_ranks(strategy: RankingStrategy, competitions):
+    """
+    Sets `user_rank` from the prefetched `user_entries`, counting the
+    entries ahead of the user's in every competition with one query.
+    """
+    own = {}
+    for competition in competitions:
+        for entry in getattr(competition, "user_entries", []):
+            aggregate = getattr(entry, "aggregate", None)
+            if aggregate is not None:
+                own[competition.id] = aggregate
+
+    if not own:
+        return
+
+    ahead = dict(
+        EntryAggregate.objects.filter(reduce(or_, (
+            Q(competition_id=competition_id) & strategy.beats(
+                getattr(aggregate, strategy.score_field),
+                getattr(aggregate, strategy.tiebreak_field))
+            for competition_id, aggregate in own.items()
+        )))
+        .order_by().values("competition_id").annotate(ahead=Count("id"))
+        .values_list("competition_id", "ahead")
+    )
+    for competition in competitions:
+        if competition.id in own:
+            competition.user_rank = ahead.get(competition.id, 0) + 1
+
+
+def load_final_standings(strategy: RankingStrategy, competitions, user=None):
+    """
+    `load_competition_standings` for finalized competitions: one query for
+    the leaders and one for the user's ranks.
+    """
+    by_competition = {competition.id: competition for competition in competitions}
+    standings = CompetitionStanding.objects.filter(competition__in=competitions)
+
+    for values in standings.filter(position=1).values("competition_id", *FINAL_FIELDS):
+        by_competition[values["competition_id"]].leader = {
+            "id": values["player_id"],
+            "name": values["player__full_name"],
+            "score": values[strategy.score_field],
+        }
+
+    if user is not None and user.is_authenticated:
+        for competition_id, rank in standings.filter(player=user).values_list("competition_id", "rank"):
+            by_competition[competition_id].user_rank = rank
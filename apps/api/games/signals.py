@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from games.models import Competition, CompetitionEntry
+from games.services import count_entry, invalidate_active_competitions, touch_competition
+
+
+@receiver(post_save, sender=CompetitionEntry)
+def count_new_entry(sender, instance, created, **kwargs):
+    """
+    Counts a new entry in its competition's `entries_count`, unless the
+    join already claimed its seat through `join_competition`.
+    """
+    if created and not getattr(instance, "_counted", False):
+        count_entry(instance.competition_id, 1)
+    touch_competition(instance.competition_id)
+
+
+@receiver(post_delete, sender=CompetitionEntry)
+def uncount_deleted_entry(sender, instance, **kwargs):
+    """
+    Removes a deleted entry from its competition's `entries_count`.
+    Soft-deleted entries were uncounted by `soft_delete_entry` already.
+    """
+    if instance.deleted_at is not None:
+        return
+    count_entry(instance.competition_id, -1)
+    touch_competition(instance.competition_id)
+
+
+@receiver(post_save, sender=Competition)
+@receiver(post_delete, sender=Competition)
+def touch_changed_competition(sender, instance, **kwargs):
+    """
+    Invalidates conditional GETs of a competition that was edited or deleted,
+    and the cached set of running competitions.
+    """
+    touch_competition(instance.pk)
+    invalidate_active_competitions()
@@ -0,0 +1,78 @@
+import faker
+from django.core.cache import cache
+from datetime import timedelta
+from django.utils.timezone import now
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from core.models import DataLookup
+from core.lookups import get_registry
+from core.enums import (
+    AccountStateType, CompetitionType, RankingMethod, TiebreakerRule)
+from account.models import Role
+from account.enums import RoleCode
+from games.models import Competition, CompetitionEntry, Score
+from games.services import record_score
+
+
+User = get_user_model()
+fake = faker.Faker()
+
+
+class CompetitionFixturesMixin:
+    """
+    Shared fixtures and helpers for the games test suite.
+    """
+    fixtures = ['lookup.json', 'role.json', 'setting.json']
+
+    def setUp(self):
+        # Throttle history lives in the cache and would leak between tests;
+        # reload the lookup registry so query counts exclude its first load
+        cache.clear()
+        get_registry()
+
+        self.active_state = DataLookup.objects.get(
+            value=AccountStateType.ACTIVE.value)
+        self.admin_role = Role.objects.get(code=RoleCode.ADMIN.value)
+        self.player_role = Role.objects.get(code=RoleCode.PLAYER.value)
+
+        self.admin = self.create_user(role=self.admin_role)
+
+    def create_user(self, role=None):
+        return User.objects.create_user(
+            email=fake.unique.email(),
+            password="password123",
+            full_name=fake.name(),
+            role=role or self.player_role,
+            state=self.active_state
+        )
+
+    def create_competition(self, ranking_method=RankingMethod.HIGHEST_SCORE,
+                           tiebreaker_rule=TiebreakerRule.FIRST_TO_REACH,
+                           competition_type=CompetitionType.MULTIPLE_ATTEMPTS,
+                           **kwargs):
+        kwargs.setdefault("max_players", 0)
+        kwargs.setdefault("max_score_per_player", 10)
+        kwargs.setdefault("start_time", now() - timedelta(days=1))
+        kwargs.setdefault("end_time", now() + timedelta(days=1))
+        return Competition.objects.create(
+            name=fake.unique.sentence(nb_words=3),
+            description=fake.text(),
+            min_entry_fee=0,
+            created_by=self.admin,
+            type=DataLookup.objects.get(value=competition_type.value),
+            ranking_method=DataLookup.objects.get(value=ranking_method.value),
+            tiebreaker_rule=DataLookup.objects.get(value=tiebreaker_rule.value),
+            **kwargs
+        )
+
+    def join(self, competition, player):
+        return CompetitionEntry.objects.create(
+            competition=competition, player=player, entry_fee=0)
+
+    def submit(self, entry, *scores):
+        for value in scores:
+            record_score(Score.objects.create(entry=entry, score=value))
+
+
+class CompetitionTestCase(CompetitionFixturesMixin, APITestCase):
+    pass
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.timezone import now
+from freezegun import freeze_time
+
+from games.models import Competition
+from games.permissions import CompetitionAccessPolicy
+from games.services import get_active_competition_ids
+from games.tests.base import CompetitionTestCase
+
+
+class ActiveCompetitionsTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.started = now()
+        self.running = self.create_competition(end_time=self.started + timedelta(hours=1))
+        self.ended = self.create_competition(
+            start_time=self.started - timedelta(days=2), end_time=self.started - timedelta(days=1))
+        self.upcoming = self.create_competition(
+            start_time=self.started + timedelta(hours=2), end_time=self.started + timedelta(hours=3))
+
+    def test_active_ids_are_cached_until_the_next_boundary(self):
+        self.assertEqual(get_active_competition_ids(), {self.running.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_competition_ids(), {self.running.id})
+
+        with freeze_time(self.started + timedelta(hours=1, minutes=30)):
+            self.assertEqual(get_active_competition_ids(), frozenset())
+        with freeze_time(self.started + timedelta(hours=2, minutes=30)):
+            self.assertEqual(get_active_competition_ids(), {self.upcoming.id})
+
+    def test_competition_changes_refresh_the_set(self):
+        self.assertEqual(get_active_competition_ids(), {self.running.id})
+
+        self.ended.end_time = self.started + timedelta(days=1)
+        self.ended.save()
+        self.assertEqual(get_active_competition_ids(), {self.running.id, self.ended.id})
+
+        self.running.deleted_at = self.started
+        self.running.save()
+        self.assertEqual(get_active_competition_ids(), {self.ended.id})
+
+    def test_scope_keeps_running_competitions_for_players(self):
+        request = RequestFactory().get("/")
+        request.user = self.create_user()
+        self.assertEqual(
+            set(CompetitionAccessPolicy.scope_queryset(request, Competition.objects.all())),
+            {self.running})
+
+        request.user = self.admin
+        self.assertEqual(
+            CompetitionAccessPolicy.scope_queryset(request, Competition.objects.all()).count(), 3)
+
+    def test_players_still_list_every_competition(self):
+        """The listing does not apply the scope; upcoming and ended ones stay listed."""
+        self.client.force_authenticate(user=self.create_user())
+        response = self.client.get(reverse("competitions-list"))
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(
+            self.client.get(reverse("competitions-detail", args=[self.ended.id])).status_code, 200)
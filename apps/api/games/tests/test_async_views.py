@@ -0,0 +1,84 @@
+import importlib
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from core.views import DataLookupListView
+from games import urls as games_urls
+from games.views import CompetitionDetailView, CompetitionListView, LeaderboardView
+from games.tests.base import CompetitionTestCase
+
+
+class AsyncReadViewTest(CompetitionTestCase):
+    """
+    The async read views answer exactly like the viewset actions they
+    replace under ASGI.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.competitions = [self.create_competition() for _ in range(3)]
+        self.player = self.create_user()
+        for score, competition in enumerate(self.competitions, start=1):
+            self.submit(self.join(competition, self.player), score * 10)
+        self.factory = APIRequestFactory()
+
+    async def call(self, view, path, **kwargs):
+        response = await view.as_view()(self.factory.get(path), **kwargs)
+        return await sync_to_async(response.render)()
+
+    async def sync_get(self, path):
+        return await sync_to_async(self.client.get)(path)
+
+    async def test_list_matches_viewset(self):
+        path = reverse("competitions-list") + "?limit=2"
+        response = await self.call(CompetitionListView, path)
+        expected = await self.sync_get(path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, expected.data)
+
+    async def test_detail_matches_viewset(self):
+        competition = self.competitions[0]
+        path = reverse("competitions-detail", args=[competition.id])
+        response = await self.call(CompetitionDetailView, path, pk=str(competition.id))
+        expected = await self.sync_get(path)
+
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+        missing = await self.call(CompetitionDetailView, path, pk=str(uuid.uuid4()))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_leaderboard_matches_viewset(self):
+        competition = self.competitions[2]
+        path = reverse("competitions-leaderboard", args=[competition.id])
+        response = await self.call(LeaderboardView, path, pk=str(competition.id))
+        expected = await self.sync_get(path)
+
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response.data[0]["score"], 30)
+
+    async def test_data_lookup_list_matches_viewset(self):
+        path = reverse("data-lookups-list") + "?type=competition_type"
+        response = await self.call(DataLookupListView, path)
+        expected = await self.sync_get(path)
+
+        self.assertEqual(response.data, expected.data)
+        self.assertTrue(response.data)
+
+    def test_async_routes_leave_viewset_actions_alone(self):
+        with override_settings(ASYNC_READ_VIEWS=True):
+            urls = importlib.reload(games_urls)
+        self.addCleanup(importlib.reload, games_urls)
+
+        self.assertEqual(
+            resolve("/competitions/submit-scores", urlconf=urls).url_name,
+            "competitions-submit-scores")
+        self.assertEqual(
+            resolve(f"/competitions/{self.competitions[0].id}", urlconf=urls).url_name,
+            "competitions-detail")
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+from games.models import EntryAggregate, Score
+from games.tests.base import CompetitionTestCase
+
+
+class BulkScoreSubmissionTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("competitions-submit-scores")
+        self.competition = self.create_competition(max_score_per_player=2)
+        self.players = [self.create_user() for _ in range(3)]
+        self.entries = [self.join(self.competition, player) for player in self.players]
+
+    def item(self, player, score, competition=None):
+        return {
+            "competition": str((competition or self.competition).id),
+            "player": str(player.id),
+            "score": score,
+        }
+
+    def test_per_item_results(self):
+        """Valid items are stored; invalid ones are rejected individually."""
+        ended = self.create_competition(
+            start_time=now() - timedelta(days=2), end_time=now() - timedelta(days=1))
+        self.join(ended, self.players[0])
+        self.submit(self.entries[2], 5, 5)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, {"scores": [
+            self.item(self.players[0], 10),
+            self.item(self.players[0], 30),
+            self.item(self.players[0], 50),           # third attempt, over the limit
+            self.item(self.players[1], -1),           # negative score
+            self.item(self.create_user(), 10),        # never joined
+            self.item(self.players[0], 10, ended),    # competition ended
+            self.item(self.players[2], 10),           # limit reached earlier
+            {"player": "not-a-uuid", "score": 1},     # malformed
+            self.item(self.players[1], 20),
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["created", "created", "rejected", "rejected", "rejected",
+             "rejected", "rejected", "rejected", "created"])
+        self.assertIn("competition", results[7]["errors"])
+
+        aggregate = EntryAggregate.objects.get(entry=self.entries[0])
+        self.assertEqual(
+            (aggregate.best_score, aggregate.total_score, aggregate.score_count), (30, 40, 2))
+        self.assertEqual(EntryAggregate.objects.get(entry=self.entries[1]).best_score, 20)
+        self.assertEqual(Score.objects.filter(entry__competition=self.competition).count(), 5)
+
+    def test_query_count_does_not_grow_with_batch(self):
+        players = [self.create_user() for _ in range(30)]
+        for player in players:
+            self.join(self.competition, player)
+
+        self.client.force_authenticate(user=self.admin)
+        counts = []
+        for batch in (players[:5], players[5:30]):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    self.url, {"scores": [self.item(player, 7) for player in batch]}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=self.players[0])
+        response = self.client.post(
+            self.url, {"scores": [self.item(self.players[0], 10)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_empty_batch(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, {"scores": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
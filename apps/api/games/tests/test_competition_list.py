@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+from core.enums import CompetitionType, RankingMethod
+from games.services import get_leaderboard
+from games.tests.base import CompetitionTestCase
+
+
+class CompetitionListQueryTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("competitions-list")
+        self.player = self.create_user()
+
+    def populate(self, count):
+        """Competitions the player has joined and scored in, with rivals."""
+        for _ in range(count):
+            competition = self.create_competition()
+            rival = self.create_user()
+            self.submit(self.join(competition, rival), 80)
+            self.submit(self.join(competition, self.player), 50)
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        """A page costs the same number of queries for 2 or 20 competitions."""
+        self.client.force_authenticate(user=self.player)
+
+        self.populate(2)
+        small_page = self.list_queries()
+        self.populate(18)
+        large_page = self.list_queries()
+
+        self.assertEqual(small_page, large_page)
+        # count, page, user entries, leaders, user ranks
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+    def test_list_values(self):
+        """The preloaded values match what each competition reports."""
+        single = self.create_competition(competition_type=CompetitionType.SINGLE_ATTEMPT)
+        self.submit(self.join(single, self.player), 40)
+        average = self.create_competition(ranking_method=RankingMethod.AVERAGE_SCORE)
+        rival = self.create_user()
+        self.submit(self.join(average, rival), 10, 90)
+        self.join(average, self.player)
+        other = self.create_competition()
+        self.join(other, rival)
+
+        self.client.force_authenticate(user=self.player)
+        response = self.client.get(self.url)
+        rows = {str(row["id"]): row for row in response.data["results"]}
+
+        self.assertEqual(rows[str(single.id)]["total_players_joined"], 1)
+        self.assertEqual(rows[str(single.id)]["current_leader"]["id"], self.player.id)
+        self.assertEqual(rows[str(single.id)]["current_user_rank"], 1)
+        self.assertTrue(rows[str(single.id)]["has_joined"])
+        self.assertFalse(rows[str(single.id)]["can_submit_score"])
+
+        self.assertEqual(rows[str(average.id)]["total_players_joined"], 2)
+        self.assertEqual(rows[str(average.id)]["current_leader"]["score"], 50)
+        self.assertIsNone(rows[str(average.id)]["current_user_rank"])
+        self.assertTrue(rows[str(average.id)]["can_submit_score"])
+
+        self.assertEqual(rows[str(other.id)]["total_players_joined"], 1)
+        self.assertIsNone(rows[str(other.id)]["current_leader"])
+        self.assertFalse(rows[str(other.id)]["has_joined"])
+        self.assertFalse(rows[str(other.id)]["can_submit_score"])
+
+    def test_leader_of_a_full_tie_matches_the_leaderboard(self):
+        competition = self.create_competition()
+        with freeze_time():
+            for _ in range(5):
+                self.submit(self.join(competition, self.create_user()), 70)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.data["results"][0]["current_leader"]["id"],
+            get_leaderboard(competition, limit=1)[0]["player_id"])
+
+    def test_anonymous_list(self):
+        self.populate(2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for row in response.data["results"]:
+            self.assertIsNone(row["current_user_rank"])
+            self.assertFalse(row["has_joined"])
+            self.assertEqual(row["current_leader"]["score"], 80)
@@ -0,0 +1,54 @@
+from django.urls import reverse
+from rest_framework import status
+
+from games.tests.base import CompetitionTestCase
+
+
+class ConditionalGetTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.player = self.create_user()
+        self.entry = self.join(self.competition, self.player)
+        self.submit(self.entry, 10)
+        self.url = reverse("competitions-leaderboard", args=[self.competition.id])
+
+    def test_unchanged_leaderboard_answers_304_without_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.submit(self.entry, 20)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+
+        self.join(self.competition, self.create_user())
+        self.assertNotEqual(self.client.get(self.url)["ETag"], etag)
+
+    def test_detail_etag_is_per_user(self):
+        url = reverse("competitions-detail", args=[self.competition.id])
+
+        self.client.force_authenticate(user=self.player)
+        player_etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=player_etag).status_code,
+            status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=self.create_user())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=player_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,76 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from games.models import Competition, CompetitionEntry, CompetitionEntryCounter
+from games.tests.base import CompetitionTestCase
+
+
+class EntryCounterTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition(max_players=2)
+
+    def refresh(self):
+        return Competition.objects.get(pk=self.competition.pk)
+
+    def test_counter_follows_entries(self):
+        entries = [self.join(self.competition, self.create_user()) for _ in range(2)]
+        self.assertEqual(self.refresh().entries_count, 2)
+
+        entries[0].delete()
+        self.assertEqual(self.refresh().entries_count, 1)
+
+    def test_is_full_reads_the_counter(self):
+        self.join(self.competition, self.create_user())
+        self.join(self.competition, self.create_user())
+        competition = self.refresh()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(competition.is_full)
+
+    def test_join_rejected_when_full(self):
+        self.join(self.competition, self.create_user())
+        self.join(self.competition, self.create_user())
+        player = self.create_user()
+
+        self.client.force_authenticate(user=player)
+        response = self.client.post(
+            reverse("competitions-join", args=[self.competition.id]), {"entry_fee": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.refresh().entries_count, 2)
+
+    @override_settings(COMPETITION_ENTRY_COUNTER_SHARDS=4)
+    def test_sharded_counter(self):
+        """Joins land in counter shards that reconciliation folds back."""
+        for _ in range(3):
+            self.join(self.competition, self.create_user())
+
+        competition = self.refresh()
+        self.assertEqual(competition.entries_count, 0)
+        self.assertEqual(competition.players_joined, 3)
+        self.assertTrue(competition.is_full)
+
+        call_command("reconcile_entry_counts", stdout=StringIO())
+
+        competition = self.refresh()
+        self.assertEqual(competition.entries_count, 3)
+        self.assertFalse(CompetitionEntryCounter.objects.filter(competition=competition).exists())
+        self.assertEqual(competition.players_joined, 3)
+
+    def test_reconcile_repairs_drift(self):
+        CompetitionEntry.objects.bulk_create([
+            CompetitionEntry(competition=self.competition, player=self.create_user(), entry_fee=0)
+        ])
+        Competition.objects.filter(pk=self.competition.pk).update(entries_count=5)
+        other = self.create_competition()
+
+        out = StringIO()
+        call_command("reconcile_entry_counts", stdout=out)
+
+        self.assertEqual(self.refresh().entries_count, 1)
+        self.assertEqual(Competition.objects.get(pk=other.pk).entries_count, 0)
+        self.assertIn("1 competitions repaired", out.getvalue())
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from freezegun import freeze_time
+from rest_framework import status
+
+from core.enums import ScoreSubmissionStatus
+from core.lookups import get_lookup
+from games.ingestion import DatabaseBroker, ScoreBatchWriter
+from games.models import Competition, CompetitionStanding, EntryAggregate, Score, ScoreSubmission
+from games.services import (
+    finalize_competition, get_leaderboard, get_leaderboard_around, get_player_standing,
+    rebuild_entry_aggregate)
+from games.tests.base import CompetitionTestCase
+
+
+class FinalStandingsTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.end_time = now() + timedelta(hours=1)
+        self.competition = self.create_competition(end_time=self.end_time)
+        self.players = [self.create_user() for _ in range(4)]
+        self.entries = [self.join(self.competition, player) for player in self.players]
+        for entry, score in zip(self.entries, (40, 90, 70, 90)):
+            self.submit(entry, score)
+        self.live = get_leaderboard(self.competition)
+
+    def after_end(self):
+        return freeze_time(self.end_time + timedelta(minutes=1))
+
+    def test_first_read_after_the_end_freezes_the_leaderboard(self):
+        self.assertFalse(CompetitionStanding.objects.exists())
+
+        with self.after_end():
+            self.assertEqual(get_leaderboard(self.competition), self.live)
+
+        self.assertIsNotNone(Competition.objects.get(pk=self.competition.pk).finalized_at)
+        self.assertEqual(
+            list(CompetitionStanding.objects.values_list("rank", flat=True)),
+            [row["rank"] for row in self.live])
+
+        # Later changes to the aggregates no longer move the final ranks
+        self.submit(self.entries[0], 100)
+        with self.after_end(), self.assertNumQueries(1):
+            self.assertEqual(get_leaderboard(self.competition), self.live)
+
+    def test_standing_queries_read_the_snapshot(self):
+        live_standing = get_player_standing(self.competition, self.players[2])
+        live_window = get_leaderboard_around(self.competition, self.players[2], radius=1)
+
+        with self.after_end():
+            finalize_competition(self.competition)
+            with self.assertNumQueries(1):
+                self.assertEqual(get_player_standing(self.competition, self.players[2]), live_standing)
+            self.assertEqual(
+                get_leaderboard_around(self.competition, self.players[2], radius=1), live_window)
+            self.assertIsNone(get_player_standing(self.competition, self.create_user()))
+
+            self.client.force_authenticate(user=self.players[1])
+            response = self.client.get(reverse("competitions-my-rank", args=[self.competition.id]))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["rank"], 1)
+
+            response = self.client.get(reverse("competitions-detail", args=[self.competition.id]))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["current_leader"]["id"], self.players[1].id)
+            self.assertIsNotNone(response.data["finalized_at"])
+
+    def test_competitions_are_not_finalized_early(self):
+        with freeze_time(self.end_time + timedelta(seconds=1)):
+            get_leaderboard(self.competition)
+        self.assertIsNone(Competition.objects.get(pk=self.competition.pk).finalized_at)
+
+    @override_settings(COMPETITION_FINALIZE_COMPACT_SCORES=True)
+    def test_command_finalizes_and_compacts(self):
+        out = StringIO()
+        with self.after_end():
+            call_command("finalize_competitions", stdout=out)
+            call_command("finalize_competitions", stdout=out)
+
+        self.assertIn("Finalized 1 competitions.", out.getvalue())
+        self.assertIn("Finalized 0 competitions.", out.getvalue())
+        self.assertFalse(Score.objects.filter(competition=self.competition).exists())
+        self.assertEqual(EntryAggregate.objects.filter(competition=self.competition).count(), 4)
+        self.assertEqual(CompetitionStanding.objects.filter(competition=self.competition).count(), 4)
+
+    def test_extending_a_finalized_competition_reopens_it(self):
+        with self.after_end():
+            finalize_competition(self.competition)
+            self.client.force_authenticate(user=self.admin)
+            response = self.client.patch(
+                reverse("competitions-detail", args=[self.competition.id]),
+                {"start_time": self.competition.start_time, "end_time": now() + timedelta(hours=1),
+                 "max_score_per_player": self.competition.max_score_per_player},
+                format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            competition = Competition.objects.get(pk=self.competition.pk)
+            self.assertIsNone(competition.finalized_at)
+            self.assertFalse(CompetitionStanding.objects.filter(competition=competition).exists())
+            # Ranked live again, so new scores count
+            self.submit(self.entries[0], 100)
+            self.assertEqual(get_leaderboard(competition)[0]["player_id"], self.players[0].id)
+
+    def test_compacted_aggregates_are_not_rebuilt(self):
+        with self.after_end():
+            finalize_competition(self.competition, compact=True)
+
+        self.entries[0].competition.refresh_from_db()
+        with self.assertRaises(ValueError):
+            rebuild_entry_aggregate(self.entries[0])
+        self.assertEqual(EntryAggregate.objects.filter(competition=self.competition).count(), 4)
+
+    def test_queued_scores_are_ranked_before_the_freeze(self):
+        ScoreSubmission.objects.create(
+            competition=self.competition, player=self.players[0], score=100,
+            status=get_lookup(ScoreSubmissionStatus.PENDING.value))
+
+        with self.after_end():
+            self.assertEqual(get_leaderboard(self.competition), self.live)
+            self.assertIsNone(Competition.objects.get(pk=self.competition.pk).finalized_at)
+
+            ScoreBatchWriter(broker=DatabaseBroker()).drain()
+            rows = get_leaderboard(self.competition)
+
+        self.assertIsNotNone(Competition.objects.get(pk=self.competition.pk).finalized_at)
+        self.assertEqual(rows[0]["player_id"], self.players[0].id)
+        self.assertEqual(
+            CompetitionStanding.objects.get(competition=self.competition, position=1).player_id,
+            self.players[0].id)
+
+    def test_compaction_does_not_load_the_scores(self):
+        submission = ScoreSubmission.objects.create(
+            competition=self.competition, player=self.players[0], score=40,
+            status=get_lookup(ScoreSubmissionStatus.ACCEPTED.value),
+            recorded_score=Score.objects.filter(entry=self.entries[0]).first())
+
+        # One UPDATE and one DELETE, however many scores there are
+        with self.after_end(), self.assertNumQueries(9):
+            finalize_competition(self.competition, compact=True)
+
+        self.assertFalse(Score.objects.filter(competition=self.competition).exists())
+        submission.refresh_from_db()
+        self.assertIsNone(submission.recorded_score_id)
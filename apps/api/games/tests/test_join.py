@@ -0,0 +1,56 @@
+import threading
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from games.models import Competition, CompetitionEntry
+from games.services import join_competition
+from games.tests.base import CompetitionFixturesMixin, CompetitionTestCase
+
+
+class JoinCompetitionTest(CompetitionTestCase):
+
+    def test_guarded_join_stops_at_capacity(self):
+        competition = self.create_competition(max_players=1)
+
+        self.assertIsNotNone(join_competition(competition, self.create_user(), 0))
+        self.assertIsNone(join_competition(competition, self.create_user(), 0))
+        self.assertEqual(Competition.objects.get(pk=competition.pk).entries_count, 1)
+
+    def test_duplicate_join_is_rejected_without_counting(self):
+        competition = self.create_competition(max_players=5)
+        player = self.create_user()
+        self.join(competition, player)
+
+        self.client.force_authenticate(user=player)
+        response = self.client.post(
+            reverse("competitions-join", args=[competition.id]), {"entry_fee": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["attr"], "player")
+        self.assertEqual(Competition.objects.get(pk=competition.pk).entries_count, 1)
+
+
+class ConcurrentJoinTest(CompetitionFixturesMixin, TransactionTestCase):
+
+    def test_concurrent_joins_never_overshoot(self):
+        """Concurrent joins admit exactly max_players players."""
+        competition = self.create_competition(max_players=5)
+        players = [self.create_user() for _ in range(20)]
+        barrier = threading.Barrier(len(players))
+
+        def worker(player):
+            try:
+                barrier.wait()
+                join_competition(competition, player, 0)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(player,)) for player in players]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(CompetitionEntry.objects.filter(competition=competition).count(), 5)
+        self.assertEqual(Competition.objects.get(pk=competition.pk).entries_count, 5)
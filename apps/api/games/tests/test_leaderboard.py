@@ -0,0 +1,142 @@
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+from core.enums import RankingMethod, TiebreakerRule
+from games.models import Competition, EntryAggregate
+from games.services import get_leaderboard
+from games.tests.base import CompetitionTestCase
+
+
+class EntryAggregateTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.player = self.create_user()
+        self.entry = self.join(self.competition, self.player)
+
+    def test_submit_score_updates_aggregate(self):
+        """Submitting scores through the API keeps the aggregate in sync."""
+        self.client.force_authenticate(user=self.player)
+        url = reverse("competitions-submit-score", args=[self.competition.id])
+
+        for value in (30, 50, 40):
+            response = self.client.post(url, {"score": value})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        aggregate = EntryAggregate.objects.get(entry=self.entry)
+        self.assertEqual(aggregate.competition_id, self.competition.id)
+        self.assertEqual(aggregate.best_score, 50)
+        self.assertEqual(aggregate.total_score, 120)
+        self.assertEqual(aggregate.score_count, 3)
+        self.assertEqual(aggregate.mean_score, 40.0)
+        self.assertLessEqual(aggregate.best_reached_at, aggregate.last_submitted_at)
+
+    def test_equal_score_keeps_first_reached_time(self):
+        """Matching the best score again does not move best_reached_at."""
+        self.submit(self.entry, 50)
+        reached_at = EntryAggregate.objects.get(entry=self.entry).best_reached_at
+
+        self.submit(self.entry, 50)
+        aggregate = EntryAggregate.objects.get(entry=self.entry)
+        self.assertEqual(aggregate.best_reached_at, reached_at)
+        self.assertEqual(aggregate.score_count, 2)
+
+
+class LeaderboardTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.players = [self.create_user() for _ in range(3)]
+        for player, scores in zip(self.players, [(10, 90), (70,), (20, 30, 40)]):
+            self.submit(self.join(self.competition, player), *scores)
+
+        # A player who joined but never scored is not ranked
+        self.join(self.competition, self.create_user())
+
+        self.url = reverse("competitions-leaderboard", args=[self.competition.id])
+
+    def test_leaderboard_reads_aggregates(self):
+        """The leaderboard lists ranked players by their best score."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = response.data
+        self.assertEqual([row["highest_score"] for row in rows], [90, 70, 40])
+        self.assertEqual([row["total_entries"] for row in rows], [2, 1, 3])
+        self.assertEqual([row["rank"] for row in rows], [1, 2, 3])
+
+    def test_current_leader(self):
+        """The competition detail exposes the top aggregate as leader."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse("competitions-detail", args=[self.competition.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["current_leader"]["id"], self.players[0].id)
+        self.assertEqual(response.data["current_leader"]["score"], 90)
+
+
+class RankingEngineTest(CompetitionTestCase):
+
+    def rank_players(self, competition):
+        return [
+            (row["player_id"], row["rank"], row["score"])
+            for row in get_leaderboard(competition, limit=10)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.players = [self.create_user() for _ in range(3)]
+
+    def populate(self, competition, *score_sets):
+        for player, scores in zip(self.players, score_sets):
+            self.submit(self.join(competition, player), *scores)
+
+    def test_average_score(self):
+        competition = self.create_competition(ranking_method=RankingMethod.AVERAGE_SCORE)
+        self.populate(competition, (100, 0), (60, 60), (30,))
+        self.assertEqual(self.rank_players(competition), [
+            (self.players[1].id, 1, 60.0),
+            (self.players[0].id, 2, 50.0),
+            (self.players[2].id, 3, 30.0),
+        ])
+
+    def test_cumulative_score(self):
+        competition = self.create_competition(ranking_method=RankingMethod.CUMULATIVE_SCORE)
+        self.populate(competition, (100,), (60, 60), (30, 30, 30))
+        self.assertEqual(
+            [row[0] for row in self.rank_players(competition)],
+            [self.players[1].id, self.players[0].id, self.players[2].id])
+
+    def test_first_to_reach_tiebreaker(self):
+        competition = self.create_competition()
+        self.populate(competition, (80,), (80,), (10,))
+        self.assertEqual(
+            [row[:2] for row in self.rank_players(competition)],
+            [(self.players[0].id, 1), (self.players[1].id, 2), (self.players[2].id, 3)])
+
+    def test_latest_submission_tiebreaker(self):
+        competition = self.create_competition(
+            tiebreaker_rule=TiebreakerRule.LATEST_SUBMISSION)
+        self.populate(competition, (80,), (80,), (10,))
+        self.assertEqual(
+            [row[:2] for row in self.rank_players(competition)],
+            [(self.players[1].id, 1), (self.players[0].id, 2), (self.players[2].id, 3)])
+
+    def test_full_ties_share_rank(self):
+        competition = self.create_competition()
+        self.populate(competition, (80,), (80,), (10,))
+        EntryAggregate.objects.filter(competition=competition).update(
+            best_reached_at=now())
+        self.assertEqual(
+            [row[1] for row in self.rank_players(competition)], [1, 1, 3])
+
+    def test_single_query(self):
+        competition = self.create_competition()
+        self.populate(competition, (80,), (70,), (10,))
+        competition = Competition.objects.select_related(
+            "ranking_method", "tiebreaker_rule").get(pk=competition.pk)
+        with self.assertNumQueries(1):
+            get_leaderboard(competition, limit=10)
@@ -0,0 +1,182 @@
+import random
+import threading
+import uuid
+from datetime import datetime, timedelta
+from django.test import SimpleTestCase, override_settings
+from core.enums import RankingMethod, TiebreakerRule
+from games import leaderboard_index
+from games.models import Competition, Score
+from games.services import (
+    DEFAULT_RANKING_STRATEGY, finalize_competition, get_leaderboard, get_player_standing,
+    record_score)
+from games.tests.base import CompetitionTestCase
+
+
+class LeaderboardIndexStructureTest(SimpleTestCase):
+
+    def row(self, player_id, score, reached_at):
+        return {
+            "entry_id": uuid.uuid4(),
+            "player_id": player_id,
+            "player_name": "Player",
+            "best_score": score,
+            "total_score": score,
+            "score_count": 1,
+            "mean_score": float(score),
+            "best_reached_at": reached_at,
+            "last_submitted_at": reached_at,
+        }
+
+    def test_add_and_move(self):
+        index = leaderboard_index.LeaderboardIndex(DEFAULT_RANKING_STRATEGY)
+        start = datetime(2025, 1, 1)
+        players = [uuid.uuid4() for _ in range(4)]
+
+        for offset, (player, score) in enumerate(zip(players, [10, 40, 40, 20])):
+            index.add(self.row(player, score, start + timedelta(minutes=offset)))
+
+        self.assertEqual(
+            [row["player_id"] for row in index.top(10)],
+            [players[1], players[2], players[3], players[0]])
+
+        # Player 0 overtakes everyone; the arrays are re-ordered in place
+        index.add(self.row(players[0], 90, start + timedelta(hours=1)))
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.rank_of(players[0])["rank"], 1)
+        self.assertEqual(index.rank_of(players[2])["rank"], 3)
+        self.assertIsNone(index.rank_of(uuid.uuid4()))
+
+        self.assertEqual(
+            [row["player_id"] for row in index.around(players[1], 1)],
+            [players[0], players[1], players[2]])
+        self.assertEqual(index.memory_usage(), 4 * (8 + 8 + 16 + 16))
+
+    def test_ties_share_rank(self):
+        index = leaderboard_index.LeaderboardIndex(DEFAULT_RANKING_STRATEGY)
+        reached_at = datetime(2025, 1, 1)
+        for score in (50, 50, 10):
+            index.add(self.row(uuid.uuid4(), score, reached_at))
+        self.assertEqual([row["rank"] for row in index.top(3)], [1, 1, 3])
+
+    def test_reads_never_see_a_half_applied_update(self):
+        index = leaderboard_index.LeaderboardIndex(DEFAULT_RANKING_STRATEGY)
+        reached_at = datetime(2025, 1, 1)
+        players = [uuid.uuid4() for _ in range(50)]
+        for player in players:
+            index.add(self.row(player, random.randint(0, 100), reached_at))
+        done = threading.Event()
+
+        def move_players():
+            for _ in range(2000):
+                index.add(self.row(random.choice(players), random.randint(0, 100), reached_at))
+            done.set()
+
+        writer = threading.Thread(target=move_players)
+        writer.start()
+        while not done.is_set():
+            rows = index.top(50)
+            self.assertEqual(len(rows), 50)
+            self.assertEqual(len({row["player_id"] for row in rows}), 50)
+            self.assertEqual(rows, sorted(rows, key=lambda row: -row["score"]))
+        writer.join()
+
+
+@override_settings(LEADERBOARD_INDEX_ENABLED=True)
+class LeaderboardIndexTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.players = [self.create_user() for _ in range(8)]
+
+    def database_standings(self, competition):
+        with override_settings(LEADERBOARD_INDEX_ENABLED=False):
+            return get_leaderboard(competition, limit=100)
+
+    def test_matches_database_ranking(self):
+        """The index ranks exactly like the SQL engine, before and after updates."""
+        for method in (RankingMethod.HIGHEST_SCORE, RankingMethod.AVERAGE_SCORE):
+            for rule in (TiebreakerRule.FIRST_TO_REACH, TiebreakerRule.LATEST_SUBMISSION):
+                competition = self.create_competition(
+                    ranking_method=method, tiebreaker_rule=rule)
+                competition = Competition.objects.select_related(
+                    "ranking_method", "tiebreaker_rule").get(pk=competition.pk)
+                entries = [self.join(competition, player) for player in self.players]
+                for entry in entries:
+                    self.submit(entry, random.randint(0, 5))
+
+                self.assertEqual(
+                    get_leaderboard(competition, limit=100),
+                    self.database_standings(competition))
+
+                # New submissions patch this worker's index without a rebuild
+                with self.captureOnCommitCallbacks(execute=True):
+                    for entry in random.sample(entries, 4):
+                        record_score(Score.objects.create(
+                            entry=entry, score=random.randint(0, 5)))
+
+                with self.assertNumQueries(0):
+                    standings = get_leaderboard(competition, limit=100)
+                    player_standing = get_player_standing(competition, self.players[3])
+
+                self.assertEqual(standings, self.database_standings(competition))
+                self.assertIn(player_standing, standings)
+
+    def test_other_worker_change_triggers_rebuild(self):
+        competition = self.create_competition()
+        competition = Competition.objects.select_related(
+            "ranking_method", "tiebreaker_rule").get(pk=competition.pk)
+        self.submit(self.join(competition, self.players[0]), 10)
+        get_leaderboard(competition)
+
+        # Simulate another worker: the shared version moves without this
+        # process having seen the change.
+        self.submit(self.join(competition, self.players[1]), 20)
+        leaderboard_index.bump_version(leaderboard_index._version_key(competition.id))
+
+        rows = get_leaderboard(competition)
+        self.assertEqual([row["player_id"] for row in rows],
+                         [self.players[1].id, self.players[0].id])
+
+    def test_index_rows_are_complete_before_commit(self):
+        """Patching the index runs no queries while it holds the lock."""
+        competition = self.create_competition()
+        competition = Competition.objects.select_related(
+            "ranking_method", "tiebreaker_rule").get(pk=competition.pk)
+        entry = self.join(competition, self.players[0])
+        get_leaderboard(competition)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_score(Score.objects.create(entry=entry, score=30))
+        with self.assertNumQueries(0):
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(
+            get_leaderboard(competition)[0]["player_name"], self.players[0].full_name)
+
+    @override_settings(LEADERBOARD_INDEX_MAX_COMPETITIONS=2)
+    def test_least_recently_read_indexes_are_evicted(self):
+        competitions = [
+            Competition.objects.select_related("ranking_method", "tiebreaker_rule").get(
+                pk=self.create_competition().pk)
+            for _ in range(3)
+        ]
+        get_leaderboard(competitions[0])
+        get_leaderboard(competitions[1])
+        get_leaderboard(competitions[0])
+        get_leaderboard(competitions[2])
+
+        self.assertIn(competitions[0].id, leaderboard_index._indexes)
+        self.assertNotIn(competitions[1].id, leaderboard_index._indexes)
+        self.assertIn(competitions[2].id, leaderboard_index._indexes)
+
+    def test_finalizing_drops_the_index(self):
+        competition = Competition.objects.select_related(
+            "ranking_method", "tiebreaker_rule").get(pk=self.create_competition().pk)
+        self.submit(self.join(competition, self.players[0]), 10)
+        get_leaderboard(competition)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            finalize_competition(competition)
+
+        self.assertNotIn(competition.id, leaderboard_index._indexes)
@@ -0,0 +1,68 @@
+import random
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from core.enums import RankingMethod, TiebreakerRule
+from games.models import EntryAggregate
+from games.services import get_leaderboard, get_leaderboard_around
+from games.tests.base import CompetitionTestCase
+
+
+class LeaderboardWindowTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.players = [self.create_user() for _ in range(10)]
+
+    def populate(self, competition):
+        for player in self.players:
+            entry = self.join(competition, player)
+            self.submit(entry, *[random.randint(0, 4) for _ in range(random.randint(1, 3))])
+
+    def assert_window_matches_leaderboard(self, competition, radius):
+        leaderboard = get_leaderboard(competition, limit=100)
+        for position, row in enumerate(leaderboard):
+            player = next(p for p in self.players if p.id == row["player_id"])
+            expected = leaderboard[max(position - radius, 0):position + radius + 1]
+            self.assertEqual(get_leaderboard_around(competition, player, radius), expected)
+
+    def test_window_matches_leaderboard(self):
+        """Every player's window is the matching slice of the full leaderboard."""
+        for method in (RankingMethod.HIGHEST_SCORE, RankingMethod.CUMULATIVE_SCORE):
+            for rule in (TiebreakerRule.FIRST_TO_REACH, TiebreakerRule.LATEST_SUBMISSION):
+                competition = self.create_competition(
+                    ranking_method=method, tiebreaker_rule=rule)
+                self.populate(competition)
+                self.assert_window_matches_leaderboard(competition, radius=2)
+
+    def test_window_with_full_ties(self):
+        competition = self.create_competition()
+        self.populate(competition)
+        aggregate = EntryAggregate.objects.filter(competition=competition).first()
+        EntryAggregate.objects.filter(competition=competition).update(
+            best_score=7, best_reached_at=aggregate.best_reached_at)
+        self.assert_window_matches_leaderboard(competition, radius=3)
+
+    @override_settings(LEADERBOARD_INDEX_ENABLED=True)
+    def test_window_from_index(self):
+        competition = self.create_competition()
+        self.populate(competition)
+        self.assert_window_matches_leaderboard(competition, radius=2)
+
+    def test_around_me_endpoint(self):
+        competition = self.create_competition()
+        for player, score in zip(self.players, range(10, 0, -1)):
+            self.submit(self.join(competition, player), score)
+        url = reverse("competitions-leaderboard-around-me", args=[competition.id])
+
+        self.client.force_authenticate(user=self.players[4])
+        response = self.client.get(url, {"radius": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["rank"] for row in response.data], [3, 4, 5, 6, 7])
+
+        response = self.client.get(url, {"radius": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.create_user())
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
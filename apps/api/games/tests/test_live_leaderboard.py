@@ -0,0 +1,153 @@
+import asyncio
+import json
+import uuid
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from games import live
+from games.live import leaderboard_events
+from games.tests.base import CompetitionTestCase
+
+
+def parse_event(chunk):
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode()
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+@override_settings(LEADERBOARD_BACKPLANE="games.live.InMemoryBackplane", LEADERBOARD_PUSH_RATE=20)
+class LiveLeaderboardTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.first = self.create_user()
+        self.second = self.create_user()
+        self.first_entry = self.join(self.competition, self.first)
+        self.second_entry = self.join(self.competition, self.second)
+        self.submit(self.first_entry, 30)
+
+    def commit_scores(self, entry, *scores):
+        for score in scores:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.submit(entry, score)
+
+    async def next_event(self, events):
+        return parse_event(await asyncio.wait_for(anext(events), timeout=5))
+
+    async def test_scores_push_rank_deltas(self):
+        events = leaderboard_events(self.competition.id)
+        try:
+            event, rows = await self.next_event(events)
+            self.assertEqual(event, "snapshot")
+            self.assertEqual([row["player_id"] for row in rows], [str(self.first.id)])
+
+            await sync_to_async(self.commit_scores)(self.second_entry, 50)
+
+            event, deltas = await self.next_event(events)
+            self.assertEqual(event, "delta")
+            changes = {row["player_id"]: row for row in deltas["changed"]}
+            self.assertEqual(changes[str(self.second.id)]["rank"], 1)
+            self.assertIsNone(changes[str(self.second.id)]["previous_rank"])
+            self.assertEqual(changes[str(self.first.id)]["rank"], 2)
+            self.assertEqual(changes[str(self.first.id)]["previous_rank"], 1)
+        finally:
+            await events.aclose()
+
+    @override_settings(LEADERBOARD_PUSH_RATE=1)
+    async def test_bursts_are_coalesced(self):
+        events = leaderboard_events(self.competition.id)
+        try:
+            await self.next_event(events)
+            await sync_to_async(self.commit_scores)(self.second_entry, 10, 20, 40, 60, 80)
+
+            updates = []
+            while True:
+                try:
+                    updates.append(await asyncio.wait_for(anext(events), timeout=1.5))
+                except asyncio.TimeoutError:
+                    break
+
+            self.assertLessEqual(len(updates), 2)
+            _, deltas = parse_event(updates[-1])
+            changes = {row["player_id"]: row for row in deltas["changed"]}
+            self.assertEqual(changes[str(self.second.id)]["score"], 80)
+        finally:
+            await events.aclose()
+
+    async def test_stream_endpoint(self):
+        response = await self.async_client.get(
+            reverse("competitions-leaderboard-stream", args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.async_client.get(
+            reverse("competitions-leaderboard-stream", args=[self.competition.id]))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = aiter(response.streaming_content)
+        try:
+            event, rows = parse_event(await asyncio.wait_for(anext(content), timeout=5))
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(len(rows), 1)
+        finally:
+            await content.aclose()
+
+    def test_stream_needs_asgi(self):
+        """WSGI workers refuse the stream instead of holding the request open."""
+        response = self.client.get(
+            reverse("competitions-leaderboard-stream", args=[self.competition.id]))
+        self.assertEqual(response.status_code, 501)
+
+    async def test_failed_reload_closes_the_streams(self):
+        events = leaderboard_events(self.competition.id)
+        try:
+            await self.next_event(events)
+            with mock.patch.object(live, "load_leaderboard", side_effect=RuntimeError), \
+                    self.assertLogs("games.live", "ERROR"):
+                await sync_to_async(self.commit_scores)(self.second_entry, 50)
+                with self.assertRaises(StopAsyncIteration):
+                    await asyncio.wait_for(anext(events), timeout=5)
+        finally:
+            await events.aclose()
+
+        # New subscribers start over from a fresh snapshot
+        events = leaderboard_events(self.competition.id)
+        try:
+            event, rows = await self.next_event(events)
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(len(rows), 2)
+        finally:
+            await events.aclose()
+
+
+class StopListening(BaseException):
+    pass
+
+
+class PostgresBackplaneTest(SimpleTestCase):
+
+    def test_listener_reconnects_with_backoff(self):
+        competition_id = uuid.uuid4()
+        attempts = iter([ConnectionError(), ConnectionError(), [competition_id], ConnectionError()])
+
+        def notifications():
+            attempt = next(attempts)
+            if isinstance(attempt, Exception):
+                raise attempt
+            yield from attempt
+
+        backplane = live.PostgresBackplane()
+        delivered = []
+        with mock.patch.object(backplane, "notifications", notifications), \
+                mock.patch("time.sleep", side_effect=[None, None, None, StopListening]) as sleep, \
+                self.assertLogs("games.live", "ERROR") as logs:
+            with self.assertRaises(StopListening):
+                backplane.listen(delivered.append)
+
+        self.assertEqual(delivered, [competition_id])
+        self.assertEqual(len(logs.records), 3)
+        # The delay doubles on failures and starts over once notifications flow
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2, 1, 2])
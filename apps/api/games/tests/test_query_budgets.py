@@ -0,0 +1,211 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.tests.budgets import QueryBudget, QueryBudgetMixin
+from games.ingestion import _load_broker
+from games.models import ScoreSubmission
+from games.tests.base import CompetitionTestCase, User, fake
+
+
+@override_settings(AUTH_PRINCIPAL_CACHE_TTL=0)
+class CompetitionQueryBudgetTest(QueryBudgetMixin, CompetitionTestCase):
+    urlconf = "games.urls"
+    budgets = {
+        ("api-root", "get"): QueryBudget(1, 1),
+        ("competitions-list", "get"): {
+            1: QueryBudget(6, 5), 10: QueryBudget(6, 32), 100: QueryBudget(6, 302)},
+        ("competitions-list", "post"): QueryBudget(7, 3),
+        ("competitions-detail", "get"): {
+            1: QueryBudget(5, 5), 10: QueryBudget(5, 5), 100: QueryBudget(5, 5)},
+        ("competitions-detail", "patch"): QueryBudget(12, 9),
+        ("competitions-detail", "delete"): {
+            1: QueryBudget(5, 4), 10: QueryBudget(5, 4), 100: QueryBudget(5, 4)},
+        ("competitions-join", "post"): QueryBudget(9, 4),
+        ("competitions-submit-score", "post"): QueryBudget(19, 15),
+        ("competitions-score-submission", "get"): QueryBudget(3, 3),
+        ("competitions-submit-scores", "post"): {
+            1: QueryBudget(7, 3), 10: QueryBudget(7, 21), 100: QueryBudget(7, 201)},
+        # Leaderboards are capped at the leaderboard size setting
+        ("competitions-leaderboard", "get"): {
+            1: QueryBudget(4, 5), 10: QueryBudget(3, 12), 100: QueryBudget(3, 12)},
+        ("competitions-leaderboard-around-me", "get"): {
+            1: QueryBudget(7, 6), 10: QueryBudget(6, 14), 100: QueryBudget(6, 14)},
+        ("competitions-my-rank", "get"): {
+            1: QueryBudget(5, 5), 10: QueryBudget(4, 4), 100: QueryBudget(4, 4)},
+        ("competitions-leaderboard-stream", "get"): {
+            1: QueryBudget(4, 5), 10: QueryBudget(3, 12), 100: QueryBudget(3, 12)},
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.player = self.create_user()
+        self.competition = self.create_competition(max_score_per_player=100)
+        self.entry = self.join(self.competition, self.player)
+        self.submit(self.entry, 50)
+        self.authenticate(self.player)
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_players(self, count):
+        """Players without a usable password, which would be slow to hash."""
+        return User.objects.bulk_create(
+            User(email=fake.unique.email(), full_name=fake.name(), password="!",
+                 role=self.player_role, state=self.active_state)
+            for _ in range(count)
+        )
+
+    def add_rivals(self, competition, count):
+        """Scored entries of other players, so results grow with `count`."""
+        for index, rival in enumerate(self.create_players(count)):
+            self.submit(self.join(competition, rival), index % 100)
+
+    def competition_payload(self, **kwargs):
+        return {
+            "name": fake.unique.sentence(nb_words=3),
+            "min_entry_fee": 0,
+            "max_players": 0,
+            "max_score_per_player": 3,
+            "start_time": now() - timedelta(hours=1),
+            "end_time": now() + timedelta(days=1),
+            **kwargs,
+        }
+
+    def test_api_root(self):
+        self.assertWithinBudget(
+            "api-root", "get", lambda: self.client.get(reverse("api-root")))
+
+    def test_list(self):
+        def populate(count):
+            for _ in range(count):
+                competition = self.create_competition()
+                self.submit(self.join(competition, self.player), 40)
+                self.add_rivals(competition, 1)
+
+        # The competition from setUp makes one more; start from none
+        self.competition.delete()
+        self.assertSizedWithinBudget(
+            "competitions-list", "get", populate,
+            lambda: self.client.get(reverse("competitions-list")))
+
+    def test_retrieve(self):
+        url = reverse("competitions-detail", args=[self.competition.id])
+        self.assertSizedWithinBudget(
+            "competitions-detail", "get",
+            lambda count: self.add_rivals(self.competition, count),
+            lambda: self.client.get(url))
+
+    def test_create(self):
+        self.authenticate(self.admin)
+        self.assertWithinBudget(
+            "competitions-list", "post",
+            lambda: self.client.post(
+                reverse("competitions-list"), self.competition_payload(), format="json"))
+
+    def test_partial_update(self):
+        self.authenticate(self.admin)
+        url = reverse("competitions-detail", args=[self.competition.id])
+        self.assertWithinBudget(
+            "competitions-detail", "patch",
+            lambda: self.client.patch(url, self.competition_payload(), format="json"))
+
+    def test_destroy(self):
+        self.authenticate(self.admin)
+        for size in self.list_sizes:
+            with self.subTest(size=size):
+                competition = self.create_competition()
+                self.add_rivals(competition, size)
+                self.assertWithinBudget(
+                    "competitions-detail", "delete",
+                    lambda: self.client.delete(reverse("competitions-detail", args=[competition.id])),
+                    size=size)
+
+    def test_join(self):
+        competition = self.create_competition()
+        self.assertWithinBudget(
+            "competitions-join", "post",
+            lambda: self.client.post(
+                reverse("competitions-join", args=[competition.id]), {"entry_fee": 0}, format="json"))
+
+    def test_submit_score(self):
+        self.assertWithinBudget(
+            "competitions-submit-score", "post",
+            lambda: self.client.post(
+                reverse("competitions-submit-score", args=[self.competition.id]),
+                {"score": 70}, format="json"))
+
+    @override_settings(
+        SCORE_INGESTION_ASYNC=True, SCORE_INGESTION_BROKER="games.ingestion.InMemoryBroker")
+    def test_score_submission(self):
+        _load_broker.cache_clear()
+        self.addCleanup(_load_broker.cache_clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("competitions-submit-score", args=[self.competition.id]),
+                {"score": 70}, format="json")
+        submission = ScoreSubmission.objects.get(id=response.data["id"])
+
+        self.assertWithinBudget(
+            "competitions-score-submission", "get",
+            lambda: self.client.get(reverse(
+                "competitions-score-submission", args=[self.competition.id, submission.id])))
+
+    def test_submit_scores(self):
+        self.authenticate(self.admin)
+        self.add_rivals(self.competition, max(self.list_sizes))
+        players = list(
+            self.competition.entries.values_list("player_id", flat=True))
+
+        for size in self.list_sizes:
+            with self.subTest(size=size):
+                items = [
+                    {"competition": str(self.competition.id), "player": str(player), "score": 10}
+                    for player in players[:size]
+                ]
+                self.assertWithinBudget(
+                    "competitions-submit-scores", "post",
+                    lambda: self.client.post(
+                        reverse("competitions-submit-scores"), {"scores": items}, format="json"),
+                    size=size)
+
+    def test_leaderboard(self):
+        url = reverse("competitions-leaderboard", args=[self.competition.id])
+        self.assertSizedWithinBudget(
+            "competitions-leaderboard", "get",
+            lambda count: self.add_rivals(self.competition, count),
+            lambda: self.client.get(url))
+
+    def test_leaderboard_around_me(self):
+        url = reverse("competitions-leaderboard-around-me", args=[self.competition.id])
+        self.assertSizedWithinBudget(
+            "competitions-leaderboard-around-me", "get",
+            lambda count: self.add_rivals(self.competition, count),
+            lambda: self.client.get(url))
+
+    def test_my_rank(self):
+        url = reverse("competitions-my-rank", args=[self.competition.id])
+        self.assertSizedWithinBudget(
+            "competitions-my-rank", "get",
+            lambda count: self.add_rivals(self.competition, count),
+            lambda: self.client.get(url))
+
+    def test_leaderboard_stream(self):
+        url = reverse("competitions-leaderboard-stream", args=[self.competition.id])
+
+        def open_stream():
+            """The response with its opening snapshot; the stream never ends."""
+            response = async_to_sync(self.async_client.get)(url)
+            events = response.streaming_content
+            async_to_sync(anext)(events)
+            async_to_sync(events.aclose)()
+            return response
+
+        self.assertSizedWithinBudget(
+            "competitions-leaderboard-stream", "get",
+            lambda count: self.add_rivals(self.competition, count), open_stream)
@@ -0,0 +1,67 @@
+from django.urls import reverse
+from rest_framework import status
+from core.enums import RankingMethod, TiebreakerRule
+from games.services import get_leaderboard, get_player_rank
+from games.tests.base import CompetitionTestCase
+
+
+class PlayerRankTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.players = [self.create_user() for _ in range(4)]
+        self.scores = [(50, 10), (70,), (50, 20), (50, 10)]
+
+    def populate(self, competition):
+        for player, scores in zip(self.players, self.scores):
+            self.submit(self.join(competition, player), *scores)
+
+    def test_rank_matches_leaderboard(self):
+        """The single count lookup agrees with the windowed leaderboard."""
+        for method in RankingMethod:
+            if method is RankingMethod.TYPE:
+                continue
+            for rule in (TiebreakerRule.FIRST_TO_REACH, TiebreakerRule.LATEST_SUBMISSION):
+                competition = self.create_competition(
+                    ranking_method=method, tiebreaker_rule=rule)
+                self.populate(competition)
+
+                expected = {
+                    row["player_id"]: row["rank"]
+                    for row in get_leaderboard(competition, limit=10)
+                }
+                actual = {
+                    player.id: get_player_rank(competition, player)
+                    for player in self.players
+                }
+                self.assertEqual(actual, expected, (method, rule))
+
+    def test_unranked_player(self):
+        competition = self.create_competition()
+        player = self.create_user()
+        self.join(competition, player)
+        self.assertIsNone(get_player_rank(competition, player))
+
+    def test_my_rank_endpoint(self):
+        competition = self.create_competition()
+        self.populate(competition)
+        url = reverse("competitions-my-rank", args=[competition.id])
+
+        self.client.force_authenticate(user=self.players[2])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rank"], 3)
+        self.assertEqual(response.data["highest_score"], 50)
+
+        self.client.force_authenticate(user=self.create_user())
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_current_user_rank(self):
+        competition = self.create_competition()
+        self.populate(competition)
+
+        self.client.force_authenticate(user=self.players[1])
+        response = self.client.get(reverse("competitions-detail", args=[competition.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["current_user_rank"], 1)
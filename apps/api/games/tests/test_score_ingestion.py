@@ -0,0 +1,177 @@
+import threading
+import uuid
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from freezegun import freeze_time
+from rest_framework import status
+from core.enums import ScoreSubmissionStatus
+from games.ingestion import (
+    DatabaseBroker, RabbitMQBroker, ScoreBatchWriter, _load_broker, get_broker)
+from games.models import EntryAggregate, Score, ScoreSubmission
+from games.tests.base import CompetitionTestCase
+
+
+@override_settings(
+    SCORE_INGESTION_ASYNC=True, SCORE_INGESTION_BROKER="games.ingestion.InMemoryBroker")
+class AsyncScoreIngestionTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        _load_broker.cache_clear()
+        self.competition = self.create_competition(max_score_per_player=2)
+        self.player = self.create_user()
+        self.entry = self.join(self.competition, self.player)
+        self.client.force_authenticate(user=self.player)
+
+    def tearDown(self):
+        _load_broker.cache_clear()
+
+    def post_score(self, score):
+        url = reverse("competitions-submit-score", kwargs={"pk": self.competition.id})
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, {"score": score}, format="json")
+
+    def status_url(self, submission_id):
+        return reverse(
+            "competitions-score-submission",
+            kwargs={"pk": self.competition.id, "submission_id": submission_id})
+
+    def test_submission_is_accepted_then_processed(self):
+        """Scores are queued with 202 and recorded when the writer drains."""
+        response = self.post_score(40)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"]["value"], ScoreSubmissionStatus.PENDING.value)
+        self.assertFalse(Score.objects.filter(entry=self.entry).exists())
+
+        self.assertEqual(ScoreBatchWriter().drain(), 1)
+
+        submission = ScoreSubmission.objects.get(id=response.data["id"])
+        self.assertEqual(submission.status.value, ScoreSubmissionStatus.ACCEPTED.value)
+        self.assertEqual(submission.recorded_score.score, 40)
+        self.assertIsNotNone(submission.processed_at)
+        self.assertEqual(EntryAggregate.objects.get(entry=self.entry).best_score, 40)
+
+        status_response = self.client.get(self.status_url(submission.id))
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            status_response.data["status"]["value"], ScoreSubmissionStatus.ACCEPTED.value)
+        self.assertEqual(status_response.data["recorded_score"], submission.recorded_score_id)
+
+    def test_attempt_limit_is_enforced_by_the_writer(self):
+        """Submissions beyond the attempt limit are rejected when processed."""
+        ids = [self.post_score(score).data["id"] for score in (10, 20, 30)]
+
+        ScoreBatchWriter(batch_size=2).drain()
+
+        statuses = [
+            ScoreSubmission.objects.get(id=submission_id).status.value for submission_id in ids
+        ]
+        self.assertEqual(statuses, [
+            ScoreSubmissionStatus.ACCEPTED.value,
+            ScoreSubmissionStatus.ACCEPTED.value,
+            ScoreSubmissionStatus.REJECTED.value,
+        ])
+        self.assertIn("score", ScoreSubmission.objects.get(id=ids[2]).errors)
+        self.assertEqual(Score.objects.filter(entry=self.entry).count(), 2)
+
+    def test_scores_keep_the_time_they_were_accepted(self):
+        """A score queued before the end is not rejected for draining after it."""
+        self.competition.end_time = now() + timedelta(minutes=5)
+        self.competition.save()
+        submission = ScoreSubmission.objects.get(id=self.post_score(40).data["id"])
+
+        with freeze_time(self.competition.end_time + timedelta(minutes=1)):
+            ScoreBatchWriter().drain()
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status.value, ScoreSubmissionStatus.ACCEPTED.value)
+        self.assertEqual(submission.recorded_score.created_at, submission.created_at)
+        self.assertEqual(
+            EntryAggregate.objects.get(entry=self.entry).best_reached_at, submission.created_at)
+
+    def test_invalid_score_is_rejected_synchronously(self):
+        response = self.post_score(-5)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ScoreSubmission.objects.exists())
+
+    def test_status_is_private_to_the_submitter(self):
+        submission_id = self.post_score(10).data["id"]
+
+        self.client.force_authenticate(user=self.create_user())
+        response = self.client.get(self.status_url(submission_id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_failed_batch_is_returned_to_the_queue(self):
+        self.post_score(10)
+        writer = ScoreBatchWriter()
+
+        with patch.object(ScoreSubmission.objects, "bulk_update", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                writer.drain()
+
+        self.assertEqual(len(get_broker().queue), 1)
+        self.assertEqual(writer.drain(), 1)
+
+    def test_lost_publish_is_requeued_by_the_writer(self):
+        """A failed publish still answers 202; the writer requeues the row later."""
+        with patch.object(get_broker(), "publish", side_effect=ConnectionError), \
+                self.assertLogs("games.ingestion", "ERROR"):
+            response = self.post_score(40)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.assertEqual(ScoreBatchWriter().drain(), 0)
+        with freeze_time(now() + timedelta(minutes=10)):
+            self.assertEqual(ScoreBatchWriter().drain(), 1)
+
+        submission = ScoreSubmission.objects.get(id=response.data["id"])
+        self.assertEqual(submission.status.value, ScoreSubmissionStatus.ACCEPTED.value)
+
+
+class DatabaseBrokerTest(CompetitionTestCase):
+
+    def test_writer_drains_pending_rows(self):
+        """The database broker picks up pending rows without a publish step."""
+        competition = self.create_competition()
+        player = self.create_user()
+        entry = self.join(competition, player)
+
+        self.client.force_authenticate(user=player)
+        url = reverse("competitions-submit-score", kwargs={"pk": competition.id})
+        with override_settings(SCORE_INGESTION_ASYNC=True):
+            for score in (5, 15):
+                self.assertEqual(
+                    self.client.post(url, {"score": score}, format="json").status_code,
+                    status.HTTP_202_ACCEPTED)
+
+        self.assertEqual(ScoreBatchWriter(broker=DatabaseBroker()).drain(), 2)
+        self.assertEqual(Score.objects.filter(entry=entry).count(), 2)
+        self.assertEqual(ScoreBatchWriter(broker=DatabaseBroker()).drain(), 0)
+
+
+class RabbitMQBrokerTest(CompetitionTestCase):
+
+    @patch("pika.BlockingConnection")
+    def test_threads_do_not_share_a_connection(self, connect):
+        connect.side_effect = lambda parameters: MagicMock(is_closed=False)
+        broker = RabbitMQBroker()
+        connections = []
+
+        def publish():
+            broker.publish([uuid.uuid4()])
+            broker.publish([uuid.uuid4()])
+            connections.append(broker.local.connection)
+
+        threads = [threading.Thread(target=publish) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(connect.call_count, 3)
+        self.assertEqual(len({id(connection) for connection in connections}), 3)
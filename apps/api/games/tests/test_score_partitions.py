@@ -0,0 +1,60 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.utils.timezone import now
+from games import partitions
+from games.models import EntryAggregate, Score
+from games.services import get_leaderboard, rebuild_competition_aggregates, submit_scores
+from games.tests.base import CompetitionTestCase
+
+
+class ScorePartitionTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.player = self.create_user()
+        self.entry = self.join(self.competition, self.player)
+        self.submit(self.entry, 30)
+
+    def strategy(self):
+        with connection.cursor() as cursor:
+            return partitions.get_strategy(cursor)
+
+    def test_scores_carry_their_competition(self):
+        submit_scores([{
+            "index": 0, "competition": self.competition.id, "player": self.player.id, "score": 60}])
+
+        self.assertEqual(
+            set(Score.objects.filter(entry=self.entry).values_list("competition_id", flat=True)),
+            {self.competition.id})
+
+    def test_hash_partitions_keep_scoring_working(self):
+        out = StringIO()
+        call_command("partition_scores", "convert", "--partitions", "4", stdout=out)
+
+        self.assertEqual(self.strategy(), partitions.HASH)
+        self.assertIn("Created 4 partitions", out.getvalue())
+        self.assertEqual(Score.objects.get(entry=self.entry).score, 30)
+
+        self.submit(self.entry, 80)
+        rebuild_competition_aggregates(self.competition)
+        self.assertEqual(EntryAggregate.objects.get(entry=self.entry).best_score, 80)
+        self.assertEqual(get_leaderboard(self.competition)[0]["player_id"], self.player.id)
+
+    def test_old_month_partitions_detach(self):
+        Score.objects.filter(entry=self.entry).update(created_at=now() - timedelta(days=100))
+        self.submit(self.entry, 50)
+
+        partitions.convert(partitions.MONTH, months_ahead=1)
+        self.assertEqual(self.strategy(), partitions.MONTH)
+
+        detached = partitions.detach(partitions.add_months(now(), -1))
+        self.assertTrue(detached)
+        self.assertEqual(list(Score.objects.values_list("score", flat=True)), [50])
+
+        # The detached partitions are kept until dropped
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {detached[0]}")
+            self.assertEqual(cursor.fetchone()[0], 1)
@@ -0,0 +1,90 @@
+from django.urls import reverse
+from rest_framework import status
+from games.models import Competition, CompetitionEntry, EntryAggregate, Score
+from games.services import (
+    get_leaderboard, rebuild_competition_aggregates, reconcile_entry_counts,
+    soft_delete_competition, soft_delete_entry, soft_delete_score)
+from games.tests.base import CompetitionTestCase
+
+
+class SoftDeleteTest(CompetitionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.competition = self.create_competition()
+        self.player = self.create_user()
+        self.entry = self.join(self.competition, self.player)
+        self.submit(self.entry, 40, 90)
+
+    def test_deleted_competition_is_hidden(self):
+        soft_delete_competition(self.competition)
+
+        self.assertFalse(Competition.objects.filter(pk=self.competition.pk).exists())
+        self.assertTrue(Competition.deleted_objects.filter(pk=self.competition.pk).exists())
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("competitions-list"))
+        self.assertNotIn(str(self.competition.id), [str(row["id"]) for row in response.data["results"]])
+        response = self.client.get(reverse("competitions-detail", args=[self.competition.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_admin_delete_keeps_history(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.delete(reverse("competitions-detail", args=[self.competition.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(Competition.deleted_objects.filter(pk=self.competition.pk).exists())
+        self.assertTrue(CompetitionEntry.objects.filter(pk=self.entry.pk).exists())
+        self.assertEqual(Score.objects.filter(entry=self.entry).count(), 2)
+
+    def test_deleted_entry_leaves_counts_and_leaderboard(self):
+        other = self.join(self.competition, self.create_user())
+        self.submit(other, 50)
+
+        soft_delete_entry(self.entry)
+
+        self.assertEqual(Competition.objects.get(pk=self.competition.pk).entries_count, 1)
+        self.assertFalse(EntryAggregate.objects.filter(entry=self.entry).exists())
+        self.assertFalse(Score.objects.filter(entry=self.entry).exists())
+        self.assertEqual(Score.global_objects.filter(entry=self.entry).count(), 2)
+        self.assertEqual(
+            [row["player_id"] for row in get_leaderboard(self.competition)], [other.player_id])
+
+        # Rebuilds and repairs ignore the deleted history as well
+        rebuild_competition_aggregates(self.competition)
+        self.assertFalse(EntryAggregate.objects.filter(entry=self.entry).exists())
+        self.assertEqual(reconcile_entry_counts(), [])
+
+    def test_purging_a_deleted_entry_does_not_uncount_it_again(self):
+        other = self.join(self.competition, self.create_user())
+        soft_delete_entry(self.entry)
+
+        CompetitionEntry.global_objects.get(pk=self.entry.pk).delete()
+
+        self.assertEqual(Competition.objects.get(pk=self.competition.pk).entries_count, 1)
+        other.delete()
+        self.assertEqual(Competition.objects.get(pk=self.competition.pk).entries_count, 0)
+
+    def test_removed_player_can_join_again(self):
+        soft_delete_entry(self.entry)
+
+        self.client.force_authenticate(user=self.player)
+        response = self.client.post(
+            reverse("competitions-join", args=[self.competition.id]), {"entry_fee": 0})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # The old entry's scores do not use up the new entry's attempts
+        self.competition.max_score_per_player = 1
+        self.competition.save()
+        response = self.client.post(
+            reverse("competitions-submit-score", args=[self.competition.id]), {"score": 10})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CompetitionEntry.global_objects.filter(player=self.player).count(), 2)
+
+    def test_deleted_score_is_dropped_from_aggregate(self):
+        best = Score.objects.get(entry=self.entry, score=90)
+
+        aggregate = soft_delete_score(best)
+
+        self.assertEqual(aggregate.best_score, 40)
+        self.assertEqual(aggregate.score_count, 1)
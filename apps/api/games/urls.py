@@ -1,8 +1,31 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework import routers
-from games.views import CompetitionViewSet
+from core.async_views import split_by_method
+from games.views import (
+    CompetitionDetailView, CompetitionListView, CompetitionViewSet, LeaderboardStreamView,
+    LeaderboardView)
 
 router = routers.DefaultRouter(trailing_slash=False)
 
 router.register('competitions', CompetitionViewSet, basename='competitions')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('competitions/<uuid:pk>/leaderboard/stream', LeaderboardStreamView.as_view(),
+         name='competitions-leaderboard-stream'),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('competitions', split_by_method(
+            CompetitionListView.as_view(),
+            CompetitionViewSet.as_view({'get': 'list', 'post': 'create'})
+        ), name='competitions-list'),
+        path('competitions/<uuid:pk>', split_by_method(
+            CompetitionDetailView.as_view(),
+            CompetitionViewSet.as_view(
+                {'get': 'retrieve', 'patch': 'partial_update', 'delete': 'destroy'})
+        ), name='competitions-detail'),
+        path('competitions/<uuid:pk>/leaderboard', LeaderboardView.as_view(),
+             name='competitions-leaderboard'),
+    ] + urlpatterns
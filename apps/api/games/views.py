@@ -1,28 +1,70 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from core.async_views import AsyncGenericAPIView
+from core.authentication import AuthenticationChainMixin
+from core.decorators import conditional
+from core.pagination import KeysetPagination
 from core.viewset import AbstractModelViewSet
 from core.enums import SystemSettingKey
-from core.models import SystemSetting
+from core.services import get_setting
 from games.permissions import CompetitionAccessPolicy
-from games.services import get_leaderboard
+from games.services import (
+    aget_leaderboard, competition_listing, get_competition_stamp, get_leaderboard,
+    get_leaderboard_around, get_player_standing, soft_delete_competition)
+from games.ingestion import is_async
+from games.live import leaderboard_events
 
-from games.models import Competition, CompetitionEntry, Score
+from games.models import Competition, CompetitionEntry, Score, ScoreSubmission
 from games.serializers import (
     CompetitionSerializer, CompetitionEntrySerializer, ScoreSerializer,
-    CompetitionEntryResponseSerializer, LeaderboardSerializer
+    CompetitionEntryResponseSerializer, LeaderboardSerializer,
+    LeaderboardWindowSerializer, BulkScoreSerializer, BulkScoreResultSerializer,
+    ScoreSubmissionSerializer
 )
 
 
-class CompetitionViewSet(AbstractModelViewSet):
+def competition_stamp(view, request, pk=None):
+    return get_competition_stamp(pk)
+
+
+def leaderboard_stamp(view, request, pk=None):
+    version, modified_at = get_competition_stamp(pk)
+    return f"{version}:{get_setting(SystemSettingKey.LEADERBOARD_SIZE.value)}", modified_at
+
+
+class CompetitionViewSet(AuthenticationChainMixin, AbstractModelViewSet):
     """
     ViewSet for managing competitions, including joining, score submissions, and leaderboard.
     """
+    authentication_chain = "api"
     queryset = Competition.objects.all()
     serializer_class = CompetitionSerializer
     permission_classes = [permissions.IsAuthenticated  | permissions.AllowAny, CompetitionAccessPolicy]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """
+        Lists and details load everything the response serializer needs up
+        front, so the number of queries does not grow with the page size.
+        """
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            queryset = competition_listing(queryset, self.request.user)
+        return queryset
+
+    @property
+    def access_policy(self):
+        return self.permission_classes[1]
+
+    @conditional(competition_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """
@@ -30,6 +72,12 @@ class CompetitionViewSet(AbstractModelViewSet):
         """
         serializer.save(created_by=self.request.user)
 
+    def perform_destroy(self, instance):
+        """
+        Soft-deletes the competition, keeping its entries and scores as history.
+        """
+        soft_delete_competition(instance)
+
     @extend_schema(
         request=CompetitionEntrySerializer,
         responses=CompetitionEntryResponseSerializer
@@ -67,6 +115,18 @@ class CompetitionViewSet(AbstractModelViewSet):
         if not entry:
             return Response({'error': 'You must join the competition before submitting a score.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        if is_async():
+            submission_serializer = ScoreSubmissionSerializer(
+                data={'competition': competition.id, 'score': request.data.get('score')},
+                context={'request': request}
+            )
+
+            if submission_serializer.is_valid():
+                submission_serializer.save()
+                return Response(submission_serializer.data, status=status.HTTP_202_ACCEPTED)
+
+            return Response(submission_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
         score_serializer = ScoreSerializer(
             data={'entry': entry.id, 'score': request.data.get('score')},
             context={'request': request}
@@ -78,14 +138,158 @@ class CompetitionViewSet(AbstractModelViewSet):
         
         return Response(score_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(responses=ScoreSubmissionSerializer)
+    @action(detail=True, methods=['get'], url_path=r'score-submissions/(?P<submission_id>[^/.]+)')
+    def score_submission(self, request, pk=None, submission_id=None):
+        """
+        Reports the processing status of a score submitted asynchronously.
+        """
+        competition = self.get_object()
+        submission = ScoreSubmission.objects.select_related("status").filter(
+            competition=competition, id=submission_id, player=request.user).first()
+
+        if not submission:
+            return Response({'error': 'Score submission not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(ScoreSubmissionSerializer(submission).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=BulkScoreSerializer,
+        responses=BulkScoreResultSerializer(many=True)
+    )
+    @action(detail=False, methods=['post'], url_path='submit-scores')
+    def submit_scores(self, request):
+        """
+        Submits many (competition, player, score) results in one request and
+        reports the outcome of each item.
+        """
+        serializer = BulkScoreSerializer(data=request.data, context={'request': request})
+
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['get'])
+    @conditional(leaderboard_stamp)
     def leaderboard(self, request, pk=None):
         competition = self.get_object()
 
-        leaderboard_size = SystemSetting.objects.get(
-            key=SystemSettingKey.LEADERBOARD_SIZE.value
-        ).current_value
+        leaderboard_size = get_setting(SystemSettingKey.LEADERBOARD_SIZE.value)
 
-        leaderboard_data = get_leaderboard(competition.id, limit=int(leaderboard_size))
+        leaderboard_data = get_leaderboard(competition, limit=leaderboard_size)
 
         return Response(LeaderboardSerializer(leaderboard_data, many=True).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[LeaderboardWindowSerializer],
+        responses=LeaderboardSerializer(many=True)
+    )
+    @action(detail=True, methods=['get'], url_path='leaderboard/around-me')
+    @conditional(competition_stamp)
+    def leaderboard_around_me(self, request, pk=None):
+        """
+        Returns the leaderboard rows surrounding the authenticated player.
+        """
+        competition = self.get_object()
+
+        window_serializer = LeaderboardWindowSerializer(data=request.query_params)
+        if not window_serializer.is_valid():
+            return Response(window_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = get_leaderboard_around(
+            competition, request.user, radius=window_serializer.validated_data["radius"])
+
+        if rows is None:
+            return Response({'error': 'You have not submitted a score in this competition.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(LeaderboardSerializer(rows, many=True).data, status=status.HTTP_200_OK)
+
+    @extend_schema(responses=LeaderboardSerializer)
+    @action(detail=True, methods=['get'], url_path='my-rank')
+    @conditional(competition_stamp)
+    def my_rank(self, request, pk=None):
+        """
+        Returns the authenticated player's standing in the competition.
+        """
+        competition = self.get_object()
+        standing = get_player_standing(competition, request.user)
+
+        if not standing:
+            return Response({'error': 'You have not submitted a score in this competition.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(LeaderboardSerializer(standing).data, status=status.HTTP_200_OK)
+
+
+class CompetitionReadView(AuthenticationChainMixin, AsyncGenericAPIView):
+    """
+    Async read endpoints of `CompetitionViewSet`, enabled by
+    `ASYNC_READ_VIEWS`. Same authentication, policy and serializers.
+    """
+    authentication_chain = CompetitionViewSet.authentication_chain
+    queryset = Competition.objects.all()
+    serializer_class = CompetitionSerializer
+    permission_classes = CompetitionViewSet.permission_classes
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return competition_listing(super().get_queryset(), self.request.user)
+
+
+class CompetitionListView(CompetitionReadView):
+    action = "list"
+
+    async def get(self, request):
+        page = await self.paginator.apaginate_queryset(self.get_queryset(), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        # Leaders and ranks are loaded by the serializer
+        data = await sync_to_async(lambda: serializer.data)()
+        return self.paginator.get_paginated_response(data)
+
+
+class CompetitionDetailView(CompetitionReadView):
+    action = "retrieve"
+
+    @conditional(competition_stamp)
+    async def get(self, request, pk=None):
+        serializer = self.get_serializer(await self.aget_object())
+        data = await sync_to_async(lambda: serializer.data)()
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class LeaderboardView(CompetitionReadView):
+    action = "leaderboard"
+
+    def get_queryset(self):
+        return Competition.objects.all()
+
+    @conditional(leaderboard_stamp)
+    async def get(self, request, pk=None):
+        competition = await self.aget_object()
+        leaderboard_size = await sync_to_async(get_setting)(
+            SystemSettingKey.LEADERBOARD_SIZE.value)
+        leaderboard_data = await aget_leaderboard(competition, limit=leaderboard_size)
+        return Response(LeaderboardSerializer(leaderboard_data, many=True).data, status=status.HTTP_200_OK)
+
+
+class LeaderboardStreamView(LeaderboardView):
+    """
+    Streams a competition's leaderboard as server-sent events: a snapshot,
+    then rank deltas as scores come in. The stream never ends, so only
+    ASGI servers serve it; under WSGI it would hold a worker forever.
+    """
+    action = "leaderboard_stream"
+
+    async def get(self, request, pk=None):
+        if not isinstance(request._request, ASGIRequest):
+            return Response(
+                {'error': 'Live leaderboards need an ASGI server.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        competition = await self.aget_object()
+        response = StreamingHttpResponse(
+            leaderboard_events(competition.id), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response